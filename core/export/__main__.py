@@ -0,0 +1,187 @@
+"""
+命令行导出
+
+不需要图形界面，执行与导出页面相同的流程：转换格式 -> 同步sounds目录 -> 打包 -> 生成命令。
+进度以JSON Lines格式输出到标准输出，每行一个事件，例如:
+    {"event": "step_started", "step": 1}
+    {"event": "progress", "current": 10, "maximum": 20}
+    {"event": "log", "message": "已转换: a.wav -> a.ogg"}
+    {"event": "completed", "success": true, "error": ""}
+
+用法:
+    python -m core.export 项目名称
+    python -m core.export D:/projects/demo/sounds.mcsd --workers 4 --mode direct
+    python -m core.export gc 项目名称
+    python -m core.export apply-delta 基础资源包.zip 补丁包.delta.zip 输出资源包.zip
+
+退出码:
+    0 导出成功
+    1 导出失败
+    2 参数错误或项目不存在
+    130 导出被中断（Ctrl+C）
+"""
+import os
+import sys
+import json
+import argparse
+import threading
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CANCELED = 130
+
+_print_lock = threading.Lock()
+_stdout = sys.stdout # 事件输出流，导出过程中其他print输出到标准错误
+
+
+def emit(event, **fields):
+    """输出一行JSON事件"""
+    line = json.dumps(dict(event=event, **fields), ensure_ascii=False)
+    with _print_lock:
+        _stdout.write(line + "\n")
+        _stdout.flush()
+
+
+def resolveProject(project):
+    """
+    根据项目名称或.mcsd文件路径获取项目名称
+
+    传入.mcsd文件路径时，把它所在项目的上级文件夹作为项目文件夹。
+    """
+    import utils
+    import utils.main
+    from core.project import ProjectConfig
+
+    if project.lower().endswith(utils.main.exeSuffixName):
+        config = ProjectConfig.load_config(project)
+        projects_dir = os.path.dirname(os.path.dirname(os.path.abspath(project)))
+        # utils包通过 from .main import * 导出project_path，两处都需要更新
+        utils.main.project_path = projects_dir
+        utils.project_path = projects_dir
+        project = config.project_name
+    if not utils.main.projectExists(project):
+        raise FileNotFoundError(f"项目不存在: {project}")
+    return project
+
+
+def applyDeltaMain(argv):
+    """用基础资源包和补丁包还原完整资源包"""
+    parser = argparse.ArgumentParser(prog="python -m core.export apply-delta", description="用补丁包还原完整资源包")
+    parser.add_argument("base", help="基础版本的完整资源包")
+    parser.add_argument("delta", help="补丁包（.delta.zip）")
+    parser.add_argument("output", help="还原出的资源包路径")
+    args = parser.parse_args(argv)
+
+    from utils.pack_delta import applyDelta
+    for file_path in (args.base, args.delta):
+        if not os.path.isfile(file_path):
+            emit("completed", success=False, error=f"文件不存在: {file_path}")
+            return EXIT_USAGE
+    try:
+        applyDelta(args.base, args.delta, args.output)
+    except Exception as e:
+        emit("completed", success=False, error=str(e))
+        return EXIT_FAILED
+    emit("completed", success=True, error="", output=args.output)
+    return EXIT_OK
+
+
+def gcMain(argv):
+    """按配置的保留策略清理dist中的旧版本"""
+    parser = argparse.ArgumentParser(prog="python -m core.export gc", description="清理dist中的旧版本")
+    parser.add_argument("project", help="项目名称或项目配置文件（.mcsd）路径")
+    args = parser.parse_args(argv)
+    sys.stdout = sys.stderr
+
+    import utils
+    try:
+        project = utils.getProject(resolveProject(args.project))
+    except Exception as e:
+        emit("completed", success=False, error=str(e))
+        return EXIT_USAGE
+    try:
+        removed = project.gcDist()
+    except Exception as e:
+        emit("completed", success=False, error=str(e))
+        return EXIT_FAILED
+    emit("completed", success=True, error="", removed=removed)
+    return EXIT_OK
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "apply-delta":
+        return applyDeltaMain(argv[1:])
+    if argv and argv[0] == "gc":
+        return gcMain(argv[1:])
+
+    parser = argparse.ArgumentParser(prog="python -m core.export", description="导出我的世界音乐包")
+    parser.add_argument("project", help="项目名称或项目配置文件（.mcsd）路径")
+    parser.add_argument("--workers", type=int, default=None, help="并行转换的线程数量，默认读取配置")
+    parser.add_argument("--mode", choices=["classic", "direct"], default=None, help="导出模式，默认读取配置")
+    parser.add_argument("--interval", type=float, default=0.1, help="进度输出间隔（秒）")
+    parser.add_argument("--quiet", action="store_true", help="不输出日志事件，只输出步骤、进度和结果")
+    args = parser.parse_args(argv)
+    # 标准输出只保留JSON事件
+    sys.stdout = sys.stderr
+
+    from core.minecraft import ProjectPath
+    from core.project import ProjectIndex
+    from core.export import ExportPipeline, collectAudioFiles
+
+    try:
+        project_name = resolveProject(args.project)
+    except Exception as e:
+        emit("completed", success=False, error=str(e))
+        return EXIT_USAGE
+
+    project_path = ProjectPath(project_name)
+    project_index = ProjectIndex(project_path)
+    audio_files = collectAudioFiles(project_path, project_index)
+    emit("started", project=project_name, files=len(audio_files))
+
+    def flush():
+        messages, progress = pipeline.channel.drain()
+        if not args.quiet:
+            for message in messages:
+                emit("log", message=message)
+        if progress is not None:
+            emit("progress", current=progress[0], maximum=progress[1])
+
+    def stepEvent(event, step):
+        # 先输出此前的日志和进度，保证事件顺序
+        flush()
+        emit(event, step=step)
+
+    pipeline = ExportPipeline(
+        project_path, audio_files, args.workers, args.mode,
+        on_step_started=lambda step: stepEvent("step_started", step),
+        on_step_completed=lambda step: stepEvent("step_completed", step),
+        project_index=project_index,
+    )
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("success", pipeline.run()), daemon=True)
+
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(args.interval)
+            flush()
+    except KeyboardInterrupt:
+        # 取消尚未开始的转换，等待正在运行的转换结束
+        pipeline.cancel()
+        thread.join()
+        flush()
+    flush()
+
+    if pipeline.is_canceled:
+        emit("completed", success=False, error="导出已取消", canceled=True)
+        return EXIT_CANCELED
+    success = result.get("success", False)
+    emit("completed", success=success, error=pipeline.error_message)
+    return EXIT_OK if success else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
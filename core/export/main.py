@@ -0,0 +1,738 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.minecraft import MinecraftSounds, ProjectPath
+from core.project.index import ProjectIndex
+from utils import toOgg, copyFile, syncFile, getJsonFileContent, removeOrphans, getProject, createFolder, get_export_workers, get_transcode_cache_size, get_export_mode
+from utils.transcode_cache import TranscodeCache
+from utils.media_index import MediaIndex
+from utils.sound_key_index import SoundKeyIndex
+from utils.pack_writer import PackWriter, entrySortKey
+from utils.log_channel import LogChannel
+
+
+def collectAudioFiles(project_path: ProjectPath, project_index=None):
+    """
+    收集项目中要导出的音频文件
+
+    先按音频配置文件（cache/sounds.json）中的记录查找，再补充cache/src根目录和分类文件夹中未记录的音频文件。
+
+    参数:
+        project_path (ProjectPath): 项目路径
+        project_index (ProjectIndex): 已加载的项目索引，不传入时读取一次项目
+
+    返回:
+        list: 音频文件路径列表
+    """
+    if project_index is None:
+        project_index = ProjectIndex(project_path)
+    return project_index.audioFiles()
+
+
+class ExportPipeline:
+    """导出流程
+
+    不依赖Qt，图形界面（ExportWorker）和命令行（python -m core.export）共用。
+    日志和进度写入channel，由调用方定时取出；步骤变化通过回调通知。
+    """
+
+    def __init__(self, project_path: ProjectPath, audio_files, max_workers=None, export_mode=None,
+                 audio_soundkeys=None, on_step_started=None, on_step_completed=None, project_index=None):
+        """
+        初始化导出流程
+
+        参数:
+            project_path (ProjectPath): 项目路径
+            audio_files (list): 要导出的音频文件列表
+            max_workers (int): 并行转换的线程数量，默认读取配置
+            export_mode (str): 导出模式，默认读取配置
+            audio_soundkeys (dict): 音频文件 -> soundkey，优先于音频配置文件
+            on_step_started (callable): 步骤开始时调用，参数为步骤编号
+            on_step_completed (callable): 步骤完成时调用，参数为步骤编号
+            project_index (ProjectIndex): 已加载的项目索引，传入时使用其中的项目配置和音频配置
+        """
+        self.project_path = project_path  # ProjectPath对象
+        self.audio_files = audio_files  # 音频文件列表
+        self.max_workers = max_workers or get_export_workers()  # 并行转换的线程数量
+        self.is_canceled = False
+        self.error_message = ""  # 导出失败的原因
+        self.audio_soundkeys = audio_soundkeys or {}  # 存储音频文件与soundkey的映射关系
+        self.audio_categories = {}  # 存储音频文件与分类的映射关系
+        self.on_step_started = on_step_started
+        self.on_step_completed = on_step_completed
+        self.transcode_cache = None  # 音频转换缓存
+        self.media_index = None  # 音频信息索引
+        self.export_mode = export_mode or get_export_mode()  # 导出模式，"direct"表示直接写入资源包
+        self.pack_writer = None  # 直接导出时的资源包写入器
+        self.name_index = {}  # 文件名 -> {"sound_key": soundkey, "category": 分类}
+        self.key_index = {}  # soundkey -> 文件路径
+        self.channel = LogChannel()  # 日志和进度通道，由调用方定时取出
+        self.project_index = project_index  # 项目索引，编辑器、导出和打包共用
+    
+    def log(self, message):
+        """写入日志，调用方按固定间隔批量取出"""
+        self.channel.log(message)
+    
+    def progress(self, current, maximum):
+        """更新进度，调用方只取最新的进度"""
+        self.channel.progress(current, maximum)
+    
+    def stepStarted(self, step_number):
+        if self.on_step_started:
+            self.on_step_started(step_number)
+    
+    def stepCompleted(self, step_number):
+        if self.on_step_completed:
+            self.on_step_completed(step_number)
+    
+    def fail(self, error_message):
+        """记录导出失败的原因"""
+        self.error_message = error_message
+        return False
+    
+    def getProject(self):
+        """获取项目对象，有项目索引时使用索引中已读取的配置"""
+        if self.project_index is not None and self.project_index.project() is not None:
+            return self.project_index.project()
+        return getProject(self.project_path.project_name)
+    
+    def buildSoundIndex(self):
+        """建立音频文件与soundkey的索引
+        
+        音频配置文件只读取一次，之后每个文件的soundkey查找都是O(1)。
+        """
+        self.name_index = {}
+        self.key_index = {}
+        
+        sounds_json_path = self.project_path.cacheConfig()
+        if self.project_index is not None and self.project_index.audio_info is not None:
+            audio_info = self.project_index.audio_info
+        elif os.path.exists(sounds_json_path):
+            try:
+                audio_info = getJsonFileContent(sounds_json_path)
+            except Exception as e:
+                self.log(f"警告: 获取音频配置文件失败: {str(e)}，将使用文件名作为soundKey")
+                audio_info = {}
+        else:
+            audio_info = None
+        if audio_info is not None:
+            try:
+                for file_name, info in audio_info.items():
+                    self.name_index[file_name] = {
+                        "sound_key": info.get("sound_key", ""),
+                        "category": info.get("category", ""),
+                    }
+                    if info.get("sound_key"):
+                        self.key_index[info["sound_key"]] = info.get("cache_path", "")
+            except Exception as e:
+                self.log(f"警告: 获取音频配置文件失败: {str(e)}，将使用文件名作为soundKey")
+        else:
+            self.log("警告: 音频配置文件不存在，将使用文件名作为soundKey")
+        
+        # 导出页面传入的soundkey优先
+        for file_path, sound_key in self.audio_soundkeys.items():
+            if sound_key:
+                self.key_index[sound_key] = file_path
+    
+    def run(self):
+        """
+        执行导出: 转换格式 -> 同步sounds目录 -> 打包 -> 生成命令
+        
+        Returns:
+            bool: 是否导出成功，失败原因见error_message，取消时is_canceled为True
+        """
+        self.is_canceled = False
+        self.error_message = ""
+        
+        try:
+            # 完整日志写入dist目录
+            try:
+                self.channel.open(self.project_path.exportLog())
+            except Exception as e:
+                self.log(f"警告: 创建日志文件失败: {str(e)}")
+            
+            # 步骤1: 转换格式
+            self.stepStarted(1)
+            self.log("开始转换音频格式...")
+            
+            # 确保缓存目录存在
+            cache_src_dir = self.project_path.cacheSrc()
+            cache_dist_dir = self.project_path.cacheDist()
+            if not os.path.exists(cache_dist_dir):
+                os.makedirs(cache_dist_dir, mode=0o755)  # 设置读写权限
+            
+            # 加载音频转换缓存，源文件和转换参数未变化的音频不再重新编码
+            self.transcode_cache = TranscodeCache(self.project_path.cacheTranscode(), get_transcode_cache_size())
+            # 加载音频信息索引，已经是vorbis编码的ogg文件不需要重新编码
+            self.media_index = MediaIndex(self.project_path.cacheMedia())
+            
+            # 直接导出时，转换好的音频直接写入最终的资源包，不再经过cache/dist和sounds目录
+            project = None
+            packed_sounds = []  # 已写入资源包的音效路径（相对于sounds目录，不含后缀）
+            if self.export_mode == "direct":
+                project = self.getProject()
+                project.config_version()
+                self.pack_writer = PackWriter(os.path.join(self.project_path.dist(), project.packName() + ".zip"))
+                self.log(f"直接写入资源包: {project.packName()}.zip")
+            
+            # 建立soundkey索引，避免每个文件重复查找和读取配置文件
+            self.buildSoundIndex()
+            
+            # 转换音频格式
+            total_files = len(self.audio_files)
+            self.progress(0, total_files)
+            
+            # 先确定每个文件的输出路径，再把转换任务交给转换池并行处理
+            tasks = []
+            folder_keys = {}  # 输出文件夹 -> SoundKeyIndex，同一文件夹中不同音频的soundkey不能相同
+            for file_path in self.audio_files:
+                if self.is_canceled:
+                    return False
+                
+                file_name = os.path.basename(file_path)
+                self.log(f"正在处理: {file_path}")
+                
+                # 获取soundkey作为输出文件名
+                sound_key = self.audio_soundkeys.get(file_path, '')
+                if not sound_key:
+                    # 如果没有找到soundkey，尝试从音频配置文件的索引中获取
+                    sound_key = self.name_index.get(file_name, {}).get("sound_key", "")
+                    if sound_key:
+                        self.log(f"从音频配置文件获取到soundKey: {sound_key}")
+                    else:
+                        # 如果在配置文件中没找到，使用文件名（不含扩展名）
+                        sound_key = os.path.splitext(file_name)[0]
+                        self.log(f"警告: 未在音频配置文件中找到音频文件的soundKey，将使用文件名: {sound_key}")
+                
+                try:
+                    # 获取分类信息
+                    category = self.audio_categories.get(file_path, '')
+                    
+                    # 获取文件相对于cache/src的路径
+                    rel_path = os.path.relpath(os.path.dirname(file_path), cache_src_dir) if os.path.dirname(file_path) != cache_src_dir else ''
+                    
+                    # soundkey与同一输出文件夹中的其他音频冲突时加上数字后缀，避免互相覆盖
+                    folder = (category, rel_path if rel_path != '.' else '')
+                    resolved_key = folder_keys.setdefault(folder, SoundKeyIndex()).assign(file_path, sound_key)
+                    if resolved_key != sound_key:
+                        self.log(f"警告: soundKey {sound_key} 已被其他音频使用，{file_name} 改用 {resolved_key}")
+                        sound_key = resolved_key
+                    
+                    if self.pack_writer is not None:
+                        # 直接导出时只需要确定文件在sounds目录中的相对路径
+                        sound_path = "/".join(p for p in (category, rel_path if rel_path != '.' else '', sound_key) if p)
+                        tasks.append((file_path, sound_path.replace(os.sep, "/"), f"{category+'/' if category else ''}{sound_key}.ogg"))
+                        continue
+                    
+                    # 如果有分类，创建分类子目录
+                    if category:
+                        category_dir = os.path.join(cache_dist_dir, category)
+                        if not os.path.exists(category_dir):
+                            os.makedirs(category_dir, mode=0o755)  # 设置读写权限
+                            self.log(f"创建分类目录: {category}")
+                        
+                        # 如果有子目录，创建子目录
+                        if rel_path and rel_path != '.':
+                            sub_dir = os.path.join(category_dir, rel_path)
+                            if not os.path.exists(sub_dir):
+                                os.makedirs(sub_dir, mode=0o755)  # 设置读写权限
+                                self.log(f"创建子目录: {category}/{rel_path}")
+                            output_path = os.path.join(sub_dir, f"{sound_key}.ogg")
+                        else:
+                            output_path = os.path.join(category_dir, f"{sound_key}.ogg")
+                    else:
+                        # 没有分类，但可能有子目录
+                        if rel_path and rel_path != '.':
+                            sub_dir = os.path.join(cache_dist_dir, rel_path)
+                            if not os.path.exists(sub_dir):
+                                os.makedirs(sub_dir, mode=0o755)  # 设置读写权限
+                                self.log(f"创建子目录: {rel_path}")
+                            output_path = os.path.join(sub_dir, f"{sound_key}.ogg")
+                        else:
+                            # 没有子目录，直接放在dist根目录
+                            output_path = os.path.join(cache_dist_dir, f"{sound_key}.ogg")
+                    
+                    tasks.append((file_path, output_path, f"{category+'/' if category else ''}{sound_key}.ogg"))
+                except Exception as e:
+                    self.log(f"处理失败: {file_name} - {str(e)}")
+            
+            # 根据已记录的音频信息估算资源包大小，不额外获取信息
+            known, duration, size = self.estimatePack()
+            if known:
+                self.log(f"已知 {known}/{total_files} 个音频的信息，总时长 {duration:.1f} 秒，预计大小 {size / 1024 / 1024:.1f} MB")
+            
+            # 并行转换，每个工作线程驱动一个ffmpeg进程
+            self.log(f"使用 {self.max_workers} 个转换线程")
+            completed = total_files - len(tasks)  # 未能生成转换任务的文件直接计入进度
+            self.progress(completed, total_files)
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                if self.pack_writer is not None:
+                    # 资源包中的音效按entrySortKey排序写入，与转换完成的先后无关，之后再写入sounds.json等元数据，
+                    # 条目顺序与经典导出打包的资源包相同
+                    tasks.sort(key=lambda task: entrySortKey(task[1]))
+                    task_order = {output_path: index for index, (_, output_path, _) in enumerate(tasks)}
+                    ready = {}  # 已完成但还不能写入的音效: 序号 -> 要写入资源包的文件路径，失败时为None
+                    next_write = 0
+                    futures = {
+                        executor.submit(self.prepareFile, file_path): (file_path, output_path, target_name)
+                        for file_path, output_path, target_name in tasks
+                    }
+                else:
+                    futures = {
+                        executor.submit(self.convertFile, file_path, output_path): (file_path, output_path, target_name)
+                        for file_path, output_path, target_name in tasks
+                    }
+                for future in as_completed(futures):
+                    if self.is_canceled:
+                        return False
+                    
+                    file_path, output_path, target_name = futures[future]
+                    file_name = os.path.basename(file_path)
+                    try:
+                        if self.pack_writer is not None:
+                            ready[task_order[output_path]] = None
+                        result = future.result()
+                        if self.pack_writer is not None:
+                            result, pack_file = result
+                            # 取消后未处理的音效没有可写入的文件，保持为None
+                            if result != "canceled":
+                                ready[task_order[output_path]] = pack_file
+                        if result == "converted":
+                            self.log(f"已转换: {file_name} -> {target_name}")
+                        elif result == "cached":
+                            self.log(f"已从转换缓存获取: {file_name} -> {target_name}")
+                        elif result == "copied":
+                            self.log(f"已复制并重命名: {file_name} -> {target_name}")
+                        elif result == "canceled":
+                            self.log(f"已取消: {file_name}")
+                    except Exception as e:
+                        self.log(f"处理失败: {file_name} - {str(e)}")
+                    
+                    if self.pack_writer is not None:
+                        # 资源包只能由一个线程按顺序写入，写入排在前面的音效都已完成的部分
+                        while next_write in ready:
+                            pack_file = ready.pop(next_write)
+                            sound_path = tasks[next_write][1]
+                            next_write += 1
+                            if pack_file is None:
+                                continue
+                            try:
+                                self.pack_writer.add_file(f"assets/minecraft/sounds/{sound_path}.ogg", pack_file)
+                                packed_sounds.append(sound_path)
+                            except Exception as e:
+                                self.log(f"处理失败: {os.path.basename(tasks[next_write - 1][0])} - {str(e)}")
+                    
+                    completed += 1
+                    self.progress(completed, total_files)
+            finally:
+                # 取消尚未开始的转换，正在运行的转换完成后线程池退出
+                executor.shutdown(wait=True, cancel_futures=True)
+                try:
+                    self.transcode_cache.save()
+                except Exception as e:
+                    self.log(f"警告: 保存转换缓存索引失败: {str(e)}")
+                try:
+                    self.media_index.save()
+                except Exception as e:
+                    self.log(f"警告: 保存音频信息索引失败: {str(e)}")
+            
+            self.stepCompleted(1)
+            
+            if self.pack_writer is not None:
+                # 步骤2、3: 写入资源包元数据并完成资源包
+                project = self.finishPack(project, packed_sounds)
+            else:
+                # 步骤2: 移动文件到sounds目录
+                if not self.moveToSounds(cache_dist_dir):
+                    return False
+                
+                # 步骤3: 打包项目
+                project = self.buildProject()
+            if project is None:
+                return False
+            
+            # 步骤4: 生成命令
+            self.stepStarted(4)
+            self.log("生成游戏命令...")
+            
+            try:
+                # 获取命令
+                commands = project.getCommand()
+                for cmd in commands:
+                    self.log(f"1.7.10及以下版本：/playsound {cmd} @a ~ ~ ~ 10000")
+                    self.log(f"1.8及以上版本：/playsound {cmd} record @a ~ ~ ~ 10000")
+
+                self.log(f"命令已生成，可在 {self.project_path.dist()} 找到")
+                self.stepCompleted(4)
+            except Exception as e:
+                self.log(f"生成命令失败: {str(e)}")
+                return self.fail(f"生成命令失败: {str(e)}")
+            
+            # 导出完成
+            self.log("导出完成！")
+            return True
+            
+        except Exception as e:
+            self.log(f"导出过程中发生错误: {str(e)}")
+            return self.fail(f"导出过程中发生错误: {str(e)}")
+        
+        finally:
+            if self.pack_writer is not None:
+                # 取消或失败时删除未完成的资源包
+                self.pack_writer.abort()
+                self.pack_writer = None
+            self.channel.close()
+    
+    def moveToSounds(self, cache_dist_dir):
+        """步骤2: 把cache/dist中的文件移动到sounds目录
+        
+        Returns:
+            bool: 是否完成，取消导出时返回False
+        """
+        self.stepStarted(2)
+        self.log("开始同步文件到sounds目录...")
+        
+        # 获取sounds目录，不再清空，只同步有变化的文件
+        sounds_dir = self.project_path.sounds()
+        if not os.path.exists(sounds_dir):
+            os.makedirs(sounds_dir, mode=0o755)  # 设置读写权限
+        
+        # 获取dist目录中的所有ogg文件（包括子目录）
+        ogg_files = []
+        categories = set()
+        
+        # 递归遍历目录中的ogg文件
+        def collect_ogg_files(directory, category='', rel_path=''):
+            for f in os.listdir(directory):
+                full_path = os.path.join(directory, f)
+                if os.path.isdir(full_path):
+                    # 如果是顶层目录且不是分类目录，则作为分类处理
+                    if not category and not rel_path:
+                        categories.add(f)
+                        collect_ogg_files(full_path, f, '')
+                    else:
+                        # 否则作为子目录处理
+                        new_rel_path = f if not rel_path else os.path.join(rel_path, f)
+                        collect_ogg_files(full_path, category, new_rel_path)
+                elif f.lower().endswith('.ogg'):
+                    # 添加到文件列表，包含文件名、分类和相对路径
+                    ogg_files.append((f, category, rel_path))  # (文件名, 分类, 相对路径)
+        
+        # 开始收集文件
+        collect_ogg_files(cache_dist_dir)
+        
+        # 在sounds目录中创建分类子目录
+        for category in categories:
+            category_sounds_dir = os.path.join(sounds_dir, category)
+            if not os.path.exists(category_sounds_dir):
+                os.makedirs(category_sounds_dir, mode=0o755)  # 设置读写权限
+                self.log(f"在sounds目录中创建分类目录: {category}")
+            
+            # 创建子目录结构
+            for _, cat, rel_path in ogg_files:
+                if cat == category and rel_path:
+                    sub_dir = os.path.join(sounds_dir, category, rel_path)
+                    if not os.path.exists(sub_dir):
+                        os.makedirs(sub_dir, mode=0o755)  # 设置读写权限
+                        self.log(f"在sounds目录中创建子目录: {category}/{rel_path}")
+        
+        # 创建没有分类但有子目录的结构
+        for _, cat, rel_path in ogg_files:
+            if not cat and rel_path:
+                sub_dir = os.path.join(sounds_dir, rel_path)
+                if not os.path.exists(sub_dir):
+                    os.makedirs(sub_dir, mode=0o755)  # 设置读写权限
+                    self.log(f"在sounds目录中创建子目录: {rel_path}")
+        
+        total_files = len(ogg_files)
+        self.progress(0, total_files)
+        synced_files = set()  # 同步后sounds目录中应保留的文件（相对路径）
+        unchanged = 0
+        
+        for i, (file_name, category, rel_path) in enumerate(ogg_files):
+            if self.is_canceled:
+                return False
+            
+            # 获取soundkey作为文件名
+            sound_key = os.path.splitext(file_name)[0]  # 默认使用文件名（不含扩展名）
+            
+            # 首先在soundkey索引中查找
+            found = sound_key in self.key_index
+            if found:
+                self.log(f"从soundKey索引找到匹配的soundKey: {sound_key}")
+            elif self.name_index.get(file_name, {}).get("sound_key"):
+                # 如果没找到，尝试按文件名从音频配置文件的索引中获取
+                sound_key = self.name_index[file_name]["sound_key"]
+                self.log(f"从音频配置文件获取到soundKey: {sound_key}")
+                found = True
+            
+            if not found:
+                self.log(f"使用默认soundKey: {sound_key}")
+
+            
+            # 构建源路径和目标路径，保留子目录结构
+            if category:
+                if rel_path:
+                    # 有分类和子目录
+                    src_path = os.path.join(cache_dist_dir, category, rel_path, file_name)
+                    dst_path = os.path.join(sounds_dir, category, rel_path, file_name)
+                    dst_dir = os.path.join(sounds_dir, category, rel_path)
+                else:
+                    # 只有分类，没有子目录
+                    src_path = os.path.join(cache_dist_dir, category, file_name)
+                    dst_path = os.path.join(sounds_dir, category, file_name)
+                    dst_dir = os.path.join(sounds_dir, category)
+            else:
+                if rel_path:
+                    # 没有分类，但有子目录
+                    src_path = os.path.join(cache_dist_dir, rel_path, file_name)
+                    dst_path = os.path.join(sounds_dir, rel_path, file_name)
+                    dst_dir = os.path.join(sounds_dir, rel_path)
+                else:
+                    # 没有分类，也没有子目录
+                    src_path = os.path.join(cache_dist_dir, file_name)
+                    dst_path = os.path.join(sounds_dir, file_name)
+                    dst_dir = sounds_dir
+            
+            # 确保目标目录存在
+            if not os.path.exists(dst_dir):
+                os.makedirs(dst_dir, mode=0o755)  # 设置读写权限
+            
+            synced_files.add(os.path.relpath(dst_path, sounds_dir))
+            try:
+                # 只有新增或变化的文件才链接或复制到sounds目录
+                if syncFile(src_path, dst_path):
+                    # 构建日志路径信息
+                    src_rel_path = f"{category+'/' if category else ''}{rel_path+'/' if rel_path else ''}{file_name}"
+                    dst_rel_path = f"sounds/{category+'/' if category else ''}{rel_path+'/' if rel_path else ''}{file_name}"
+                    self.log(f"已同步: {src_rel_path} -> {dst_rel_path}")
+                else:
+                    unchanged += 1
+            except Exception as e:
+                error_path = f"{category+'/' if category else ''}{rel_path+'/' if rel_path else ''}{file_name}"
+                self.log(f"同步失败: {error_path} - {str(e)}")
+            
+            self.progress(i + 1, total_files)
+        
+        # 删除cache/dist中已经不存在的文件
+        try:
+            removed = removeOrphans(sounds_dir, synced_files)
+            for rel in removed:
+                self.log(f"已删除: sounds/{rel.replace(os.sep, '/')}")
+        except Exception as e:
+            removed = []
+            self.log(f"清理sounds目录时出错: {str(e)}")
+        self.log(f"sounds目录同步完成: 更新 {total_files - unchanged} 个，未变化 {unchanged} 个，删除 {len(removed)} 个")
+        
+        self.stepCompleted(2)
+        return True
+    
+    def buildProject(self):
+        """步骤3: 打包项目
+        
+        Returns:
+            Project: 打包完成的项目，失败时返回None
+        """
+        self.stepStarted(3)
+        self.log("开始打包项目...")
+        
+        try:
+            # 获取Project对象
+            project = self.getProject()
+            self.log("正在获取项目信息...")
+            
+            # 检查项目目录权限
+            if not os.access(self.project_path.project_path, os.R_OK | os.W_OK | os.X_OK):
+                raise Exception(f"项目目录无权限: {self.project_path.project_path}")
+            
+            # 检查dist目录权限
+            dist_path = self.project_path.dist()
+            if not os.path.exists(dist_path):
+                self.log(f"创建输出目录: {dist_path}")
+                try:
+                    createFolder(dist_path)
+                except Exception as e:
+                    raise Exception(f"创建输出目录失败: {str(e)}")
+            elif not os.access(dist_path, os.R_OK | os.W_OK | os.X_OK):
+                raise Exception(f"输出目录无权限: {dist_path}")
+            
+            # 打包项目
+            self.log(f"开始打包项目: {self.project_path.project_name}")
+            self.log(f"项目路径: {self.project_path.project_path}")
+            
+            result = project.build()
+            
+            if result == 1:
+                version = project.getVersion()
+                self.log(f"打包成功!")
+                self.log(f"资源包变化: {project.last_changes.summary()}")
+                self.log(f"资源包版本: {version}")
+                self.log(f"资源包位置: {self.project_path.dist()}")
+                self.stepCompleted(3)
+            elif result == 0:
+                self.log("打包已跳过")
+                self.log("原因: 与上一次打包相比资源包文件没有变化，无需重新打包")
+                self.log(f"可在 {self.project_path.dist()} 找到上一次打包的资源包")
+                self.stepCompleted(3)
+            else:
+                self.log("打包失败")
+                self.log("错误: 打包过程返回未知状态码")
+                self.fail("打包失败: 未知错误")
+                return None
+        except Exception as e:
+            self.log("打包过程出现异常")
+            self.log(f"异常类型: {type(e).__name__}")
+            self.log(f"异常信息: {str(e)}")
+            self.log("打包操作已终止")
+            self.fail(f"打包失败: {str(e)}")
+            return None
+        return project
+    
+    def finishPack(self, project, packed_sounds):
+        """直接导出的步骤2、3: 写入资源包元数据并完成资源包
+        
+        Returns:
+            Project: 打包完成的项目，失败时返回None
+        """
+        self.stepStarted(2)
+        self.log("开始写入资源包元数据...")
+        try:
+            # 根据写入的音效生成sounds.json，不再扫描sounds目录
+            # 按entrySortKey，sounds.json、pack.mcmeta、pack.png排在所有音效之后，依次写入
+            sounds = project.sound.create_soundsFromNames(sorted(packed_sounds))
+            project.sounds = sounds
+            self.pack_writer.add_json("assets/minecraft/sounds.json", sounds)
+            self.pack_writer.add_json("pack.mcmeta", MinecraftSounds.packMcmetaContent(project.pack_format, project.description))
+            if os.path.exists(self.project_path.packIcon()):
+                self.pack_writer.add_file("pack.png", self.project_path.packIcon())
+            self.log(f"已写入 {len(sounds)} 个音效")
+        except Exception as e:
+            self.log(f"写入资源包元数据失败: {str(e)}")
+            self.fail(f"写入资源包元数据失败: {str(e)}")
+            return None
+        self.stepCompleted(2)
+        
+        self.stepStarted(3)
+        self.log("开始打包项目...")
+        try:
+            content_hash = self.pack_writer.contentHash()
+            self.log(f"资源包内容哈希: {content_hash}")
+            same_build = project.sameAsLastBuild(content_hash)
+            if same_build is not None:
+                # 与上一个版本完全相同，不保留新的资源包，也不增加版本号
+                self.pack_writer.abort()
+                self.pack_writer = None
+                self.log("打包已跳过")
+                self.log(f"原因: 资源包内容与版本 {same_build['version']} 相同，无需重新打包")
+                self.stepCompleted(3)
+                return project
+            self.pack_writer.close()
+            self.pack_writer = None
+            version = project.getVersion()
+            project.finishBuild(content_hash)
+            self.log(f"打包成功!")
+            self.log(f"资源包版本: {version}")
+            self.log(f"资源包位置: {self.project_path.dist()}")
+        except Exception as e:
+            self.log("打包过程出现异常")
+            self.log(f"异常信息: {str(e)}")
+            self.fail(f"打包失败: {str(e)}")
+            return None
+        self.stepCompleted(3)
+        return project
+    
+    def estimatePack(self):
+        """
+        根据音频信息索引估算导出结果
+        
+        Returns:
+            tuple: (有记录的音频数量, 总时长（秒）, 预计大小（字节）)
+        """
+        known, duration, size = 0, 0.0, 0
+        for file_path in self.audio_files:
+            info = self.media_index.get(file_path)
+            if info is None:
+                continue
+            known += 1
+            duration += info.get("duration", 0)
+            size += MediaIndex.estimate_size(file_path, info)
+        return known, duration, size
+    
+    def canCopy(self, file_path):
+        """
+        音频文件是否可以不经转换直接放入资源包
+        
+        只有ogg容器中的vorbis编码可以直接使用，后缀为.ogg但编码为opus、flac等的文件需要重新编码。
+        其他后缀的文件只使用已记录的信息，不为它们单独获取信息。
+        """
+        if not file_path.lower().endswith('.ogg'):
+            return MediaIndex.is_compliant(self.media_index.get(file_path))
+        try:
+            return MediaIndex.is_compliant(self.media_index.probe(file_path))
+        except Exception:
+            # 无法获取音频信息时按后缀判断
+            return True
+    
+    def prepareFile(self, file_path):
+        """直接导出时在转换池中准备单个音频文件
+        
+        vorbis编码的ogg文件直接使用源文件，其他格式转换后写入转换缓存，不生成中间文件。
+        
+        Returns:
+            tuple: (处理方式, 要写入资源包的文件路径)，处理方式与convertFile相同，取消时文件路径为None
+        """
+        if self.is_canceled:
+            return "canceled", None
+        
+        if self.canCopy(file_path):
+            return "copied", file_path
+        
+        cache_key = self.transcode_cache.key(file_path, quality="192k")
+        entry_path = self.transcode_cache.lookup(cache_key)
+        if entry_path is not None:
+            return "cached", entry_path
+        
+        # 转换到缓存目录中本任务独有的临时文件，完成后再放入缓存，内容相同的源文件并行转换时不会互相覆盖
+        temp_path = self.transcode_cache.temp_path(cache_key)
+        try:
+            toOgg(file_path, temp_path, quality="192k", overwrite=True)
+            entry_path = self.transcode_cache.adopt(cache_key, temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return "converted", entry_path
+    
+    def convertFile(self, file_path, output_path):
+        """在转换池中转换或复制单个音频文件
+        
+        Returns:
+            str: 处理方式，"converted"表示重新编码，"cached"表示从转换缓存获取，"copied"表示直接复制了ogg文件，
+                "canceled"表示导出已取消、没有处理
+        """
+        if self.is_canceled:
+            return "canceled"
+        
+        # 删除上一次导出的文件，避免写入与转换缓存共享的硬链接
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+        
+        # 如果已经是vorbis编码的ogg，直接复制到dist目录并重命名
+        if self.canCopy(file_path):
+            copyFile(file_path, output_path)
+            return "copied"
+        
+        # 源文件和转换参数都未变化时直接使用缓存
+        cache_key = self.transcode_cache.key(file_path, quality="192k")
+        if self.transcode_cache.fetch(cache_key, output_path):
+            return "cached"
+        
+        # 如果不是ogg格式，转换为ogg格式
+        toOgg(file_path, output_path, quality="192k", overwrite=True)
+        self.transcode_cache.store(cache_key, output_path)
+        return "converted"
+    
+    def cancel(self):
+        """取消导出"""
+        self.is_canceled = True
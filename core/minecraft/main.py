@@ -38,16 +38,7 @@ class MinecraftSounds:
         if not path.exists(pack.sounds()): # 音效目录
             createFolder(pack.sounds())
         if not path.exists(pack.packMcmeta()): # 音频包元数据
-            createJsonFile(pack.packMcmeta(), {
-                "pack": {
-                    "pack_format": int(pack_format), # 游戏版本号, 必须
-                    "description": description, # 音频包描述, 可选
-                    "supported_formats": {
-                        "min_inclusive": 1,
-                        "max_inclusive": 65.1
-                    }
-                }
-            })
+            MinecraftSounds.writePackMcmeta(pack.packMcmeta(), pack_format, description)
         if icon_path != "" and icon_path != None:
             # 复制图标到指定文件夹
             if path.exists(icon_path):
@@ -60,6 +51,37 @@ class MinecraftSounds:
         if not path.exists(pack.soundsJson()): # 音效映射表
             createJsonFile(pack.soundsJson())
 
+    @staticmethod
+    def packMcmetaContent(pack_format: int = 1, description: str = ""):
+        # 音频包元数据内容
+        return {
+            "pack": {
+                "pack_format": int(pack_format), # 游戏版本号, 必须
+                "description": description, # 音频包描述, 可选
+                "supported_formats": {
+                    "min_inclusive": 1,
+                    "max_inclusive": 65.1
+                }
+            }
+        }
+
+    @staticmethod
+    def writePackMcmeta(file_path: str, pack_format: int = 1, description: str = ""):
+        # 写入音频包元数据，格式与直接导出写入资源包的pack.mcmeta相同，内容没有变化时不写入
+        # 返回是否写入了文件
+        from utils.pack_writer import packJson
+
+        content = packJson(MinecraftSounds.packMcmetaContent(pack_format, description))
+        try:
+            with open(file_path, 'rb') as f:
+                if f.read() == content:
+                    return False
+        except FileNotFoundError:
+            pass
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return True
+
     @staticmethod
     def replaceIcon(project_name: str, icon_path: str):
         # 延迟导入，避免循环引用
@@ -56,6 +56,30 @@ class ProjectPath:
     def cacheDist(self):
         return path.join(self.cache(), "dist")
 
+    # 项目音频转换缓存目录
+    def cacheTranscode(self):
+        return path.join(self.cache(), "transcode")
+
+    # 项目音频信息索引文件
+    def cacheMedia(self):
+        return path.join(self.cache(), "media.json")
+
+    # 项目构建清单，记录上一次打包时src中每个文件的大小、修改时间和哈希
+    def cacheManifest(self):
+        return path.join(self.cache(), "manifest.json")
+
+    # dist目录构建产物索引文件
+    def cacheDistIndex(self):
+        return path.join(self.cache(), "dist_index.json")
+
+    # 项目编辑操作日志文件
+    def cacheJournal(self):
+        return path.join(self.cache(), "journal.jsonl")
+
+    # 项目回收站目录，删除的音频和分类先移动到这里，撤销时移动回去
+    def cacheTrash(self):
+        return path.join(self.cache(), "trash")
+
     # 项目缓存音效配置文件
     def cacheConfig(self):
         return path.join(self.cache(), "sounds.json")
@@ -83,6 +107,10 @@ class ProjectPath:
     def distPack(self):
         return path.join(self.dist(), self.project_name + ".zip")
 
+    # 导出日志
+    def exportLog(self):
+        return path.join(self.dist(), "export.log")
+
     # 资源包图标
     def packIcon(self):
         return path.join(self.src(), "pack.png")
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+
+from utils.version import Version
+
+
+class DistIndex:
+    """dist目录的构建产物索引
+
+    记录每个打包版本在dist中生成的文件（资源包、命令文件、补丁包）以及大小、资源包内容哈希和打包时间，
+    按保留策略清理旧版本时只读取索引，不需要每次构建都遍历dist目录。
+    索引不存在时（旧项目第一次使用）遍历一次dist，按文件名导入已有的版本。
+
+    索引文件结构:
+        {
+            "builds": [
+                {
+                    "version": "版本",
+                    "files": ["dist中的文件名", ...],
+                    "pack": "资源包文件名",
+                    "size": 所有文件的总大小,
+                    "content_hash": 资源包内容哈希，见utils.pack_writer.contentHash（导入的旧版本为null）,
+                    "time": 打包时间戳,
+                    "delta_base": 补丁包的基础版本（没有补丁包时为null）
+                }
+            ]
+        }
+    builds按打包顺序排列，最后一个是最新的版本。
+    """
+
+    def __init__(self, index_path: str, dist_dir: str, name: str):
+        """
+        初始化构建产物索引
+
+        参数:
+            index_path (str): 索引文件路径
+            dist_dir (str): dist目录
+            name (str): 项目名称，用于识别dist中的文件
+        """
+        self.index_path = index_path
+        self.dist_dir = dist_dir
+        self.name = name
+        self.builds = []
+        self._load()
+
+    def _load(self):
+        """读取索引，索引不存在或损坏时从dist导入已有的版本"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.builds = json.load(f)["builds"]
+            return
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            self.builds = []
+        self._import()
+
+    def _import(self):
+        """遍历一次dist，把 <名称>_<版本>.* 文件按版本归类"""
+        from utils.pack_delta import DELTA_SUFFIX
+
+        prefix = self.name + "_"
+        builds = {}
+        try:
+            entries = [entry for entry in os.scandir(self.dist_dir) if entry.is_file()]
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.name.startswith(prefix):
+                continue
+            stem = entry.name[len(prefix):]
+            delta_base = None
+            if stem.endswith(DELTA_SUFFIX):
+                delta_base, _, version = stem[:-len(DELTA_SUFFIX)].partition("_to_")
+            else:
+                version = os.path.splitext(stem)[0]
+            if not Version.validate_version(version):
+                continue
+            build = builds.setdefault(version, {"version": version, "files": [], "pack": None, "size": 0,
+                                                "content_hash": None, "time": 0, "delta_base": None})
+            build["files"].append(entry.name)
+            build["size"] += entry.stat().st_size
+            build["time"] = max(build["time"], entry.stat().st_mtime)
+            if delta_base:
+                build["delta_base"] = delta_base
+            elif entry.name.endswith(".zip"):
+                build["pack"] = entry.name
+        self.builds = sorted(builds.values(), key=lambda build: build["time"])
+        if self.builds:
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path), mode=0o755, exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"builds": self.builds}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    def totalSize(self):
+        return sum(build["size"] for build in self.builds)
+
+    def latest(self, exclude=None):
+        """
+        最新的、资源包文件仍然存在的版本
+
+        参数:
+            exclude (str): 不考虑的版本，例如正在打包的版本
+
+        返回:
+            dict: 版本记录，没有时返回None
+        """
+        for build in reversed(self.builds):
+            if build["version"] != exclude and build["pack"] and os.path.exists(os.path.join(self.dist_dir, build["pack"])):
+                return build
+        return None
+
+    def record(self, version, files, delta_base=None, content_hash=None):
+        """
+        记录一次打包生成的文件，同一版本重新打包时替换原来的记录
+
+        参数:
+            version (str): 打包的版本
+            files (list): 生成的文件路径
+            delta_base (str): 补丁包的基础版本
+            content_hash (str): 打包时已经计算的资源包内容哈希，为空时读取资源包中央目录计算
+        """
+        from utils.pack_writer import packContentHash
+
+        version = str(version)
+        names = [os.path.basename(file_path) for file_path in files if file_path and os.path.exists(file_path)]
+        pack = next((name for name in names if name == f"{self.name}_{version}.zip"), None)
+        self.builds = [build for build in self.builds if build["version"] != version]
+        self.builds.append({
+            "version": version,
+            "files": names,
+            "pack": pack,
+            "size": sum(os.path.getsize(os.path.join(self.dist_dir, name)) for name in names),
+            "content_hash": content_hash or (packContentHash(os.path.join(self.dist_dir, pack)) if pack else None),
+            "time": time.time(),
+            "delta_base": delta_base,
+        })
+        self.save()
+
+    def gc(self, keep_builds=0, max_size=0):
+        """
+        按保留策略删除旧版本的文件，最新的版本总是保留
+
+        参数:
+            keep_builds (int): 最多保留多少个版本，0表示不限制
+            max_size (int): 所有版本文件的总大小上限（字节），0表示不限制
+
+        返回:
+            list: 被删除的版本
+        """
+        removed = []
+        while len(self.builds) > 1:
+            over_count = keep_builds > 0 and len(self.builds) > keep_builds
+            over_size = max_size > 0 and self.totalSize() > max_size
+            if not over_count and not over_size:
+                break
+            removed.append(self.builds.pop(0))
+
+        # 基础版本已被删除的补丁包无法再使用，一并删除
+        removed_versions = {build["version"] for build in removed}
+        for build in self.builds:
+            if build["delta_base"] in removed_versions:
+                delta_files = [name for name in build["files"] if name != build["pack"] and name.endswith(".zip")]
+                removed.append({"version": build["version"], "files": delta_files})
+                build["files"] = [name for name in build["files"] if name not in delta_files]
+                build["size"] = sum(os.path.getsize(os.path.join(self.dist_dir, name)) for name in build["files"]
+                                    if os.path.exists(os.path.join(self.dist_dir, name)))
+                build["delta_base"] = None
+
+        if not removed:
+            return []
+        for build in removed:
+            for name in build["files"]:
+                try:
+                    os.remove(os.path.join(self.dist_dir, name))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"删除旧版本文件失败: {str(e)}")
+        self.save()
+        return [build["version"] for build in removed if build["version"] in removed_versions]
@@ -0,0 +1,52 @@
+from os import path
+import json
+from uu import Error
+
+
+class ProjectConfig:
+    """
+    项目配置
+    从项目配置文件（sounds.mcsd）读取项目信息
+    """
+
+    def __init__(self, config: dict, config_path: str = ""):
+        """
+        初始化项目配置
+
+        参数:
+            config (dict): 项目配置文件内容
+            config_path (str): 项目配置文件路径
+        """
+        self.config_path = config_path # 项目配置文件路径
+        self.name = config.get('name', '') # 项目名称
+        self.description = config.get('description', '') # 项目描述
+        self.icon_path = config.get('icon_path', '') # 项目图标路径
+        self.pack_format = config.get('pack_format', 1) # 项目资源包ID
+        self.sound_main_key = config.get('sound_main_key', 'mcsd') # 音效主键
+        self.version = config.get('version', '0.0.1') # 项目版本
+        self.sounds = config.get('sounds', {}) # 项目中的音效
+        self.path = config.get('path', '') # 项目路径
+        # 没有记录名称时使用项目文件夹名称
+        if not self.name and config_path:
+            self.name = path.basename(path.dirname(path.abspath(config_path)))
+        self.project_name = self.name
+
+    @staticmethod
+    def load_config(config_path: str):
+        """
+        加载项目配置文件
+
+        参数:
+            config_path (str): 项目配置文件路径（.mcsd）
+
+        返回:
+            ProjectConfig: 项目配置
+        """
+        if not path.exists(config_path):
+            raise Error('项目配置文件不存在')
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise Error(f'项目配置文件格式错误: {str(e)}')
+        return ProjectConfig(config, config_path)
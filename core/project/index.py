@@ -0,0 +1,207 @@
+import os
+import json
+
+from core.minecraft import ProjectPath
+from .config import ProjectConfig
+
+AUDIO_EXTENSIONS = (".ogg", ".wav", ".mp3", ".flac") # 支持的音频格式
+
+
+class ProjectIndex:
+    """
+    项目索引
+    打开项目时一次性读取项目配置文件（sounds.mcsd）、音频配置文件（cache/sounds.json），
+    并用一次os.scandir遍历cache/src，编辑器、导出和打包共用同一份结果，不再各自读取磁盘。
+    """
+
+    def __init__(self, project_path: ProjectPath):
+        """
+        初始化项目索引并加载
+
+        参数:
+            project_path (ProjectPath): 项目路径
+        """
+        self.project_path = project_path # ProjectPath对象
+        self.config = None # 项目配置（ProjectConfig），配置文件不存在或损坏时为None
+        self.audio_info = None # 音频配置文件内容，文件不存在或损坏时为None
+        self.categories = [] # cache/src下的分类文件夹
+        self.files = set() # cache/src中所有文件的路径
+        self.root_files = [] # cache/src根目录中的文件名
+        self._project = None
+        self.load()
+
+    def load(self):
+        """重新读取项目配置、音频配置并遍历cache/src"""
+        self._project = None
+        self.config = None
+        if os.path.exists(self.project_path.soundsMcsd()):
+            try:
+                self.config = ProjectConfig.load_config(self.project_path.soundsMcsd())
+            except Exception as e:
+                print(f"读取项目配置文件失败: {str(e)}")
+
+        self.audio_info = None
+        config_path = self.project_path.cacheConfig()
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    self.audio_info = json.load(f)
+            except Exception as e:
+                print(f"读取 sounds.json 文件失败: {str(e)}")
+
+        self.scan()
+
+    def scan(self):
+        """遍历cache/src，记录分类文件夹和所有文件"""
+        self.categories = []
+        self.files = set()
+        self.root_files = []
+        cache_src = self.project_path.cacheSrc()
+        pending = [cache_src]
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    if directory == cache_src:
+                        self.categories.append(entry.name)
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    self.files.add(os.path.normpath(entry.path))
+                    if directory == cache_src:
+                        self.root_files.append(entry.name)
+        self.categories.sort()
+
+    def rescanDirectory(self, directory):
+        """
+        重新读取一个文件夹（不递归），与索引中的记录比较后更新索引
+        cache/src下新增的分类文件夹会一并读取，删除的分类文件夹中的文件视为删除
+
+        参数:
+            directory (str): cache/src或分类文件夹的路径
+
+        返回:
+            tuple: (新增的文件路径列表, 删除的文件路径列表)
+        """
+        directory = os.path.normpath(directory)
+        cache_src = os.path.normpath(self.project_path.cacheSrc())
+        files, folders = set(), []
+        try:
+            for entry in os.scandir(directory):
+                if entry.is_dir():
+                    folders.append(entry.name)
+                elif entry.is_file():
+                    files.add(os.path.normpath(entry.path))
+        except OSError:
+            pass # 文件夹已被删除
+
+        old_files = {file_path for file_path in self.files if os.path.dirname(file_path) == directory}
+        added = files - old_files
+        removed = old_files - files
+
+        if directory == cache_src:
+            self.root_files = [os.path.basename(file_path) for file_path in sorted(files)]
+            for category in set(self.categories) - set(folders):
+                category_dir = os.path.join(cache_src, category)
+                removed |= {file_path for file_path in self.files if os.path.dirname(file_path) == category_dir}
+            for category in set(folders) - set(self.categories):
+                category_dir = os.path.join(cache_src, category)
+                try:
+                    added |= {os.path.normpath(entry.path) for entry in os.scandir(category_dir) if entry.is_file()}
+                except OSError:
+                    pass
+            self.categories = sorted(folders)
+
+        self.files -= removed
+        self.files |= added
+        return sorted(added), sorted(removed)
+
+    def categoryOf(self, file_path):
+        """
+        文件所在的分类
+
+        返回:
+            str: 分类名称，在cache/src根目录时返回空字符串，不在cache/src中时返回None
+        """
+        directory = os.path.dirname(os.path.normpath(file_path))
+        cache_src = os.path.normpath(self.project_path.cacheSrc())
+        if directory == cache_src:
+            return ""
+        if os.path.dirname(directory) == cache_src:
+            return os.path.basename(directory)
+        return None
+
+    def exists(self, file_path):
+        """文件是否在cache/src中"""
+        return os.path.normpath(file_path) in self.files
+
+    def isAudioFile(self, file_name):
+        return os.path.splitext(file_name)[1].lower() in AUDIO_EXTENSIONS
+
+    def rootAudioFiles(self):
+        """cache/src根目录中的音频文件路径"""
+        cache_src = self.project_path.cacheSrc()
+        return [os.path.join(cache_src, file_name) for file_name in self.root_files if self.isAudioFile(file_name)]
+
+    def categoryAudioFiles(self, category):
+        """分类文件夹中的音频文件名"""
+        category_dir = os.path.normpath(self.project_path.cacheSrcF(category))
+        return [os.path.basename(file_path) for file_path in self.files
+                if os.path.dirname(file_path) == category_dir and self.isAudioFile(file_path)]
+
+    def findAudioFile(self, file_name, info):
+        """
+        查找音频配置中记录的文件
+        依次尝试cache_path、分类文件夹和cache/src根目录
+
+        返回:
+            str: 文件路径，找不到时返回None
+        """
+        cache_src = self.project_path.cacheSrc()
+        candidates = [
+            info.get("cache_path", ""),
+            os.path.join(cache_src, info.get("category", ""), file_name),
+            os.path.join(cache_src, file_name),
+        ]
+        for candidate in candidates:
+            if candidate and os.path.normpath(candidate) in self.files:
+                return os.path.normpath(candidate)
+        return None
+
+    def audioFiles(self):
+        """
+        项目中要导出的音频文件
+        先按音频配置中的记录查找，再补充cache/src根目录和各分类文件夹中未记录的音频文件。
+        """
+        audio_files = []
+        seen = set()
+        for file_name, info in (self.audio_info or {}).items():
+            file_path = self.findAudioFile(file_name, info)
+            if file_path and file_path not in seen:
+                audio_files.append(file_path)
+                seen.add(file_path)
+        unrecorded = sorted(self.rootAudioFiles())
+        for category in self.categories:
+            category_dir = self.project_path.cacheSrcF(category)
+            unrecorded += [os.path.normpath(os.path.join(category_dir, file_name))
+                           for file_name in sorted(self.categoryAudioFiles(category))]
+        for file_path in unrecorded:
+            if os.path.normpath(file_path) not in seen:
+                audio_files.append(file_path)
+                seen.add(os.path.normpath(file_path))
+        return audio_files
+
+    def project(self):
+        """
+        获取项目对象，只根据已读取的项目配置创建一次
+
+        返回:
+            Project: 项目对象，配置文件不存在时返回None
+        """
+        if self._project is None and self.config is not None:
+            from .main import Project
+            self._project = Project.fromConfig(self.config)
+        return self._project
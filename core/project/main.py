@@ -8,6 +8,9 @@ from core.minecraft import ProjectPath
 from utils.version import Version
 from uu import Error
 from .config import ProjectConfig
+from .index import ProjectIndex
+from .manifest import BuildManifest, ManifestDiff
+from .artifacts import DistIndex
 
 class Project:
     def __init__(self, name, description = "", icon_path = "", pack_format = 1, sound_main_key = "mcsd"):
@@ -32,12 +35,19 @@ class Project:
             'sounds': self.sounds,
         } # 项目配置
         self.sound = Sounds(self.name, self.sound_main_key)
+        self._config_cache = None # 项目配置文件内容缓存: (文件修改时间, 文件大小, 内容)
+        self.last_changes = ManifestDiff() # 最近一次构建时资源包文件的变化
 
     @staticmethod
     def load(project_path):
         # 加载项目配置
         # 延迟导入，避免循环引用
         pj_config = ProjectConfig.load_config(project_path)
+        return Project.fromConfig(pj_config)
+
+    @staticmethod
+    def fromConfig(pj_config):
+        # 根据已读取的项目配置创建项目，不再读取配置文件
         project = Project(pj_config.name, pj_config.description, pj_config.icon_path, pj_config.pack_format, pj_config.sound_main_key)
         project.version = Version(pj_config.version)
         project.sounds = pj_config.sounds
@@ -62,29 +72,35 @@ class Project:
     def build(self):
         # 打包项目
         from utils import toPack, createFolder
+        from utils.pack_writer import packContentHash
         try:
             # 首先检查项目目录权限
             if not os.access(self.path, os.R_OK | os.W_OK | os.X_OK):
                 raise Error(f'项目目录无权限: {self.path}')
                 
             self.config_version()
-            self.config_sounds()
             
-            # 第一次构建（初始版本且没有音效）
-            is_first_build = self.version == "0.0.1" and self.sounds == {}
-            if is_first_build:
-                self.autoCreateSound()
-                self.update_config()
+            # 一次遍历src，得到每个文件的大小、修改时间和哈希
+            manifest = BuildManifest(self.pj_path.cacheManifest())
+            entries = manifest.scan(self.pj_path.src())
             
-            # 检查音效是否有变化
-            if not is_first_build and self.sounds == self.config_sounds():
-                print("音效未更新，尝试使用autoCreateSound()更新一次")
-                # 尝试更新音效
-                self.autoCreateSound()
-                # 再次检查音效是否有变化
-                if self.sounds == self.config_sounds():
-                    print("更新后音效仍未变化，跳过构建")
-                    return 0
+            # 根据遍历到的音效文件生成音效配置，按项目配置生成pack.mcmeta，有变化时才写入
+            updated = []
+            if self.updateSounds(entries):
+                updated.append(self.pj_path.soundsJson())
+            if self.updatePackMcmeta():
+                updated.append(self.pj_path.packMcmeta())
+            for file_path in updated:
+                rel_path = path.relpath(file_path, self.pj_path.src()).replace(os.sep, "/")
+                entries[rel_path] = manifest.entry(file_path, rel_path)
+            
+            # 与上一次构建的清单比较，没有文件变化且上一次的资源包还在时跳过构建
+            self.last_changes = manifest.diff(entries)
+            last_pack = path.join(self.pj_path.dist(), f"{self.name}_{manifest.version}.zip")
+            if not self.last_changes and manifest.version and path.exists(last_pack):
+                print("资源包文件未变化，跳过构建")
+                return 0
+            print(f"资源包文件变化: {self.last_changes.summary()}")
 
             # 确保dist目录存在并有足够权限
             dist_path = self.pj_path.dist()
@@ -98,16 +114,140 @@ class Project:
             if not os.access(dist_path, os.R_OK | os.W_OK | os.X_OK):
                 raise Error(f'dist目录无权限: {dist_path}')
 
-            toPack(self.pj_path.src(), self.pj_path.dist(), self.name + "_" + self.version.__str__())
-            self.cmdToFile()
-            self.version = Version().increment_version(self.version)
-            self.update_config()
-            print(f"构建成功，新版本: {self.version}")
+            toPack(self.pj_path.src(), self.pj_path.dist(), self.packName())
+
+            # 打包结果与上一个版本完全相同时（例如构建清单丢失）删除新的资源包，不增加版本号，
+            # 清单指向内容相同的那个版本，下次构建可以直接跳过
+            pack_path = path.join(self.pj_path.dist(), self.packName() + ".zip")
+            content_hash = packContentHash(pack_path)
+            same_build = self.sameAsLastBuild(content_hash)
+            if same_build is not None:
+                os.remove(pack_path)
+                manifest.save(entries, same_build["version"])
+                print(f"资源包内容与版本 {same_build['version']} 相同，跳过构建")
+                return 0
+            manifest.save(entries, self.version)
+            self.finishBuild(content_hash)
             return 1
         except Exception as e:
             print(f"构建失败: {str(e)}")
             return -1
 
+    def updateSounds(self, entries):
+        """
+        根据src中的音效文件更新音效配置（sounds.json），不再单独遍历sounds目录
+
+        参数:
+            entries (dict): 构建清单中src下的文件（相对路径 -> 记录）
+
+        返回:
+            bool: 是否写入了新的sounds.json
+        """
+        sounds_prefix = path.relpath(self.pj_path.sounds(), self.pj_path.src()).replace(os.sep, "/") + "/"
+        names = sorted(rel_path[len(sounds_prefix):-len(".ogg")] for rel_path in entries
+                       if rel_path.startswith(sounds_prefix) and rel_path.lower().endswith(".ogg"))
+        sounds = self.sound.create_soundsFromNames(names)
+        if sounds == self.sounds and path.exists(self.pj_path.soundsJson()):
+            return False
+        self.sound.save_config()
+        self.sounds = sounds
+        self.update_config()
+        return True
+
+    def updatePackMcmeta(self):
+        """
+        按项目配置写入pack.mcmeta，修改项目描述或资源包格式后打包的资源包也会更新
+
+        返回:
+            bool: 是否写入了新的pack.mcmeta
+        """
+        return MinecraftSounds.writePackMcmeta(self.pj_path.packMcmeta(), self.pack_format, self.description)
+
+    def packName(self):
+        # 当前版本的资源包名称（不含后缀）
+        return self.name + "_" + str(self.version)
+
+    def finishBuild(self, content_hash=None):
+        # 资源包写入完成后生成命令文件、补丁包，记录到构建产物索引，按保留策略清理旧版本并增加版本号
+        # content_hash为打包时已经计算的资源包内容哈希，避免再次读取资源包
+        from utils import get_delta_pack
+        dist_index = self.distIndex()
+        files = [path.join(self.pj_path.dist(), self.packName() + ".zip"), self.cmdToFile()]
+        delta_path, delta_base = self.writeDelta(dist_index) if get_delta_pack() else (None, None)
+        files.append(delta_path)
+        dist_index.record(self.version, files, delta_base, content_hash)
+        self.gcDist(dist_index)
+        self.version = Version().increment_version(self.version)
+        self.update_config()
+        print(f"构建成功，新版本: {self.version}")
+
+    def distIndex(self):
+        # dist目录的构建产物索引
+        return DistIndex(self.pj_path.cacheDistIndex(), self.pj_path.dist(), self.name)
+
+    def previousPack(self, dist_index=None):
+        """
+        构建产物索引中除当前版本外最新的完整资源包
+
+        返回:
+            tuple: (版本, 资源包路径)，没有时返回(None, None)
+        """
+        build = (dist_index or self.distIndex()).latest(exclude=str(self.version))
+        if build is None:
+            return None, None
+        return build["version"], path.join(self.pj_path.dist(), build["pack"])
+
+    def sameAsLastBuild(self, content_hash, dist_index=None):
+        """
+        内容哈希与上一个版本的资源包相同时返回上一个版本的记录
+
+        参数:
+            content_hash (str): 本次打包的资源包内容哈希
+
+        返回:
+            dict: 上一个版本的构建记录，内容不同或没有上一个版本时返回None
+        """
+        build = (dist_index or self.distIndex()).latest(exclude=str(self.version))
+        if build is not None and build.get("content_hash") == content_hash:
+            return build
+        return None
+
+    def writeDelta(self, dist_index=None):
+        """
+        生成上一个版本到当前版本的补丁包，没有上一个版本的资源包时跳过
+        补丁包生成失败不影响本次打包
+
+        返回:
+            tuple: (补丁包路径, 基础版本)，没有生成时返回(None, None)
+        """
+        from utils.pack_delta import createDelta, deltaPackName
+        base_version, base_zip = self.previousPack(dist_index)
+        target_zip = path.join(self.pj_path.dist(), self.packName() + ".zip")
+        if base_zip is None or not path.exists(target_zip):
+            return None, None
+        delta_path = path.join(self.pj_path.dist(), deltaPackName(self.name, base_version, self.version))
+        try:
+            stats = createDelta(base_zip, target_zip, delta_path)
+        except Exception as e:
+            print(f"生成补丁包失败: {str(e)}")
+            return None, None
+        print(f"已生成补丁包: {path.basename(delta_path)}（变化 {stats['changed']} 个文件，删除 {stats['removed']} 个文件）")
+        return delta_path, base_version
+
+    def gcDist(self, dist_index=None):
+        """
+        按配置的保留策略删除dist中的旧版本，只读取构建产物索引
+
+        返回:
+            list: 被删除的版本
+        """
+        from utils import get_dist_retention
+        keep_builds, max_size = get_dist_retention()
+        removed = (dist_index or self.distIndex()).gc(keep_builds, max_size)
+        if removed:
+            print(f"已删除旧版本: {', '.join(removed)}")
+        return removed
+
     def icon(self, icon_path: str):
         MinecraftSounds.replaceIcon(project_name=self.name, icon_path=icon_path)
 
@@ -197,6 +337,8 @@ class Project:
             'version': str(self.version),
             'sounds': self.sounds,
         })
+            # 文件修改时间的精度有限，写入后直接使缓存失效
+            self._config_cache = None
 
         else:
             raise Error('项目配置文件不存在a')
@@ -205,35 +347,39 @@ class Project:
         # 延迟导入，避免循环引用
         from utils import getJsonFileContent, projectConifgName
 
-        # 获取项目配置文件内容
-        if path.exists(path.join(self.path, projectConifgName)):
-            return getJsonFileContent(path.join(self.path, projectConifgName))
-        else:
+        # 获取项目配置文件内容，文件未变化时使用缓存，不再重复读取
+        config_path = path.join(self.path, projectConifgName)
+        try:
+            stat = os.stat(config_path)
+        except OSError:
             raise Error('项目配置文件不存在b')
+        if self._config_cache is None or self._config_cache[:2] != (stat.st_mtime_ns, stat.st_size):
+            self._config_cache = (stat.st_mtime_ns, stat.st_size, getJsonFileContent(config_path))
+        return self._config_cache[2]
 
     def config_version(self):
         # 延迟导入，避免循环引用
         from utils import projectConifgName
 
         # 获取项目配置文件版本
-        if path.exists(path.join(self.path, projectConifgName)):
+        try:
             version = self.config_content()['version']
-            self.version = version
-            return version
-        else:
+        except Error:
             raise Error('项目配置文件不存在c')
+        self.version = version
+        return version
 
     def config_sounds(self):
         # 延迟导入，避免循环引用
         from utils import projectConifgName
 
         # 获取项目配置文件中的音效
-        if path.exists(path.join(self.path, projectConifgName)):
+        try:
             sounds = self.config_content()['sounds']
-            self.sounds = sounds
-            return sounds
-        else:
+        except Error:
             raise Error('项目配置文件不存在d')
+        self.sounds = sounds
+        return sounds
 
 
 
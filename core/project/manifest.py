@@ -0,0 +1,143 @@
+import os
+import json
+
+
+class ManifestDiff:
+    """两次构建之间资源包文件的差异"""
+
+    def __init__(self, added=None, removed=None, modified=None):
+        self.added = sorted(added or [])  # 新增的文件（相对路径）
+        self.removed = sorted(removed or [])  # 删除的文件
+        self.modified = sorted(modified or [])  # 内容变化的文件
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def summary(self, limit=5):
+        """
+        差异的简短描述，例如: 新增 2 个文件 (a.ogg, b.ogg)，修改 1 个文件 (c.ogg)
+
+        参数:
+            limit (int): 每类最多列出多少个文件名
+        """
+        parts = []
+        for label, files in (("新增", self.added), ("修改", self.modified), ("删除", self.removed)):
+            if not files:
+                continue
+            names = ", ".join(files[:limit]) + (" ..." if len(files) > limit else "")
+            parts.append(f"{label} {len(files)} 个文件 ({names})")
+        return "，".join(parts) if parts else "没有文件变化"
+
+
+class BuildManifest:
+    """构建清单
+
+    记录上一次打包时资源包源文件夹（src）中每个文件的大小、修改时间和内容哈希，
+    下次构建时一次遍历就能得到准确的差异：大小和修改时间都没变的文件直接沿用记录的哈希，
+    只有可能变化的文件才重新计算哈希，同名替换的音频也能被发现。
+
+    清单文件结构:
+        {
+            "version": "打包的版本",
+            "files": {
+                "相对路径": {"size": 文件大小, "mtime": 修改时间, "hash": 内容哈希}
+            }
+        }
+    """
+
+    def __init__(self, manifest_path: str):
+        """
+        初始化构建清单
+
+        参数:
+            manifest_path (str): 清单文件路径
+        """
+        self.manifest_path = manifest_path
+        self.version = None  # 上一次打包的版本，没有清单时为None
+        self.files = {}
+        self._load()
+
+    def _load(self):
+        """读取清单，清单不存在或损坏时视为从未构建"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            self.version = content.get("version")
+            self.files = content.get("files", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            self.version = None
+            self.files = {}
+
+    def entry(self, file_path: str, rel_path: str, stat=None):
+        """
+        获取文件的清单记录，文件大小和修改时间未变化时沿用上一次的哈希
+
+        参数:
+            file_path (str): 文件路径
+            rel_path (str): 相对于源文件夹的路径
+            stat: 已经获取的os.stat结果
+        """
+        from utils import getFileHash
+
+        stat = stat or os.stat(file_path)
+        previous = self.files.get(rel_path)
+        if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            file_hash = previous["hash"]
+        else:
+            file_hash = getFileHash(file_path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "hash": file_hash}
+
+    def scan(self, src_dir: str):
+        """
+        遍历源文件夹一次，得到当前所有文件的清单记录
+
+        返回:
+            dict: 相对路径（以/分隔） -> 清单记录
+        """
+        entries = {}
+        pending = [src_dir]
+        while pending:
+            directory = pending.pop()
+            try:
+                items = list(os.scandir(directory))
+            except OSError:
+                continue
+            for item in items:
+                if item.is_dir():
+                    pending.append(item.path)
+                elif item.is_file():
+                    rel_path = os.path.relpath(item.path, src_dir).replace(os.sep, "/")
+                    entries[rel_path] = self.entry(item.path, rel_path, item.stat())
+        return entries
+
+    def diff(self, entries):
+        """
+        比较当前文件和上一次构建的清单
+
+        参数:
+            entries (dict): scan()的结果
+
+        返回:
+            ManifestDiff: 差异
+        """
+        added = [rel_path for rel_path in entries if rel_path not in self.files]
+        removed = [rel_path for rel_path in self.files if rel_path not in entries]
+        modified = [rel_path for rel_path, entry in entries.items()
+                    if rel_path in self.files and self.files[rel_path]["hash"] != entry["hash"]]
+        return ManifestDiff(added, removed, modified)
+
+    def save(self, entries, version):
+        """
+        打包成功后保存清单
+
+        参数:
+            entries (dict): 打包时的文件记录
+            version (str): 打包的版本
+        """
+        self.files = entries
+        self.version = str(version)
+        os.makedirs(os.path.dirname(self.manifest_path), mode=0o755, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.version, "files": self.files}, f, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
@@ -32,8 +32,11 @@ class Sounds:
     
     def save_config(self):
         """将当前配置保存到文件"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=4)
+        from utils.pack_writer import packJson
+
+        # 与直接导出写入资源包的sounds.json使用相同的格式，相同的配置总是写出相同的文件
+        with open(self.config_path, 'wb') as f:
+            f.write(packJson(self.config))
         return True
 
     def getConfig(self):
@@ -107,13 +110,26 @@ class Sounds:
                 }
             }
         """
-        self.config = {}
         data = MinecraftSounds.findOggFiles(ProjectPath(self.project_name).sounds())
-        for da in data:
-            self.config[self.sound_name_format(da)] = self.create_sound_entry(da)
+        self.create_soundsFromNames(data)
         self.save_config()
         return self.config
 
+    def create_soundsFromNames(self, sound_paths):
+        """
+        根据音效文件路径列表创建声音配置，不扫描音效文件夹也不保存到文件
+
+        参数:
+            sound_paths (list): 相对于sounds文件夹、不含.ogg后缀的音效路径，例如 ["test", "test/test"]
+
+        返回:
+            dict: 声音配置
+        """
+        self.config = {}
+        for sound_path in sound_paths:
+            self.config[self.sound_name_format(sound_path)] = self.create_sound_entry(sound_path)
+        return self.config
+
     def create_sound_entry(self, sound_path):
         """
         创建新的声音条目
@@ -0,0 +1,115 @@
+from PyQt5.QtCore import QObject, QTimer
+import json
+import os
+
+from utils.main import writeJsonFileAtomic
+
+
+class AudioInfoStore(QObject):
+    """编辑器音频信息（cache/sounds.json）的延迟写入存储
+
+    音频信息保存在内存中，修改时只标记为待保存，
+    由定时器合并一段时间内的多次修改后一次性写入，
+    切换页面或关闭窗口时调用flush()立即写入。
+    """
+    SAVE_DELAY = 500  # 最后一次修改后等待多少毫秒再写入
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config_path = None
+        self._info = {}  # 文件名 -> {"category", "sound_key", "cache_path"}
+        self._dirty = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SAVE_DELAY)
+        self._timer.timeout.connect(self.flush)
+
+    @staticmethod
+    def _entry(category, sound_key, cache_path):
+        # 只保留名称对应的分类、soundkey和cache_path
+        return {
+            "category": category,
+            "sound_key": sound_key,
+            "cache_path": cache_path
+        }
+
+    def load(self, config_path):
+        """
+        读取sounds.json，先写入尚未保存的修改
+
+        Returns:
+            音频信息字典，文件不存在或读取失败时返回None
+        """
+        audio_info = None
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    audio_info = json.load(f)
+            except Exception as e:
+                print(f"读取 sounds.json 文件失败: {str(e)}")
+        return self.setInfo(config_path, audio_info)
+
+    def setInfo(self, config_path, audio_info):
+        """
+        使用已经读取的音频信息，先写入尚未保存的修改
+
+        Returns:
+            传入的音频信息字典
+        """
+        self.flush()
+        self.config_path = config_path
+        self._info = {}
+        for file_name, info in (audio_info or {}).items():
+            self._info[file_name] = self._entry(
+                info.get("category", ""), info.get("sound_key", ""), info.get("cache_path", ""))
+        return audio_info
+
+    def info(self):
+        """当前的音频信息（包含尚未写入的修改）"""
+        return dict(self._info)
+
+    def setEntry(self, file_name, category, sound_key, cache_path):
+        """更新一个音频的信息，并安排延迟写入"""
+        entry = self._entry(category, sound_key, cache_path)
+        if self._info.get(file_name) == entry:
+            return
+        self._info[file_name] = entry
+        self.scheduleSave()
+
+    def removeEntry(self, file_name, file_path=None):
+        """
+        删除一个音频的信息，并安排延迟写入
+
+        参数:
+            file_name (str): 音频文件名
+            file_path (str): 音频文件路径，记录的cache_path是其他位置的同名文件时不删除
+        """
+        entry = self._info.get(file_name)
+        if entry is None:
+            return
+        cache_path = entry.get("cache_path")
+        if file_path and cache_path and os.path.normpath(cache_path) != os.path.normpath(file_path):
+            return
+        del self._info[file_name]
+        self.scheduleSave()
+
+    def scheduleSave(self):
+        """标记为待保存，重新开始计时"""
+        self._dirty = True
+        self._timer.start()
+
+    def isDirty(self):
+        return self._dirty
+
+    def flush(self):
+        """立即写入尚未保存的修改"""
+        self._timer.stop()
+        if not self._dirty or not self.config_path:
+            return True
+        try:
+            writeJsonFileAtomic(self.config_path, self._info)
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"保存音频信息失败: {str(e)}")
+            return False
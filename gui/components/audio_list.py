@@ -0,0 +1,419 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor, QPen, QBrush, QFontMetrics
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QLineEdit, QComboBox
+import os
+
+from gui.ui.minecraft_style import get_minecraft_font
+from utils.sound_key_index import SoundKeyIndex, generateSoundKey
+
+NO_CATEGORY = "无分类"  # 下拉框中表示无分类的选项
+
+FilePathRole = Qt.UserRole + 1  # 音频文件路径
+SoundKeyRole = Qt.UserRole + 2  # soundKey
+CategoryRole = Qt.UserRole + 3  # 分类，空字符串表示无分类
+MediaRole = Qt.UserRole + 4  # 音频信息（时长、编码、采样率、声道数），尚未获取时为None
+
+
+def formatDuration(seconds):
+    """把秒数格式化为 分:秒 或 时:分:秒"""
+    seconds = int(round(seconds))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def formatMedia(info):
+    """音频信息的简短描述，例如 1:23 · vorbis · 44.1kHz · 2声道"""
+    if not info:
+        return ""
+    parts = [formatDuration(info.get("duration", 0))]
+    if info.get("codec"):
+        parts.append(info["codec"])
+    if info.get("sample_rate"):
+        parts.append(f"{info['sample_rate'] / 1000:g}kHz")
+    if info.get("channels"):
+        parts.append(f"{info['channels']}声道")
+    return " · ".join(parts)
+
+
+def sanitizeSoundKey(text):
+    """过滤soundKey输入：只保留小写英文字母和数字，并去掉开头的数字"""
+    valid_text = ''.join(c for c in text.lower() if c.islower() or c.isdigit())
+    return valid_text.lstrip('0123456789')
+
+
+class AudioEntry:
+    """音频列表中的一项"""
+    __slots__ = ('file_path', 'sound_key', 'category', 'media')
+
+    def __init__(self, file_path, sound_key=None, category=""):
+        self.file_path = file_path  # 音频文件路径
+        self.sound_key = sound_key or generateSoundKey(file_path)
+        self.category = category  # 分类，空字符串表示无分类
+        self.media = None  # 音频信息，由后台扫描获取
+
+    @property
+    def name(self):
+        """文件名（不含后缀）"""
+        return os.path.splitext(os.path.basename(self.file_path))[0]
+
+
+class AudioListModel(QAbstractListModel):
+    """音频列表数据模型
+
+    只保存每一项的数据，界面由AudioItemDelegate按需绘制。
+    维护文件路径到行号的索引，按路径查找为O(1)。
+    所有soundKey登记在keyIndex中，添加或修改时自动避开其他音频已使用的soundKey。
+    """
+    soundKeyChanged = pyqtSignal(str, str)  # soundKey变更信号，传递文件路径和新soundKey
+    categoryChanged = pyqtSignal(str, str)  # 分类变更信号，传递文件路径和新分类
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+        self._rows = {}  # 文件路径 -> 行号
+        self.keyIndex = SoundKeyIndex()  # 项目中所有音频的soundKey
+
+    def _reindex(self, start=0):
+        for row in range(start, len(self._entries)):
+            self._rows[self._entries[row].file_path] = row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.name
+        if role == FilePathRole:
+            return entry.file_path
+        if role == SoundKeyRole:
+            return entry.sound_key
+        if role == CategoryRole:
+            return entry.category
+        if role == MediaRole:
+            return entry.media
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        entry = self._entries[index.row()]
+        if role == SoundKeyRole:
+            if not value:
+                return False
+            # 与其他音频冲突时加上数字后缀
+            value = self.keyIndex.uniqueKey(value, entry.file_path)
+            if value == entry.sound_key:
+                return False
+            entry.sound_key = self.keyIndex.assign(entry.file_path, value)
+            self.dataChanged.emit(index, index, [role])
+            self.soundKeyChanged.emit(entry.file_path, value)
+            return True
+        if role == CategoryRole:
+            if value == entry.category:
+                return False
+            entry.category = value
+            self.dataChanged.emit(index, index, [role])
+            self.categoryChanged.emit(entry.file_path, value)
+            return True
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def addEntries(self, entries):
+        """批量添加音频，只触发一次插入通知
+
+        按列表顺序一次性登记soundKey，与已有音频冲突的soundKey会改为加上数字后缀的soundKey
+        """
+        entries = [entry for entry in entries if entry.file_path not in self._rows]
+        if not entries:
+            return
+        for entry in entries:
+            entry.sound_key = self.keyIndex.assign(entry.file_path, entry.sound_key)
+        start = len(self._entries)
+        self.beginInsertRows(QModelIndex(), start, start + len(entries) - 1)
+        self._entries.extend(entries)
+        self._reindex(start)
+        self.endInsertRows()
+
+    def removeEntry(self, file_path):
+        """按文件路径移除音频"""
+        row = self._rows.get(file_path)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._entries[row]
+        del self._rows[file_path]
+        self.keyIndex.release(file_path)
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def clear(self):
+        """清空列表"""
+        self.beginResetModel()
+        self._entries = []
+        self._rows = {}
+        self.keyIndex.clear()
+        self.endResetModel()
+
+    def contains(self, file_path):
+        return file_path in self._rows
+
+    def rowOf(self, file_path):
+        """获取文件路径所在的行号，不存在时返回-1"""
+        return self._rows.get(file_path, -1)
+
+    def entry(self, row):
+        return self._entries[row]
+
+    def entries(self):
+        """获取所有音频项"""
+        return list(self._entries)
+
+    def filePaths(self):
+        """获取所有音频文件路径"""
+        return [entry.file_path for entry in self._entries]
+
+    def setFilePath(self, old_path, new_path, category=None):
+        """更新音频文件路径（例如移动到其他分类后）
+
+        传入category时同时更新分类，不发出categoryChanged信号（文件已经在新位置）
+        """
+        row = self._rows.pop(old_path, None)
+        if row is None:
+            return
+        self._entries[row].file_path = new_path
+        self._rows[new_path] = row
+        self.keyIndex.rename(old_path, new_path)
+        roles = [FilePathRole]
+        if category is not None:
+            self._entries[row].category = category
+            roles.append(CategoryRole)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, roles)
+
+    def setMedia(self, file_path, info):
+        """更新音频信息"""
+        row = self._rows.get(file_path)
+        if row is None:
+            return
+        self._entries[row].media = info
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [MediaRole])
+
+    def resetCategories(self, categories):
+        """分类被删除后，把属于已删除分类的音频改为无分类"""
+        for row, entry in enumerate(self._entries):
+            if entry.category and entry.category not in categories:
+                self.setData(self.index(row), "", CategoryRole)
+
+
+class AudioItemDelegate(QStyledItemDelegate):
+    """音频列表项绘制和编辑代理
+
+    每一行直接绘制文件名、soundKey输入框、分类下拉框和删除按钮，
+    只有正在编辑的一行才会创建真正的QLineEdit或QComboBox。
+    """
+    deleteRequested = pyqtSignal(str)  # 删除请求信号，传递文件路径
+
+    ROW_HEIGHT = 50
+    MARGIN = 10
+    NAME_WIDTH = 200
+    FIELD_WIDTH = 150
+    FIELD_HEIGHT = 30
+    BUTTON_WIDTH = 80
+    SPACING = 15
+
+    EDITOR_STYLE = """
+        QLineEdit, QComboBox {
+            background-color: #373737;
+            border: 2px solid #1F1F1F;
+            color: #FFFFFF;
+            padding: 5px;
+            font-family: 'Minecraft';
+        }
+        QComboBox QAbstractItemView {
+            background-color: #373737;
+            border: 2px solid #1F1F1F;
+            color: #FFFFFF;
+            selection-background-color: #4A4A4A;
+        }
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.categories = []
+        self._edit_field = None  # 正在编辑的字段: "sound_key" 或 "category"
+        self._font = get_minecraft_font(11)
+        self._info_font = get_minecraft_font(9)
+        self._button_font = get_minecraft_font(12, True)
+
+    def setCategories(self, categories):
+        """更新分类下拉框的选项"""
+        self.categories = list(categories)
+
+    # ---- 布局 ----
+    def _fieldTop(self, rect):
+        return rect.top() + (rect.height() - self.FIELD_HEIGHT) // 2
+
+    def nameRect(self, rect):
+        return QRect(rect.left() + self.MARGIN, rect.top(), self.NAME_WIDTH, rect.height())
+
+    def soundKeyRect(self, rect):
+        left = rect.left() + self.MARGIN + self.NAME_WIDTH + self.SPACING
+        return QRect(left, self._fieldTop(rect), self.FIELD_WIDTH, self.FIELD_HEIGHT)
+
+    def buttonRect(self, rect):
+        left = rect.right() - self.MARGIN - self.BUTTON_WIDTH
+        return QRect(left, self._fieldTop(rect), self.BUTTON_WIDTH, self.FIELD_HEIGHT)
+
+    def categoryRect(self, rect):
+        left = self.buttonRect(rect).left() - self.SPACING - self.FIELD_WIDTH
+        return QRect(left, self._fieldTop(rect), self.FIELD_WIDTH, self.FIELD_HEIGHT)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    # ---- 绘制 ----
+    def _drawField(self, painter, rect, text, arrow=False):
+        painter.setPen(QPen(QColor("#1F1F1F"), 2))
+        painter.setBrush(QBrush(QColor("#373737")))
+        painter.drawRect(rect.adjusted(1, 1, -1, -1))
+        painter.setPen(QColor("#FFFFFF"))
+        text_rect = rect.adjusted(7, 0, -25 if arrow else -7, 0)
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+        if arrow:
+            painter.setPen(QPen(QColor("#1F1F1F"), 1))
+            painter.drawLine(rect.right() - 20, rect.top() + 2, rect.right() - 20, rect.bottom() - 2)
+            painter.setPen(QColor("#FFFFFF"))
+            painter.drawText(QRect(rect.right() - 20, rect.top(), 20, rect.height()), Qt.AlignCenter, "▼")
+
+    def _drawButton(self, painter, rect, text):
+        # 与MinecraftPixelButton的灰色按钮一致
+        painter.setPen(QPen(QColor("#5A5A5A"), 2))
+        painter.setBrush(QBrush(QColor("#828282")))
+        painter.drawRect(rect.adjusted(1, 1, -1, -1))
+        painter.setPen(QPen(QColor("#A0A0A0"), 1))
+        painter.drawLine(rect.left() + 2, rect.top() + 2, rect.right() - 2, rect.top() + 2)
+        painter.drawLine(rect.left() + 2, rect.top() + 2, rect.left() + 2, rect.bottom() - 2)
+        painter.setPen(QPen(QColor("#5A5A5A"), 1))
+        painter.drawLine(rect.left() + 2, rect.bottom() - 2, rect.right() - 2, rect.bottom() - 2)
+        painter.drawLine(rect.right() - 2, rect.top() + 2, rect.right() - 2, rect.bottom() - 2)
+        painter.setFont(self._button_font)
+        painter.setPen(QColor("#000000"))
+        painter.drawText(rect.adjusted(2, 2, 2, 2), Qt.AlignCenter, text)
+        painter.setPen(QColor("#FFFFFF"))
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+
+        # 背景和分隔线
+        background = QColor("#4A4A4A") if option.state & QStyle.State_Selected else QColor("#373737")
+        painter.fillRect(rect, background)
+        painter.setPen(QPen(QColor("#1F1F1F"), 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        painter.setFont(self._font)
+        # 文件名（带阴影），有音频信息时显示在文件名下方
+        name_rect = self.nameRect(rect)
+        media = formatMedia(index.data(MediaRole))
+        if media:
+            name_rect.setBottom(name_rect.center().y() + 2)
+        name_align = (Qt.AlignBottom if media else Qt.AlignVCenter) | Qt.AlignLeft
+        name = QFontMetrics(self._font).elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, name_rect.width())
+        painter.setPen(QColor("#3F3F3F"))
+        painter.drawText(name_rect.translated(1, 1), name_align, name)
+        painter.setPen(QColor("#FFFFFF"))
+        painter.drawText(name_rect, name_align, name)
+        if media:
+            info_rect = QRect(name_rect.left(), name_rect.bottom() + 2, name_rect.width(), rect.bottom() - name_rect.bottom() - 2)
+            painter.setFont(self._info_font)
+            painter.setPen(QColor("#A0A0A0"))
+            media = QFontMetrics(self._info_font).elidedText(media, Qt.ElideRight, info_rect.width())
+            painter.drawText(info_rect, Qt.AlignTop | Qt.AlignLeft, media)
+            painter.setFont(self._font)
+
+        # 正在编辑的字段由编辑器覆盖，这里仍然绘制，避免闪烁
+        self._drawField(painter, self.soundKeyRect(rect), index.data(SoundKeyRole))
+        self._drawField(painter, self.categoryRect(rect), index.data(CategoryRole) or NO_CATEGORY, arrow=True)
+        self._drawButton(painter, self.buttonRect(rect), "删除")
+        painter.restore()
+
+    # ---- 交互 ----
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pos = event.pos()
+            view = self.parent()
+            if self.buttonRect(option.rect).contains(pos):
+                self.deleteRequested.emit(index.data(FilePathRole))
+                return True
+            if self.soundKeyRect(option.rect).contains(pos):
+                self._edit_field = "sound_key"
+                view.edit(index)
+                return True
+            if self.categoryRect(option.rect).contains(pos):
+                self._edit_field = "category"
+                view.edit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        if self._edit_field == "category":
+            editor = QComboBox(parent)
+            editor.addItem(NO_CATEGORY)
+            editor.addItems(self.categories)
+            editor.setStyleSheet(self.EDITOR_STYLE)
+            # 选择后立即提交并关闭编辑器
+            editor.activated.connect(lambda _: self._commitAndClose(editor))
+            return editor
+        if self._edit_field == "sound_key":
+            editor = QLineEdit(parent)
+            editor.setMaxLength(5)  # 限制最大长度为5个字符
+            editor.setStyleSheet(self.EDITOR_STYLE)
+            editor.textEdited.connect(lambda text: self._sanitize(editor, text))
+            return editor
+        return None
+
+    def _sanitize(self, editor, text):
+        valid_text = sanitizeSoundKey(text)
+        if valid_text != text:
+            editor.setText(valid_text)
+
+    def _commitAndClose(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            position = editor.findText(index.data(CategoryRole) or NO_CATEGORY)
+            editor.setCurrentIndex(max(position, 0))
+            editor.showPopup()
+        elif isinstance(editor, QLineEdit):
+            editor.setText(index.data(SoundKeyRole))
+            editor.selectAll()
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            category = editor.currentText()
+            model.setData(index, "" if category == NO_CATEGORY else category, CategoryRole)
+        elif isinstance(editor, QLineEdit):
+            # 为空时保留原来的soundKey
+            if editor.text():
+                model.setData(index, editor.text(), SoundKeyRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        if isinstance(editor, QComboBox):
+            editor.setGeometry(self.categoryRect(option.rect))
+        else:
+            editor.setGeometry(self.soundKeyRect(option.rect))
@@ -0,0 +1,202 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from contextlib import contextmanager
+import json
+import os
+import shutil
+import time
+
+
+class EditJournal(QObject):
+    """编辑器操作日志，用于撤销和重做
+
+    每个操作是一个字典，"type"为操作类型，其余字段由编辑器决定，
+    撤销和重做只处理操作本身涉及的文件，与项目大小无关。
+    操作只追加写入日志文件（每行一条记录），重新打开项目时按记录恢复撤销和重做列表。
+    删除的音频和分类移动到回收站，撤销时重命名回原位置；
+    不再能被撤销或重做的操作对应的回收站文件会被清理。
+
+    日志记录:
+        {"action": "do", "op": {...}}  执行了一个新操作
+        {"action": "undo"}  撤销了最近一个操作
+        {"action": "redo"}  重做了最近撤销的操作
+    """
+    MAX_OPERATIONS = 100  # 最多可以撤销的操作数量
+
+    changed = pyqtSignal()  # 可撤销、可重做状态变化信号
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.journal_path = None
+        self.trash_dir = None
+        self._undo = []  # 可撤销的操作，最后一个是最近的操作
+        self._redo = []  # 可重做的操作，最后一个是最近撤销的操作
+        self._group = None  # 正在合并的操作列表
+        self._replaying = False
+        self._trash_seq = 0  # 同一时刻生成多个回收站路径时区分
+
+    def load(self, journal_path, trash_dir):
+        """
+        读取项目的操作日志，恢复撤销和重做列表
+
+        读取后重写为精简的日志，并清理回收站中没有被任何操作引用的文件。
+        """
+        self.journal_path = journal_path
+        self.trash_dir = trash_dir
+        self._undo, self._redo, self._group = [], [], None
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 写入中断的最后一行
+                    action = record.get("action")
+                    if action == "do":
+                        self._undo.append(record["op"])
+                        self._redo.clear()
+                    elif action == "undo" and self._undo:
+                        self._redo.append(self._undo.pop())
+                    elif action == "redo" and self._redo:
+                        self._undo.append(self._redo.pop())
+        except FileNotFoundError:
+            pass
+        del self._undo[:-self.MAX_OPERATIONS]
+        self._compact()
+        self._purgeOrphans()
+        self.changed.emit()
+
+    def _compact(self):
+        """只保留当前撤销和重做列表的日志"""
+        if not self.journal_path:
+            return
+        records = [{"action": "do", "op": op} for op in self._undo]
+        records += [{"action": "do", "op": op} for op in reversed(self._redo)]
+        records += [{"action": "undo"}] * len(self._redo)
+        os.makedirs(os.path.dirname(self.journal_path), mode=0o755, exist_ok=True)
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.journal_path)
+
+    def _append(self, record):
+        if not self.journal_path:
+            return
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    @staticmethod
+    def trashPaths(op):
+        """操作引用的回收站路径"""
+        if op.get("type") == "group":
+            return [path for child in op["ops"] for path in EditJournal.trashPaths(child)]
+        paths = [item["trash_path"] for item in op.get("items", []) if item.get("trash_path")]
+        if op.get("trash_path"):
+            paths.append(op["trash_path"])
+        return paths
+
+    def _purge(self, ops):
+        """删除不再能被撤销或重做的操作在回收站中的文件"""
+        for op in ops:
+            for path in self.trashPaths(op):
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    elif os.path.exists(path):
+                        os.remove(path)
+                except OSError as e:
+                    print(f"清理回收站失败: {str(e)}")
+
+    def _purgeOrphans(self):
+        """删除回收站中没有被任何操作引用的文件"""
+        if not self.trash_dir or not os.path.isdir(self.trash_dir):
+            return
+        referenced = {os.path.normpath(path) for op in self._undo + self._redo for path in self.trashPaths(op)}
+        for entry in os.scandir(self.trash_dir):
+            if os.path.normpath(entry.path) not in referenced:
+                self._purge([{"trash_path": entry.path}])
+
+    def trashPath(self, file_path):
+        """为要移动到回收站的文件或文件夹生成一个不重复的路径"""
+        name = os.path.basename(os.path.normpath(file_path))
+        while True:
+            self._trash_seq += 1
+            candidate = os.path.join(self.trash_dir, f"{time.time_ns()}_{self._trash_seq}_{name}")
+            if not os.path.exists(candidate):
+                return candidate
+
+    @contextmanager
+    def group(self):
+        """把期间记录的操作合并为一个操作，一次撤销"""
+        if self._group is not None:
+            yield  # 已经在合并中
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            ops, self._group = self._group, None
+            if len(ops) == 1:
+                self.record(ops[0])
+            elif ops:
+                self.record({"type": "group", "ops": ops})
+
+    @contextmanager
+    def replaying(self):
+        """撤销或重做期间产生的修改不记录为新操作"""
+        self._replaying = True
+        try:
+            yield
+        finally:
+            self._replaying = False
+
+    def record(self, op):
+        """记录一个新操作，并丢弃所有可重做的操作"""
+        if self._replaying:
+            return
+        if self._group is not None:
+            self._group.append(op)
+            return
+        self._purge(self._redo)
+        self._redo.clear()
+        self._undo.append(op)
+        self._append({"action": "do", "op": op})
+        if len(self._undo) > self.MAX_OPERATIONS:
+            dropped = self._undo[:-self.MAX_OPERATIONS]
+            del self._undo[:-self.MAX_OPERATIONS]
+            self._purge(dropped)
+            self._compact()
+        self.changed.emit()
+
+    def canUndo(self):
+        return bool(self._undo)
+
+    def canRedo(self):
+        return bool(self._redo)
+
+    def peekUndo(self):
+        """最近的操作，用于撤销，没有时返回None
+
+        只读取不移动，编辑器撤销成功后再调用commitUndo()，撤销失败时列表和日志保持不变。
+        """
+        return self._undo[-1] if self._undo else None
+
+    def peekRedo(self):
+        """最近撤销的操作，用于重做，没有时返回None，重做成功后再调用commitRedo()"""
+        return self._redo[-1] if self._redo else None
+
+    def commitUndo(self):
+        """最近的操作已撤销，移动到重做列表并写入日志"""
+        if not self._undo:
+            return
+        self._redo.append(self._undo.pop())
+        self._append({"action": "undo"})
+        self.changed.emit()
+
+    def commitRedo(self):
+        """最近撤销的操作已重做，移动回撤销列表并写入日志"""
+        if not self._redo:
+            return
+        self._undo.append(self._redo.pop())
+        self._append({"action": "redo"})
+        self.changed.emit()
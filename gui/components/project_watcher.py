@@ -0,0 +1,83 @@
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+import os
+
+
+class ProjectWatcher(QObject):
+    """监视项目缓存目录（cache/src）中的文件变化
+
+    监视cache/src和各分类文件夹，文件夹变化时只重新读取发生变化的文件夹，
+    并把差异更新到项目索引（ProjectIndex）中。
+    外部批量复制会产生大量变化通知，在最后一次通知后等待一段时间再合并处理，
+    只发出一次filesChanged信号。
+    """
+    COALESCE_DELAY = 300  # 最后一次变化后等待多少毫秒再处理
+
+    filesChanged = pyqtSignal(list, list)  # 新增的文件路径, 删除的文件路径
+    categoriesChanged = pyqtSignal(list)  # 新的分类列表
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.project_index = None
+        self._pending = set()  # 等待重新读取的文件夹
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.onDirectoryChanged)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.COALESCE_DELAY)
+        self._timer.timeout.connect(self.applyChanges)
+
+    def watch(self, project_index):
+        """开始监视项目索引对应的缓存目录，替换之前监视的项目"""
+        self.stop()
+        self.project_index = project_index
+        self.updateWatchedPaths()
+
+    def stop(self):
+        """停止监视，丢弃尚未处理的变化"""
+        self._timer.stop()
+        self._pending.clear()
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+        self.project_index = None
+
+    def updateWatchedPaths(self):
+        """监视cache/src和当前的分类文件夹"""
+        if self.project_index is None:
+            return
+        cache_src = self.project_index.project_path.cacheSrc()
+        wanted = {os.path.normpath(cache_src)}
+        wanted |= {os.path.normpath(os.path.join(cache_src, category)) for category in self.project_index.categories}
+        watched = {os.path.normpath(directory) for directory in self._watcher.directories()}
+        stale = [directory for directory in self._watcher.directories() if os.path.normpath(directory) not in wanted]
+        if stale:
+            self._watcher.removePaths(stale)
+        missing = [directory for directory in wanted - watched if os.path.isdir(directory)]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def onDirectoryChanged(self, directory):
+        """记录变化的文件夹，重新开始计时"""
+        self._pending.add(os.path.normpath(directory))
+        self._timer.start()
+
+    def applyChanges(self):
+        """重新读取变化的文件夹，更新项目索引并发出合并后的变化"""
+        if self.project_index is None:
+            self._pending.clear()
+            return
+        categories = list(self.project_index.categories)
+        added, removed = set(), set()
+        # 先处理cache/src，分类文件夹的增删会影响其余文件夹
+        cache_src = os.path.normpath(self.project_index.project_path.cacheSrc())
+        for directory in sorted(self._pending, key=lambda d: d != cache_src):
+            directory_added, directory_removed = self.project_index.rescanDirectory(directory)
+            added |= set(directory_added)
+            removed |= set(directory_removed)
+        self._pending.clear()
+
+        if self.project_index.categories != categories:
+            self.updateWatchedPaths()
+            self.categoriesChanged.emit(list(self.project_index.categories))
+        if added or removed:
+            self.filesChanged.emit(sorted(added), sorted(removed))
@@ -1,19 +1,31 @@
-from PyQt5.QtCore import Qt, QSize, QUrl, pyqtSignal
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt, QSize, QUrl, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap, QKeySequence
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QListWidget, QListWidgetItem, QFileDialog, QMessageBox)
+                             QListView, QAbstractItemView, QProgressBar, QMenu, QFileDialog, QMessageBox, QShortcut)
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import shutil
+import threading
+import time
+from uu import Error
 
 from gui.ui import MinecraftFrame, MinecraftTitleLabel, MinecraftLabel, MinecraftBackground, apply_minecraft_style
 from gui.ui.button import MinecraftPixelButton
 from gui.ui.minecraft_dialog import MinecraftMessageBox, MinecraftMessageBoxResult
+from gui.components.audio_list import (AudioEntry, AudioListModel, AudioItemDelegate, CategoryRole, SoundKeyRole, NO_CATEGORY,
+                                       formatDuration)
+from gui.components.audio_info_store import AudioInfoStore
+from gui.components.project_watcher import ProjectWatcher
+from gui.components.edit_journal import EditJournal
 from core.minecraft.projectPath import ProjectPath
-from utils.main import copyFile, getFileList, getFolderList, delFile, delFolder, createFolder
+from core.project.index import ProjectIndex
+from utils.media_index import MediaIndex
+from utils.main import copyFileChunked, getFileHash, createFolder, renameFile, get_import_workers
 
 class AudioFileSelector(MinecraftFrame):
     """音频文件选择器"""
     fileSelected = pyqtSignal(list)  # 文件选择信号，传递文件路径列表
+    cancelRequested = pyqtSignal()  # 取消导入信号
     
     def __init__(self, parent=None):
         super().__init__(parent, frame_type="stone")
@@ -33,15 +45,57 @@ class AudioFileSelector(MinecraftFrame):
         self.textLabel = MinecraftLabel("点击下方按钮添加音频文件（支持多选）")
         self.textLabel.setAlignment(Qt.AlignCenter)
         
-        # 创建选择文件按钮
+        # 创建导入进度条（导入时显示）
+        self.progressBar = QProgressBar()
+        self.progressBar.setRange(0, 1000)
+        self.progressBar.setStyleSheet("""
+            QProgressBar {
+                background-color: #373737;
+                border: 2px solid #1F1F1F;
+                border-radius: 5px;
+                color: #FFFFFF;
+                text-align: center;
+                height: 25px;
+            }
+            QProgressBar::chunk {
+                background-color: #5555FF;
+                border-radius: 3px;
+            }
+        """)
+        self.progressBar.hide()
+        
+        # 创建选择文件按钮（导入时作为取消按钮）
+        self.importing = False
         self.selectButton = MinecraftPixelButton("选择文件", button_type="brown")
-        self.selectButton.clicked.connect(self.selectFile)
+        self.selectButton.clicked.connect(self.onSelectButtonClicked)
         
         # 添加组件到布局
         self.layout.addWidget(self.iconLabel)
         self.layout.addWidget(self.textLabel)
+        self.layout.addWidget(self.progressBar)
         self.layout.addWidget(self.selectButton, 0, Qt.AlignCenter)
     
+    def onSelectButtonClicked(self):
+        """选择文件按钮点击事件，导入过程中用于取消导入"""
+        if self.importing:
+            self.cancelRequested.emit()
+        else:
+            self.selectFile()
+    
+    def setImporting(self, importing):
+        """切换导入状态"""
+        self.importing = importing
+        self.progressBar.setVisible(importing)
+        self.progressBar.setValue(0)
+        self.selectButton.setText("取消导入" if importing else "选择文件")
+        self.textLabel.setText("正在导入音频文件..." if importing else "点击下方按钮添加音频文件（支持多选）")
+    
+    def setProgress(self, copied, total, speed):
+        """更新导入进度"""
+        mb = 1024 * 1024
+        self.progressBar.setValue(int(copied * 1000 / total) if total else 1000)
+        self.progressBar.setFormat(f"{copied / mb:.1f} / {total / mb:.1f} MB  ({speed / mb:.1f} MB/s)")
+    
     def selectFile(self):
         """选择文件按钮点击事件"""
         file_paths, _ = QFileDialog.getOpenFileNames(
@@ -76,184 +130,210 @@ class AudioFileSelector(MinecraftFrame):
         _, ext = os.path.splitext(file_path)
         return ext.lower() in valid_extensions
 
-class AudioListItem(QWidget):
-    """音频列表项"""
-    deleteRequested = pyqtSignal(str)  # 删除请求信号
-    categoryChanged = pyqtSignal(str, str)  # 分类变更信号，传递文件路径和新分类
-    soundKeyChanged = pyqtSignal(str, str)  # soundKey变更信号，传递文件路径和新soundKey
-    
-    def __init__(self, file_path, parent=None, categories=None):
-        super().__init__(parent)
-        self.file_path = file_path
-        
-        # 创建布局
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(10, 10, 10, 10)
-        self.layout.setSpacing(15)
-        
-        # 获取文件名并去除后缀
-        file_name = os.path.basename(file_path)
-        file_name_without_ext = os.path.splitext(file_name)[0]
-        
-        # 文件名标签（不含后缀）
-        self.nameLabel = MinecraftLabel(file_name_without_ext)
-        self.nameLabel.setFixedWidth(200)
-        
-        # 生成并设置soundKey
-        self.soundKey = self.generateSoundKey(file_name_without_ext)
-        
-        # soundKey输入框
-        from PyQt5.QtWidgets import QLineEdit
-        self.soundKeyEdit = QLineEdit(self.soundKey)
-        self.soundKeyEdit.setFixedSize(150, 30)
-        self.soundKeyEdit.setStyleSheet("""
-            QLineEdit {
-                background-color: #373737;
-                border: 2px solid #1F1F1F;
-                color: #FFFFFF;
-                padding: 5px;
-                font-family: 'Minecraft';
-            }
-        """)
-        self.soundKeyEdit.setMaxLength(5)  # 限制最大长度为5个字符
-        self.soundKeyEdit.textChanged.connect(self.onSoundKeyChanged)
-        
-        # 分类下拉框
-        from PyQt5.QtWidgets import QComboBox
-        self.categoryComboBox = QComboBox()
-        self.categoryComboBox.setFixedSize(150, 30)
-        self.categoryComboBox.setStyleSheet("""
-            QComboBox {
-                background-color: #373737;
-                border: 2px solid #1F1F1F;
-                color: #FFFFFF;
-                padding: 5px;
-                font-family: 'Minecraft';
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 20px;
-                border-left: 1px solid #1F1F1F;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #373737;
-                border: 2px solid #1F1F1F;
-                color: #FFFFFF;
-                selection-background-color: #4A4A4A;
-            }
-        """)
-        
-        # 添加默认选项
-        self.categoryComboBox.addItem("无分类")
-        
-        # 添加分类选项
-        if categories:
-            for category in categories:
-                self.categoryComboBox.addItem(category)
-        
-        # 连接分类变更信号
-        self.categoryComboBox.currentTextChanged.connect(self.onCategoryChanged)
-        
-        # 删除按钮
-        self.deleteButton = MinecraftPixelButton("删除", button_type="red")
-        self.deleteButton.setFixedSize(80, 30)
-        self.deleteButton.clicked.connect(self.onDelete)
-        
-        # 添加组件到布局
-        self.layout.addWidget(self.nameLabel, 0, Qt.AlignLeft)
-        self.layout.addWidget(self.soundKeyEdit, 0, Qt.AlignLeft)
-        self.layout.addStretch(1)
-        self.layout.addWidget(self.categoryComboBox, 0, Qt.AlignRight)
-        self.layout.addWidget(self.deleteButton, 0, Qt.AlignRight)
-    
-    def onDelete(self):
-        """删除按钮点击事件"""
-        self.deleteRequested.emit(self.file_path)
-    
-    def generateSoundKey(self, file_name):
-        """根据文件名生成soundKey"""
-        from utils.main import cnTextToPinyinFirst, enTextToFirst
-        import re
-        
-        # 判断是否为中文（包含至少一个中文字符）
-        if re.search(r'[\u4e00-\u9fa5]', file_name):
-            # 中文处理
-            sound_key = cnTextToPinyinFirst(file_name)
-        else:
-            # 英文处理
-            sound_key = enTextToFirst(file_name)
-        
-        # 确保soundKey符合规范：最长5个字符，只包含小写英文字母和数字，数字不能在开头
-        sound_key = sound_key.lower()[:5]  # 截取前5个字符并转为小写
-        
-        # 过滤非法字符，只保留小写字母和数字
-        sound_key = ''.join(c for c in sound_key if c.islower() or c.isdigit())
-        
-        # 如果首字符是数字，添加字母前缀
-        if sound_key and sound_key[0].isdigit():
-            sound_key = 's' + sound_key[:-1]  # 添加's'前缀并保持总长度不超过5
-        
-        # 如果为空，使用默认值
-        if not sound_key:
-            sound_key = "sound"
-        
-        return sound_key
-    
-    def onSoundKeyChanged(self, text):
-        """soundKey变更事件"""
-        # 验证输入是否符合规范：只包含小写英文字母和数字，数字不能在开头
-        valid_text = ''
-        for c in text.lower():
-            if c.islower() or c.isdigit():
-                valid_text += c
-        
-        # 如果首字符是数字，不添加到有效文本中
-        if valid_text and valid_text[0].isdigit():
-            valid_text = valid_text[1:]
-            # 如果删除数字后为空，不更新
-            if not valid_text:
-                self.soundKeyEdit.setText(self.soundKey)
-                return
-        
-        # 如果有效文本与当前文本不同，更新文本框
-        if valid_text != text:
-            self.soundKeyEdit.setText(valid_text)
-            return
-        
-        # 更新soundKey并发送信号
-        self.soundKey = valid_text
-        self.soundKeyChanged.emit(self.file_path, self.soundKey)
-    
-    def onCategoryChanged(self, category):
-        """分类变更事件"""
-        if category == "无分类":
-            category = ""
-        # 发送分类变更信号
-        self.categoryChanged.emit(self.file_path, category)
-    
-    def updateCategories(self, categories):
-        """更新分类列表"""
-        current_category = self.categoryComboBox.currentText()
-        
-        # 清空并重新添加选项
-        self.categoryComboBox.clear()
-        self.categoryComboBox.addItem("无分类")
-        
-        # 添加分类选项
-        if categories:
-            for category in categories:
-                self.categoryComboBox.addItem(category)
-        
-        # 尝试恢复之前的选择
-        index = self.categoryComboBox.findText(current_category)
-        if index >= 0:
-            self.categoryComboBox.setCurrentIndex(index)
-        else:
-            self.categoryComboBox.setCurrentIndex(0)  # 默认选择"无分类"
+class ImportWorker(QThread):
+    """音频导入工作线程
+
+    在后台把选择的音频文件复制到缓存文件夹，多个文件由线程池并行复制。
+    按文件内容哈希去重：与已导入的文件或本次选择的其他文件内容相同的文件会被跳过。
+    """
+    importPlanned = pyqtSignal(list)  # 开始复制前发出，传递所有将要导入的缓存文件路径
+    fileImported = pyqtSignal(str)  # 单个文件导入完成信号，传递缓存文件路径
+    progress = pyqtSignal(int, int, float)  # 进度信号，传递已复制字节数、总字节数和速度（字节/秒）
+    importCompleted = pyqtSignal(int, list, list, bool)  # 完成信号，传递导入数量、重复文件、失败文件和是否已取消
+
+    PROGRESS_INTERVAL = 0.1  # 进度信号的最小间隔（秒）
+
+    def __init__(self, file_paths, cache_dir, existing_paths, max_workers=None):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.cache_dir = cache_dir
+        self.existing_paths = list(existing_paths)  # 已在列表中的缓存文件路径
+        self.max_workers = max_workers or get_import_workers()
+        self.is_canceled = False
+        self._lock = threading.Lock()
+        self._copied = 0
+        self._total = 0
+        self._started_at = 0
+        self._last_progress = 0
+
+    def cancel(self):
+        """取消导入，正在复制的文件会被中止并删除"""
+        self.is_canceled = True
+
+    def _hashes(self, paths):
+        """计算一组文件的内容哈希，读取失败的文件不包含在结果中"""
+        hashes = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(getFileHash, file_path): file_path for file_path in paths}
+            for future in as_completed(futures):
+                try:
+                    hashes[futures[future]] = future.result()
+                except OSError:
+                    pass
+        return hashes
+
+    def _findDuplicates(self, sizes):
+        """
+        按内容哈希找出重复的文件
+
+        只有大小与其他文件相同的文件才需要计算哈希。
+
+        Returns:
+            重复的源文件路径集合
+        """
+        existing_sizes = {}
+        for file_path in self.existing_paths:
+            try:
+                existing_sizes.setdefault(os.path.getsize(file_path), []).append(file_path)
+            except OSError:
+                pass
+        size_count = {}
+        for size in sizes.values():
+            size_count[size] = size_count.get(size, 0) + 1
+
+        candidates = [file_path for file_path, size in sizes.items()
+                      if size in existing_sizes or size_count[size] > 1]
+        if not candidates:
+            return set()
+        existing_candidates = [file_path for size in {sizes[c] for c in candidates}
+                               for file_path in existing_sizes.get(size, [])]
+        hashes = self._hashes(candidates + existing_candidates)
+
+        seen = {hashes[file_path] for file_path in existing_candidates if file_path in hashes}
+        duplicates = set()
+        for file_path in self.file_paths:
+            file_hash = hashes.get(file_path)
+            if file_hash is None:
+                continue
+            if file_hash in seen:
+                duplicates.add(file_path)
+            seen.add(file_hash)
+        return duplicates
+
+    def _targetPath(self, file_name, used_names):
+        """获取不与已有文件重名的缓存文件路径，重名时添加数字后缀"""
+        name, ext = os.path.splitext(file_name)
+        candidate = file_name
+        index = 1
+        while candidate in used_names or os.path.exists(os.path.join(self.cache_dir, candidate)):
+            candidate = f"{name}_{index}{ext}"
+            index += 1
+        used_names.add(candidate)
+        return os.path.join(self.cache_dir, candidate)
+
+    def _onChunk(self, size):
+        """复制进度回调，返回False时中止复制"""
+        if self.is_canceled:
+            return False
+        with self._lock:
+            self._copied += size
+            now = time.time()
+            if now - self._last_progress < self.PROGRESS_INTERVAL:
+                return True
+            self._last_progress = now
+            copied = self._copied
+        elapsed = max(now - self._started_at, 1e-6)
+        self.progress.emit(copied, self._total, copied / elapsed)
+        return True
+
+    def _copy(self, file_path, target_path):
+        if self.is_canceled:
+            return None
+        if not copyFileChunked(file_path, target_path, self._onChunk):
+            return None
+        return target_path
+
+    def run(self):
+        duplicate_files = []
+        failed_files = []
+        added_count = 0
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir, mode=0o755)  # 设置读写权限
+
+        sizes = {}
+        for file_path in dict.fromkeys(self.file_paths):
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError as e:
+                failed_files.append(f"{os.path.basename(file_path)} (错误: {str(e)})")
+
+        duplicates = self._findDuplicates(sizes)
+        duplicate_files = [os.path.basename(file_path) for file_path in sizes if file_path in duplicates]
+        # 已在列表中的文件名（包括分类中的文件），sounds.json以文件名作为键，不能重名
+        used_names = {os.path.basename(file_path) for file_path in self.existing_paths}
+        jobs = [(file_path, self._targetPath(os.path.basename(file_path), used_names))
+                for file_path in sizes if file_path not in duplicates]
+
+        self.importPlanned.emit([target_path for _, target_path in jobs])
+
+        self._total = sum(sizes[file_path] for file_path, _ in jobs)
+        self._started_at = time.time()
+        self.progress.emit(0, self._total, 0.0)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._copy, file_path, target_path): file_path
+                       for file_path, target_path in jobs}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    target_path = future.result()
+                except Exception as e:
+                    failed_files.append(f"{os.path.basename(file_path)} (错误: {str(e)})")
+                    continue
+                # 取消后尚未开始的任务会直接返回None
+                if target_path:
+                    added_count += 1
+                    self.fileImported.emit(target_path)
+
+        elapsed = max(time.time() - self._started_at, 1e-6)
+        self.progress.emit(self._copied, self._total, self._copied / elapsed)
+        self.importCompleted.emit(added_count, duplicate_files, failed_files, self.is_canceled)
+
+
+class MediaScanWorker(QThread):
+    """音频信息扫描线程
+
+    在后台获取音频文件的时长、编码、采样率和声道数，结果保存在项目的音频信息索引中，
+    重新打开项目时未变化的文件不需要再次获取。
+    """
+    mediaProbed = pyqtSignal(str, object)  # 单个文件信息获取完成信号，传递文件路径和音频信息（失败时为None）
+
+    def __init__(self, index_path, file_paths):
+        super().__init__()
+        self.index_path = index_path
+        self.file_paths = list(file_paths)
+        self.is_canceled = False
+
+    def cancel(self):
+        self.is_canceled = True
+
+    def run(self):
+        media_index = MediaIndex(self.index_path)
+        media_index.scan(
+            self.file_paths,
+            on_result=self.mediaProbed.emit,
+            is_canceled=lambda: self.is_canceled,
+        )
+        try:
+            media_index.save()
+        except Exception as e:
+            print(f"保存音频信息索引失败: {str(e)}")
+
 
 class EditorPage(QWidget):
     """音乐包编辑器页面"""
+    MENU_STYLE = """
+        QMenu {
+            background-color: #373737;
+            border: 2px solid #1F1F1F;
+            color: #FFFFFF;
+        }
+        QMenu::item:selected {
+            background-color: #4A4A4A;
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -263,6 +343,9 @@ class EditorPage(QWidget):
         # 当前项目路径
         self.current_project_path = None
         
+        # 当前项目索引，打开项目时一次性读取，导出时共用
+        self.projectIndex = None
+        
         # 创建主布局
         self.mainLayout = QVBoxLayout(self)
         self.mainLayout.setContentsMargins(20, 20, 20, 20)
@@ -297,6 +380,9 @@ class EditorPage(QWidget):
         # 创建音频文件选择器
         self.fileSelector = AudioFileSelector(self)
         self.fileSelector.fileSelected.connect(self.onFileSelected)
+        self.fileSelector.cancelRequested.connect(self.onCancelImport)
+        self.importWorker = None
+        self.importReserved = []  # 正在导入的文件，已预留soundKey
         self.mainLayout.addWidget(self.fileSelector)
         
         # 创建音频列表区域
@@ -333,6 +419,12 @@ class EditorPage(QWidget):
         self.addCategoryButton.clicked.connect(self.onAddCategory)
         self.listTitleLayout.addWidget(self.addCategoryButton)
         
+        # 创建移动到分类按钮（移动选中的音频）
+        self.moveCategoryButton = MinecraftPixelButton("移动到分类", button_type="blue")
+        self.moveCategoryButton.setFixedSize(100, 30)
+        self.moveCategoryButton.clicked.connect(self.onMoveButtonClicked)
+        self.listTitleLayout.addWidget(self.moveCategoryButton)
+        
         # 创建删除分类按钮
         self.deleteCategoryButton = MinecraftPixelButton("删除分类", button_type="red")
         self.deleteCategoryButton.setFixedSize(100, 30)
@@ -343,37 +435,80 @@ class EditorPage(QWidget):
         # 将标题布局添加到列表布局
         self.listLayout.addLayout(self.listTitleLayout)
         
-        # 创建音频列表
-        self.audioList = QListWidget()
+        # 创建音频列表（模型/视图，列表项由代理按需绘制，编辑时才创建输入控件）
+        self.audioModel = AudioListModel(self)
+        self.audioModel.categoryChanged.connect(self.onAudioCategoryChanged)
+        self.audioModel.soundKeyChanged.connect(self.onAudioSoundKeyChanged)
+        self.audioList = QListView()
+        self.audioList.setModel(self.audioModel)
+        self.audioDelegate = AudioItemDelegate(self.audioList)
+        self.audioDelegate.deleteRequested.connect(self.onDeleteAudio)
+        self.audioList.setItemDelegate(self.audioDelegate)
+        self.audioList.setUniformItemSizes(True)  # 行高固定，滚动时无需逐行计算大小
+        self.audioList.setEditTriggers(QAbstractItemView.NoEditTriggers)  # 只通过点击输入框/下拉框进入编辑
+        self.audioList.setSelectionMode(QAbstractItemView.ExtendedSelection)  # 支持多选后批量移动分类
+        self.audioList.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.audioList.customContextMenuRequested.connect(self.onAudioListContextMenu)
+        # 列表变化时合并更新音频统计
+        self.summaryTimer = QTimer(self)
+        self.summaryTimer.setSingleShot(True)
+        self.summaryTimer.setInterval(100)
+        self.summaryTimer.timeout.connect(self.updateSummary)
+        self.audioModel.rowsInserted.connect(self.scheduleSummary)
+        self.audioModel.rowsRemoved.connect(self.scheduleSummary)
+        self.audioModel.modelReset.connect(self.scheduleSummary)
+        self.audioModel.dataChanged.connect(self.scheduleSummary)
+        self.mediaWorker = None
         self.audioList.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #373737;
                 border: 2px solid #1F1F1F;
                 color: #FFFFFF;
             }
-            QListWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #1F1F1F;
-            }
-            QListWidget::item:selected {
-                background-color: #4A4A4A;
-            }
         """)
         self.listLayout.addWidget(self.audioList)
         
+        # 创建音频统计（数量、总时长和预计大小）
+        self.summaryLabel = MinecraftLabel("")
+        self.summaryLabel.setStyleSheet("color: #A0A0A0;")
+        self.listLayout.addWidget(self.summaryLabel)
+        
         # 添加列表框架到主布局
         self.mainLayout.addWidget(self.listFrame)
         
-        # 初始化音频文件列表和分类列表
-        self.audioFiles = []
+        # 初始化分类列表
         self.categories = []
         
+        # 音频信息延迟写入存储
+        self.audioStore = AudioInfoStore(self)
+        
+        # 监视缓存目录，外部添加、删除和移动的文件增量更新到列表
+        self.projectWatcher = ProjectWatcher(self)
+        self.projectWatcher.filesChanged.connect(self.onWatchedFilesChanged)
+        self.projectWatcher.categoriesChanged.connect(self.onWatchedCategoriesChanged)
+        
+        # 操作日志，Ctrl+Z撤销，Ctrl+Y或Ctrl+Shift+Z重做
+        self.journal = EditJournal(self)
+        QShortcut(QKeySequence("Ctrl+Z"), self, self.undo)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo)
+        
+    @property
+    def audioFiles(self):
+        """当前列表中的音频文件路径"""
+        return self.audioModel.filePaths()
+    
+    def hideEvent(self, event):
+        """页面被切换或窗口关闭时写入尚未保存的音频信息"""
+        self.flushAudioInfo()
+        super().hideEvent(event)
     
     # 返回主页信号
     backToMainPage = pyqtSignal()
     
     def onBack(self):
         """返回主页按钮点击事件"""
+        self.flushAudioInfo()
         # 尝试多种方式返回主页
         
         # 1. 尝试通过信号
@@ -398,7 +533,15 @@ class EditorPage(QWidget):
         # 加载项目配置
         pj_path = ProjectPath(project_name)
 
+        # 切换项目前停止正在进行的导入和扫描，并写入上一个项目尚未保存的音频信息
+        self.projectWatcher.stop()
+        self.stopImport()
+        self.stopMediaScan()
+        self.flushAudioInfo()
         self.current_project_path = pj_path
+        
+        # 一次性读取项目配置、音频配置并遍历缓存目录
+        self.projectIndex = ProjectIndex(pj_path)
 
         # 更新窗口标题
         self.title_text = f"音乐包编辑器 - {pj_path.project_name}"
@@ -409,15 +552,13 @@ class EditorPage(QWidget):
             window.setWindowTitle(self.title_text)
         
         # 清空当前列表
-        self.audioFiles = []
-        self.audioList.clear()
+        self.audioModel.clear()
         
         # 加载分类列表
         self.loadCategories()
         
         # 检查 sounds.json 文件是否存在，如果不存在则创建
-        sounds_json_path = self.current_project_path.cacheConfig()
-        if not os.path.exists(sounds_json_path):
+        if self.projectIndex.audio_info is None:
             # 只在文件不存在时才更新 sounds.json
             self.updateSoundsJsonFromCache()
         
@@ -425,14 +566,63 @@ class EditorPage(QWidget):
         if not self.loadAudioInfoFromJson():
             # 如果没有sounds.json或加载失败，则从缓存目录加载音频文件
             self.loadCachedAudioFiles()
+        
+ 
+        # 读取操作日志，恢复上次的撤销和重做列表
+        self.journal.load(pj_path.cacheJournal(), pj_path.cacheTrash())
+        
+        # 开始监视缓存目录
+        self.projectWatcher.watch(self.projectIndex)
+        
+        # 在后台获取音频信息
+        self.scanMedia()
     
-    def onFileSelected(self, file_paths):
-        """文件选择事件处理"""
-        # 处理多个文件
-        added_count = 0
-        duplicate_files = []
-        copy_failed_files = []
+    def onWatchedCategoriesChanged(self, categories):
+        """缓存目录中的分类文件夹发生变化"""
+        if categories == self.categories:
+            return
+        self.categories = categories
+        self.updateAllAudioItemCategories()
+        self.updateDeleteCategoryButtonState()
+    
+    def onWatchedFilesChanged(self, added, removed):
+        """缓存目录中的文件发生变化（外部添加、删除或移动），增量更新列表
         
+        编辑器自己导入和移动的文件已经在列表中，会被跳过。
+        """
+        index = self.projectIndex
+        added = [file_path for file_path in added if index.isAudioFile(file_path) and not self.audioModel.contains(file_path)]
+        removed = [file_path for file_path in removed if self.audioModel.contains(file_path)]
+        if not added and not removed:
+            return
+        
+        # 同名文件一删一增视为移动，保留soundkey
+        removed_by_name = {os.path.basename(file_path): file_path for file_path in removed}
+        entries = []
+        moved = []
+        for file_path in added:
+            category = index.categoryOf(file_path)
+            if category is None:
+                continue  # 分类文件夹中更深的子文件夹不显示
+            old_path = removed_by_name.pop(os.path.basename(file_path), None)
+            if old_path:
+                self.audioModel.setFilePath(old_path, file_path, category)
+                moved.append(file_path)
+            else:
+                entries.append(AudioEntry(file_path, category=category))
+        for file_path in removed_by_name.values():
+            self.audioModel.removeEntry(file_path)
+            self.audioStore.removeEntry(os.path.basename(file_path), file_path)
+        self.audioModel.addEntries(entries)
+        
+        # 只更新移动和新增的音频的信息
+        self.saveAudioEntries(moved + [entry.file_path for entry in entries])
+        if entries:
+            self.scanMedia()
+        print(f"缓存目录变化: 新增 {len(entries)} 个，删除 {len(removed_by_name)} 个，移动 {len(removed) - len(removed_by_name)} 个")
+    
+    def onFileSelected(self, file_paths):
+        """文件选择事件处理，在后台线程中复制文件"""
         # 确保项目路径已设置
         if not self.current_project_path:
             MinecraftMessageBox.show_warning(
@@ -442,53 +632,137 @@ class EditorPage(QWidget):
             )
             return
         
+        # 上一次导入尚未完成
+        if self.importWorker and self.importWorker.isRunning():
+            MinecraftMessageBox.show_warning(
+                self,
+                "正在导入",
+                "请等待当前导入完成或取消后再添加"
+            )
+            return
+        
         # 获取缓存文件夹路径
         cache_dir = self.current_project_path.cacheSrc()
         
-        # 确保缓存文件夹存在
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir, mode=0o755)  # 设置读写权限
-        
-        for file_path in file_paths:
-            # 检查文件是否已存在
-            if file_path in self.audioFiles:
-                duplicate_files.append(os.path.basename(file_path))
-                continue
-            
-            # 复制文件到缓存文件夹
+        self.importWorker = ImportWorker(file_paths, cache_dir, self.audioFiles)
+        self.importWorker.importPlanned.connect(self.onImportPlanned)
+        self.importWorker.fileImported.connect(self.onFileImported)
+        self.importWorker.progress.connect(self.fileSelector.setProgress)
+        self.importWorker.importCompleted.connect(self.onImportCompleted)
+        self.fileSelector.setImporting(True)
+        self.importWorker.start()
+    
+    def onCancelImport(self):
+        """取消导入"""
+        if self.importWorker and self.importWorker.isRunning():
+            self.importWorker.cancel()
+    
+    def stopImport(self):
+        """停止正在进行的导入并等待线程结束，之后不再处理它的信号"""
+        if self.importWorker is None:
+            return
+        self.importWorker.importPlanned.disconnect(self.onImportPlanned)
+        self.importWorker.fileImported.disconnect(self.onFileImported)
+        self.importWorker.importCompleted.disconnect(self.onImportCompleted)
+        self.importWorker.cancel()
+        self.importWorker.wait()
+        self.importWorker = None
+        self.importReserved = []
+        self.fileSelector.setImporting(False)
+    
+    def scanMedia(self):
+        """在后台获取尚无音频信息的文件的信息"""
+        if not self.current_project_path:
+            return
+        file_paths = [entry.file_path for entry in self.audioModel.entries() if entry.media is None]
+        if not file_paths:
+            return
+        if self.mediaWorker and self.mediaWorker.isRunning():
+            # 正在扫描时等它结束后再扫描新文件
             try:
-                copyFile(file_path, cache_dir)
-                
-                # 获取文件名
-                file_name = os.path.basename(file_path)
-                # 构建缓存文件路径
-                cache_file_path = os.path.join(cache_dir, file_name)
-                
-                # 添加缓存文件路径到列表（而不是原始文件路径）
-                self.audioFiles.append(cache_file_path)
-                added_count += 1
-                
-                # 创建列表项
-                item = QListWidgetItem()
-                self.audioList.addItem(item)
-                
-                # 创建自定义小部件（使用缓存文件路径）
-                widget = AudioListItem(cache_file_path, categories=self.categories)
-                widget.deleteRequested.connect(self.onDeleteAudio)
-                widget.categoryChanged.connect(self.onAudioCategoryChanged)
-                widget.soundKeyChanged.connect(self.onAudioSoundKeyChanged)
-                
-                # 设置列表项大小和小部件
-                item.setSizeHint(widget.sizeHint())
-                self.audioList.setItemWidget(item, widget)
-            except Exception as e:
-                copy_failed_files.append(f"{os.path.basename(file_path)} (错误: {str(e)})")
+                self.mediaWorker.finished.connect(self.scanMedia, Qt.UniqueConnection)
+            except TypeError:
+                pass  # 已经连接过
+            return
+        self.mediaWorker = MediaScanWorker(self.current_project_path.cacheMedia(), file_paths)
+        self.mediaWorker.mediaProbed.connect(self.onMediaProbed)
+        self.mediaWorker.start()
+    
+    def stopMediaScan(self):
+        """停止正在进行的音频信息扫描"""
+        if self.mediaWorker is None:
+            return
+        self.mediaWorker.mediaProbed.disconnect(self.onMediaProbed)
+        try:
+            self.mediaWorker.finished.disconnect(self.scanMedia)
+        except TypeError:
+            pass
+        self.mediaWorker.cancel()
+        self.mediaWorker.wait()
+        self.mediaWorker = None
+    
+    def onMediaProbed(self, file_path, info):
+        """单个文件的音频信息获取完成"""
+        if info is not None:
+            self.audioModel.setMedia(file_path, info)
+    
+    def scheduleSummary(self, *args):
+        """列表变化后稍后更新音频统计，合并短时间内的多次变化"""
+        self.summaryTimer.start()
+    
+    def updateSummary(self):
+        """更新音频数量、总时长和预计大小"""
+        entries = self.audioModel.entries()
+        if not entries:
+            self.summaryLabel.setText("")
+            return
+        duration = 0.0
+        size = 0
+        for entry in entries:
+            if entry.media:
+                duration += entry.media.get("duration", 0)
+                size += MediaIndex.estimate_size(entry.file_path, entry.media)
+        text = f"{len(entries)} 个音频 · 总时长 {formatDuration(duration)} · 预计 {size / 1024 / 1024:.1f} MB"
+        self.summaryLabel.setText(text)
+    
+    def onImportPlanned(self, cache_file_paths):
+        """复制开始前按选择顺序一次性为整批文件预留soundKey
         
-        # 如果成功添加了文件，保存音频信息到JSON
+        文件复制完成的先后不固定，预留后同一批文件得到的soundKey不受完成顺序影响。
+        """
+        self.importReserved = cache_file_paths
+        self.audioModel.keyIndex.assignMany([(file_path, None) for file_path in cache_file_paths])
+    
+    def onFileImported(self, cache_file_path):
+        """单个文件导入完成，添加到列表"""
+        sound_key = self.audioModel.keyIndex.keyOf(cache_file_path)
+        self.audioModel.addEntries([AudioEntry(cache_file_path, sound_key)])
+        self.saveAudioEntries([cache_file_path])
+    
+    def onImportCompleted(self, added_count, duplicate_files, copy_failed_files, canceled):
+        """导入完成事件处理"""
+        self.fileSelector.setImporting(False)
+        # 释放未能导入的文件预留的soundKey，整批导入的文件记录为一个操作
+        items = []
+        for file_path in self.importReserved:
+            if self.audioModel.contains(file_path):
+                items.append(self.journalItem(file_path))
+            else:
+                self.audioModel.keyIndex.release(file_path)
+        self.importReserved = []
+        if items:
+            self.journal.record({"type": "add", "items": items})
         if added_count > 0:
-            self.saveAudioInfoToJson()
-            
-            # 显示添加结果
+            self.scanMedia()
+        
+        # 显示添加结果
+        if canceled:
+            MinecraftMessageBox.show_message(
+                self,
+                "导入已取消",
+                f"已添加 {added_count} 个音频文件，其余文件未导入"
+            )
+        elif added_count > 0:
             success_message = f"成功添加了 {added_count} 个音频文件"
             if not copy_failed_files:
                 success_message += "，并已复制到缓存文件夹"
@@ -511,50 +785,22 @@ class EditorPage(QWidget):
             MinecraftMessageBox.show_warning(
                 self,
                 "文件已存在",
-                f"以下文件已经添加过了:\n{', '.join(duplicate_files)}"
+                f"以下文件与已添加的文件内容相同:\n{', '.join(duplicate_files)}"
             )
     
     def onDeleteAudio(self, file_path):
-        """删除音频文件"""
+        """删除音频文件，文件移动到回收站，可以撤销"""
         # 从列表中移除文件
-        if file_path in self.audioFiles:
-            index = self.audioFiles.index(file_path)
+        if self.audioModel.contains(file_path):
             try:
-                # 删除缓存目录中的对应文件
-                if self.current_project_path:
-                    # 获取文件名
-                    file_name = os.path.basename(file_path)
-                    
-                    # 检查文件是否在缓存根目录
-                    cache_root = self.current_project_path.cache()
-                    cache_file_path = os.path.join(cache_root, file_name)
-                    if os.path.exists(cache_file_path):
-                        delFile(cache_file_path)
-                    
-                    # 检查文件是否在缓存源文件目录
-                    cache_src = self.current_project_path.cacheSrc()
-                    cache_src_file_path = os.path.join(cache_src, file_name)
-                    if os.path.exists(cache_src_file_path):
-                        delFile(cache_src_file_path)
-                    
-                    # 检查文件是否在分类子文件夹中
-                    for category in self.categories:
-                        category_dir = self.current_project_path.cacheSrcF(category)
-                        category_file_path = os.path.join(category_dir, file_name)
-                        if os.path.exists(category_file_path):
-                            delFile(category_file_path)
-                            break
-                
-                self.audioFiles.remove(file_path)
-                self.audioList.takeItem(index)
-                
-                # 保存音频信息到JSON文件
-                self.saveAudioInfoToJson()
+                item = self.journalItem(file_path)
+                self.trashAudio(item)
+                self.journal.record({"type": "delete", "items": [item]})
                 
                 MinecraftMessageBox.show_message(
                     self,
                     "删除成功",
-                    f"已成功从列表中移除 {os.path.basename(file_path)}"
+                    f"已成功从列表中移除 {os.path.basename(file_path)}（按Ctrl+Z撤销）"
                 )
             except Exception as e:
                 MinecraftMessageBox.show_warning(
@@ -580,6 +826,11 @@ class EditorPage(QWidget):
             )
             return
         
+        # 导出前写入尚未保存的音频信息，并同步到项目索引供导出使用
+        self.flushAudioInfo()
+        if self.projectIndex:
+            self.projectIndex.audio_info = self.audioStore.info()
+        
         # 发送切换到导出页面的信号，传递项目路径和音频文件列表
         self.switchToExportPage.emit(self.current_project_path, self.audioFiles)
     
@@ -622,9 +873,6 @@ class EditorPage(QWidget):
                 # 更新所有音频项的分类下拉框
                 self.updateAllAudioItemCategories()
                 
-                # 保存音频信息到JSON文件
-                self.saveAudioInfoToJson()
-                
                 MinecraftMessageBox.show_message(
                     self,
                     "创建成功",
@@ -641,100 +889,39 @@ class EditorPage(QWidget):
         """更新删除分类按钮状态"""
         self.deleteCategoryButton.setEnabled(len(self.categories) > 0)
         
-    def saveAudioInfoToJson(self):
-        from utils import updateJsonFile, createJsonFile
-        """保存音频信息到sounds.json文件"""
-        if not self.current_project_path:
-            return
-        
-        import json
-        
-        # sounds.json 文件路径
-        sounds_json_path = self.current_project_path.cacheConfig()
-        
-        # 读取现有的 sounds.json 文件（如果存在）
-        existing_audio_info = {}
-        if os.path.exists(sounds_json_path):
-            try:
-                with open(sounds_json_path, 'r', encoding='utf-8') as f:
-                    existing_audio_info = json.load(f)
-            except Exception as e:
-                print(f"读取 sounds.json 文件失败: {str(e)}")
-        
-        # 创建音频信息字典
-        audio_info = {}
-        
-        # 获取当前列表中的所有文件名
-        current_file_names = []
-        
-        # 遍历所有列表项，获取音频信息
-        for i in range(self.audioList.count()):
-            item = self.audioList.item(i)
-            widget = self.audioList.itemWidget(item)
-            if isinstance(widget, AudioListItem):
-                file_path = widget.file_path  # 这是当前实际的文件路径
-                file_name = os.path.basename(file_path)
-                current_file_names.append(file_name)
-                
-                # 获取当前分类
-                category = widget.categoryComboBox.currentText()
-                if category == "无分类":
-                    category = ""
-                
-                # 确保cache_path与实际文件路径一致
-                actual_cache_path = file_path
-                
-                # 获取soundKey
-                sound_key = widget.soundKey
-                
-                # 只保留名称对应的分类、soundkey和cache_path
-                audio_info[file_name] = {
-                    "category": category,
-                    "sound_key": sound_key,
-                    "cache_path": actual_cache_path
-                }
-        
-        # 保留不在当前列表中的音频文件信息，但只保留必要字段
-        for file_name, info in existing_audio_info.items():
-            if file_name not in current_file_names:
-                # 只保留必要字段
-                audio_info[file_name] = {
-                    "category": info.get("category", ""),
-                    "sound_key": info.get("sound_key", ""),
-                    "cache_path": info.get("cache_path", "")
-                }
-        
-        # 保存到sounds.json文件
-        try:
-            # 检查文件是否存在
-            if not os.path.exists(sounds_json_path):
-                createJsonFile(sounds_json_path)
-            updateJsonFile(sounds_json_path, audio_info)
-            return True
-        except Exception as e:
-            print(f"保存音频信息失败: {str(e)}")
-            return False
+    def saveAudioEntries(self, file_paths):
+        """保存列表中指定音频的信息到sounds.json文件
+
+        只更新这些音频在内存中的信息，由AudioInfoStore合并修改后延迟写入，
+        不遍历整个列表。不在列表中的文件会被跳过。
+        """
+        for file_path in file_paths:
+            row = self.audioModel.rowOf(file_path)
+            if row < 0:
+                continue
+            entry = self.audioModel.entry(row)
+            self.audioStore.setEntry(
+                os.path.basename(entry.file_path), entry.category, entry.sound_key, entry.file_path)
+    
+    def flushAudioInfo(self):
+        """立即写入尚未保存的音频信息"""
+        return self.audioStore.flush()
     
     def loadAudioInfoFromJson(self):
         """从sounds.json文件加载音频信息"""
         if not self.current_project_path:
             return False
         
-        import json
-        
         # sounds.json文件路径
         sounds_json_path = self.current_project_path.cacheConfig()
         
-        # 检查文件是否存在
-        if not os.path.exists(sounds_json_path):
-            print(f"sounds.json文件不存在: {sounds_json_path}")
+        # 使用项目索引中已读取的sounds.json内容
+        audio_info = self.audioStore.setInfo(sounds_json_path, self.projectIndex.audio_info)
+        if audio_info is None:
+            print(f"sounds.json文件不存在或无法读取: {sounds_json_path}")
             return False
         
         try:
-            # 读取sounds.json文件
-            with open(sounds_json_path, 'r', encoding='utf-8') as f:
-                audio_info = json.load(f)
-            
             # 获取缓存文件夹路径
             cache_dir = self.current_project_path.cacheSrc()
             
@@ -743,54 +930,35 @@ class EditorPage(QWidget):
                 os.makedirs(cache_dir, mode=0o755)  # 设置读写权限
             
             # 加载音频文件
+            entries = []
             for file_name, info in audio_info.items():
-                # 构建缓存文件路径
+                # 分类不存在时视为无分类
+                category = info.get("category", "")
+                if category not in self.categories:
+                    category = ""
+                
+                # 优先使用cache_path（分类中的文件），否则使用缓存根目录中的文件
+                cache_path = info.get("cache_path", "")
                 cache_file_path = os.path.join(cache_dir, file_name)
+                if cache_path and self.projectIndex.exists(cache_path):
+                    cache_file_path = cache_path
+                elif not self.projectIndex.exists(cache_file_path):
+                    print(f"缓存文件不存在: {file_name}")
+                    continue
                 
-                # 检查缓存文件是否存在
-                if not os.path.exists(cache_file_path):
-                    # 检查cache_path是否存在
-                    cache_path = info.get("cache_path", "")
-                    if cache_path and os.path.exists(cache_path) and cache_path != cache_file_path:
-                        try:
-                            copyFile(cache_path, cache_dir)
-                        except Exception as e:
-                            print(f"复制文件失败: {str(e)}")
-                            continue
-                    else:
-                        print(f"缓存文件不存在且无法从cache_path复制: {file_name}")
-                        continue
+                # 文件不在所选分类的目录中时移动过去
+                target_dir = self.current_project_path.cacheSrcF(category) if category else cache_dir
+                if os.path.dirname(os.path.abspath(cache_file_path)) != os.path.abspath(target_dir):
+                    cache_file_path = self.moveAudioFile(cache_file_path, category) or cache_file_path
                 
-                # 检查文件是否已存在于列表中
-                if cache_file_path not in self.audioFiles:
-                    # 添加文件到列表
-                    self.audioFiles.append(cache_file_path)
-                    
-                    # 创建列表项
-                    item = QListWidgetItem()
-                    self.audioList.addItem(item)
-                    
-                    # 创建自定义小部件
-                    widget = AudioListItem(cache_file_path, categories=self.categories)
-                    widget.deleteRequested.connect(self.onDeleteAudio)
-                    widget.categoryChanged.connect(self.onAudioCategoryChanged)
-                    widget.soundKeyChanged.connect(self.onAudioSoundKeyChanged)
-                    
-                    # 设置soundKey
-                    sound_key = info.get("sound_key", "")
-                    if sound_key:
-                        widget.soundKeyEdit.setText(sound_key)
-                    
-                    # 设置分类
-                    category = info.get("category", "")
-                    if category:
-                        index = widget.categoryComboBox.findText(category)
-                        if index >= 0:
-                            widget.categoryComboBox.setCurrentIndex(index)
-                    
-                    # 设置列表项大小和小部件
-                    item.setSizeHint(widget.sizeHint())
-                    self.audioList.setItemWidget(item, widget)
+                entries.append(AudioEntry(cache_file_path, info.get("sound_key", ""), category))
+            
+            # 一次性添加到列表
+            self.audioDelegate.setCategories(self.categories)
+            self.audioModel.addEntries(entries)
+            
+            # 加载时移动过的文件需要更新cache_path，AudioInfoStore只对有变化的音频安排写入
+            self.saveAudioEntries([entry.file_path for entry in entries])
             
             print(f"已从sounds.json加载音频信息")
             return True
@@ -798,82 +966,141 @@ class EditorPage(QWidget):
             print(f"加载音频信息失败: {str(e)}")
             return False
     
-    def onAudioCategoryChanged(self, file_path, category):
-        """处理音频分类变更
-        
-        将音频文件从原分类移动到新分类文件夹。
-        如果选择"无分类"，则移动到根目录。
-        
-        Args:
-            file_path: 音频文件路径
-            category: 目标分类名称，"无分类"表示移动到根目录
+    def moveAudioFile(self, file_path, category):
+        """将音频文件移动到分类文件夹，分类为空时移动到根目录
+
+        Returns:
+            移动后的文件路径，失败时返回None
         """
-        from utils import copyFile, delFile
-        
         try:
             # 获取文件名
             file_name = os.path.basename(file_path)
             
             # 确定目标路径
-            if category == "无分类":
+            if not category:
                 # 移动到根目录
                 target_dir = self.current_project_path.cacheSrc()
-                target_path = os.path.join(target_dir, file_name)
-                print(f"音频文件 {file_name} 已从分类中移除")
             else:
                 # 移动到分类目录
                 target_dir = self.current_project_path.cacheSrcF(category)
-                target_path = os.path.join(target_dir, file_name)
-                print(f"音频文件 {file_name} 已移动到分类 {category}")
-            
-            # 确保目标目录存在
-            if not os.path.exists(target_dir):
-                os.makedirs(target_dir, mode=0o755)  # 设置读写权限
-            
-            # 使用复制后删除的方式实现剪切粘贴
-            copyFile(file_path, target_path)
-            delFile(file_path)
-            
-            # 更新文件路径在列表中的引用
-            for i, audio_path in enumerate(self.audioFiles):
-                if audio_path == file_path:
-                    self.audioFiles[i] = target_path
-                    break
-            
-            # 更新列表项中的文件路径
-            for i in range(self.audioList.count()):
-                item = self.audioList.item(i)
-                widget = self.audioList.itemWidget(item)
-                if isinstance(widget, AudioListItem) and widget.file_path == file_path:
-                    widget.file_path = target_path
-                    break
-                    
-            print(f"音频文件 {file_name} 的分类已更改为: {category if category else '无分类'}")
-            
-            # 保存音频信息到JSON文件
-            self.saveAudioInfoToJson()
+            target_path = os.path.join(target_dir, file_name)
             
+            # 同一磁盘内直接重命名，不复制文件内容
+            renameFile(file_path, target_path)
             return target_path
         except Exception as e:
-            print(f"分类更改失败: {str(e)}")
+            print(f"移动音频文件失败: {str(e)}")
+            return None
+    
+    def onAudioCategoryChanged(self, file_path, category):
+        """处理音频分类变更
+        
+        将音频文件从原分类移动到新分类文件夹。
+        如果分类为空（无分类），则移动到根目录。
+        
+        Args:
+            file_path: 音频文件路径
+            category: 目标分类名称，空字符串表示移动到根目录
+        """
+        target_path = self.moveAudioFile(file_path, category)
+        if target_path is None:
+            print(f"分类更改失败: {os.path.basename(file_path)}")
             return None
+        
+        # 更新列表中的文件路径
+        self.audioModel.setFilePath(file_path, target_path)
+        self.journal.record({"type": "category", "items": [{
+            "old_path": file_path, "new_path": target_path,
+            "old": self.projectIndex.categoryOf(file_path) or "", "new": category,
+        }]})
+        print(f"音频文件 {os.path.basename(file_path)} 的分类已更改为: {category if category else '无分类'}")
+        
+        # 只更新这一项，延迟写入JSON文件
+        self.saveAudioEntries([target_path])
+        
+        return target_path
+    
+    def moveAudioFilesToCategory(self, file_paths, category):
+        """把多个音频移动到同一个分类，空字符串表示无分类
+        
+        Returns:
+            int: 实际移动的音频数量
+        """
+        moved = 0
+        with self.journal.group():
+            for file_path in file_paths:
+                row = self.audioModel.rowOf(file_path)
+                # 分类变化时模型会发出categoryChanged信号，由onAudioCategoryChanged移动文件
+                if row >= 0 and self.audioModel.setData(self.audioModel.index(row), category, CategoryRole):
+                    moved += 1
+        return moved
+    
+    def selectedAudioFiles(self):
+        """获取列表中选中的音频文件路径"""
+        rows = sorted(index.row() for index in self.audioList.selectionModel().selectedRows())
+        return [self.audioModel.entry(row).file_path for row in rows]
+    
+    def categoryMenu(self):
+        """创建“移动到分类”菜单，选择后移动所有选中的音频"""
+        menu = QMenu(self)
+        menu.setStyleSheet(self.MENU_STYLE)
+        for category in [""] + self.categories:
+            action = menu.addAction(category or NO_CATEGORY)
+            action.triggered.connect(lambda checked=False, c=category: self.onMoveSelected(c))
+        return menu
+    
+    def onMoveButtonClicked(self):
+        """移动到分类按钮点击事件"""
+        self.categoryMenu().exec_(self.moveCategoryButton.mapToGlobal(self.moveCategoryButton.rect().bottomLeft()))
+    
+    def onAudioListContextMenu(self, pos):
+        """音频列表右键菜单"""
+        menu = QMenu(self)
+        menu.setStyleSheet(self.MENU_STYLE)
+        if self.selectedAudioFiles():
+            move_menu = self.categoryMenu()
+            move_menu.setTitle("移动到分类")
+            menu.addMenu(move_menu)
+        if self.journal.canUndo():
+            menu.addAction("撤销 (Ctrl+Z)").triggered.connect(self.undo)
+        if self.journal.canRedo():
+            menu.addAction("重做 (Ctrl+Y)").triggered.connect(self.redo)
+        if menu.isEmpty():
+            return
+        menu.exec_(self.audioList.viewport().mapToGlobal(pos))
+    
+    def onMoveSelected(self, category):
+        """把选中的音频移动到分类"""
+        file_paths = self.selectedAudioFiles()
+        if not file_paths:
+            MinecraftMessageBox.show_warning(
+                self,
+                "无法移动",
+                "请先在列表中选择音频（按住Ctrl或Shift可多选）"
+            )
+            return
+        moved = self.moveAudioFilesToCategory(file_paths, category)
+        print(f"已将 {moved} 个音频移动到分类: {category if category else NO_CATEGORY}")
     
     def onAudioSoundKeyChanged(self, file_path, sound_key):
         """音频soundKey变更事件"""
         # 处理音频文件soundKey变更
         print(f"音频文件 {os.path.basename(file_path)} 的soundKey已更改为: {sound_key}")
         
-        # 保存音频信息到JSON文件
-        self.saveAudioInfoToJson()
+        # 只更新这一项，延迟写入JSON文件
+        row = self.audioModel.rowOf(file_path)
+        if row >= 0:
+            entry = self.audioModel.entry(row)
+            old = self.audioStore.info().get(os.path.basename(file_path), {}).get("sound_key")
+            if old and old != sound_key:
+                self.journal.record({"type": "sound_key", "items": [{"file_path": file_path, "old": old, "new": sound_key}]})
+            self.audioStore.setEntry(os.path.basename(file_path), entry.category, entry.sound_key, entry.file_path)
     
     def updateAllAudioItemCategories(self):
         """更新所有音频项的分类下拉框"""
-        # 遍历所有列表项，更新分类下拉框
-        for i in range(self.audioList.count()):
-            item = self.audioList.item(i)
-            widget = self.audioList.itemWidget(item)
-            if isinstance(widget, AudioListItem):
-                widget.updateCategories(self.categories)
+        self.audioDelegate.setCategories(self.categories)
+        # 属于已删除分类的音频改为无分类
+        self.audioModel.resetCategories(self.categories)
     
     def loadCategories(self):
         """加载项目中的分类列表"""
@@ -883,10 +1110,9 @@ class EditorPage(QWidget):
         # 清空当前分类列表
         self.categories = []
         
-        # 获取sounds目录下的所有文件夹作为分类
-        sounds_dir = self.current_project_path.cacheSrc()
-        if os.path.exists(sounds_dir):
-            self.categories = getFolderList(sounds_dir)
+        # 项目索引中cache/src下的所有文件夹作为分类
+        self.categories = list(self.projectIndex.categories)
+        self.audioDelegate.setCategories(self.categories)
         
         # 更新删除分类按钮状态
         self.updateDeleteCategoryButtonState()
@@ -900,7 +1126,6 @@ class EditorPage(QWidget):
         if not self.current_project_path:
             return
         
-        import json
         from utils import updateJsonFile, createJsonFile
         
         # 获取缓存文件夹路径
@@ -918,50 +1143,35 @@ class EditorPage(QWidget):
         if os.path.exists(sounds_json_path) and not force_update:
             return
         
-        # 读取现有的 sounds.json 文件（如果存在）
-        existing_audio_info = {}
-        if os.path.exists(sounds_json_path):
-            try:
-                with open(sounds_json_path, 'r', encoding='utf-8') as f:
-                    existing_audio_info = json.load(f)
-            except Exception as e:
-                print(f"读取 sounds.json 文件失败: {str(e)}")
-        
-        # 获取缓存目录中的所有音频文件
-        audio_files = getFileList(cache_dir)
+        # 项目索引中现有的 sounds.json 内容（如果存在）
+        existing_audio_info = self.projectIndex.audio_info or {}
         
-        # 检查分类目录中的音频文件
+        # 项目索引中缓存目录和分类目录的所有音频文件（文件名 -> (分类, 路径)）
+        audio_files = {}
+        for file_path in self.projectIndex.rootAudioFiles():
+            audio_files[os.path.basename(file_path)] = ("", file_path)
         for category in self.categories:
             category_dir = self.current_project_path.cacheSrcF(category)
-            if os.path.exists(category_dir):
-                category_files = getFileList(category_dir)
-                for file_name in category_files:
-                    if file_name not in audio_files:
-                        audio_files.append(file_name)
+            for file_name in self.projectIndex.categoryAudioFiles(category):
+                audio_files.setdefault(file_name, (category, os.path.join(category_dir, file_name)))
         
         # 创建更新后的音频信息字典
         updated_audio_info = {}
-        
-        # 过滤出音频文件并更新信息
-        valid_extensions = [".ogg", ".wav", ".mp3", ".flac"]
-        for file_name in audio_files:
-            _, ext = os.path.splitext(file_name)
-            if ext.lower() in valid_extensions:
-                # 检查文件是否在现有的 sounds.json 中
-                if file_name in existing_audio_info:
-                    # 保留现有信息
-                    updated_audio_info[file_name] = existing_audio_info[file_name]
-                else:
-                    # 为新文件创建默认信息
-                    file_path = os.path.join(cache_dir, file_name)
-                    updated_audio_info[file_name] = {
-                        "name": file_name,
-                        "sound_key": os.path.splitext(file_name)[0],  # 默认使用文件名作为 sound_key
-                        "category": "",  # 默认无分类
-                        "original_suffix": ext,
-                        "original_path": file_path,
-                        "cache_path": file_path
-                    }
+        for file_name, (category, file_path) in audio_files.items():
+            # 检查文件是否在现有的 sounds.json 中
+            if file_name in existing_audio_info:
+                # 保留现有信息
+                updated_audio_info[file_name] = existing_audio_info[file_name]
+            else:
+                # 为新文件创建默认信息
+                updated_audio_info[file_name] = {
+                    "name": file_name,
+                    "sound_key": os.path.splitext(file_name)[0],  # 默认使用文件名作为 sound_key
+                    "category": category,  # 所在的分类文件夹
+                    "original_suffix": os.path.splitext(file_name)[1],
+                    "original_path": file_path,
+                    "cache_path": file_path
+                }
         
         # 保存更新后的音频信息到 sounds.json 文件
         try:
@@ -969,6 +1179,7 @@ class EditorPage(QWidget):
             if not os.path.exists(sounds_json_path):
                 createJsonFile(sounds_json_path)
             updateJsonFile(sounds_json_path, updated_audio_info)
+            self.projectIndex.audio_info = updated_audio_info
             print(f"已更新 sounds.json 文件")
         except Exception as e:
             print(f"更新 sounds.json 文件失败: {str(e)}")
@@ -986,34 +1197,115 @@ class EditorPage(QWidget):
             os.makedirs(cache_dir, mode=0o755)  # 设置读写权限
             return
         
-        # 获取缓存目录中的所有音频文件
-        audio_files = getFileList(cache_dir)
+        # 项目索引中缓存目录的所有音频文件
+        entries = [AudioEntry(file_path) for file_path in self.projectIndex.rootAudioFiles()]
         
-        # 过滤出音频文件
-        valid_extensions = [".ogg", ".wav", ".mp3", ".flac"]
-        for file_name in audio_files:
-            _, ext = os.path.splitext(file_name)
-            if ext.lower() in valid_extensions:
-                file_path = os.path.join(cache_dir, file_name)
-                
-                # 检查文件是否已存在于列表中
-                if file_path not in self.audioFiles:
-                    # 添加文件到列表
-                    self.audioFiles.append(file_path)
-                    
-                    # 创建列表项
-                    item = QListWidgetItem()
-                    self.audioList.addItem(item)
-                    
-                    # 创建自定义小部件
-                    widget = AudioListItem(file_path, categories=self.categories)
-                    widget.deleteRequested.connect(self.onDeleteAudio)
-                    widget.categoryChanged.connect(self.onAudioCategoryChanged)
-                    widget.soundKeyChanged.connect(self.onAudioSoundKeyChanged)
-                    
-                    # 设置列表项大小和小部件
-                    item.setSizeHint(widget.sizeHint())
-                    self.audioList.setItemWidget(item, widget)
+        # 一次性添加到列表，已存在的文件会被跳过
+        self.audioDelegate.setCategories(self.categories)
+        self.audioModel.addEntries(entries)
+    
+    def journalItem(self, file_path):
+        """记录一个音频用于撤销添加或删除，回收站路径在记录时确定"""
+        entry = self.audioModel.entry(self.audioModel.rowOf(file_path))
+        return {"file_path": file_path, "sound_key": entry.sound_key, "category": entry.category,
+                "trash_path": self.journal.trashPath(file_path)}
+    
+    def trashAudio(self, item):
+        """把音频移动到回收站并从列表中移除，已经在回收站中时只更新列表"""
+        if os.path.exists(item["file_path"]) or not os.path.exists(item["trash_path"]):
+            renameFile(item["file_path"], item["trash_path"])
+        self.audioModel.removeEntry(item["file_path"])
+        self.audioStore.removeEntry(os.path.basename(item["file_path"]), item["file_path"])
+    
+    def restoreAudio(self, item):
+        """把音频从回收站移动回原位置并添加到列表，已经在原位置时只更新列表"""
+        if os.path.exists(item["trash_path"]) or not os.path.exists(item["file_path"]):
+            renameFile(item["trash_path"], item["file_path"])
+        self.audioModel.addEntries([AudioEntry(item["file_path"], item["sound_key"], item["category"])])
+        self.saveAudioEntries([item["file_path"]])
+    
+    def relocateAudio(self, from_path, to_path, category):
+        """把音频移动回指定位置，不再经过categoryChanged信号，已经在指定位置时只更新列表"""
+        if os.path.exists(from_path) or not os.path.exists(to_path):
+            renameFile(from_path, to_path)
+        self.audioModel.setFilePath(from_path, to_path, category)
+        self.saveAudioEntries([to_path])
+    
+    def applyOperation(self, op, undo):
+        """撤销或重做一个操作，只处理操作涉及的文件
+
+        每个文件单独处理，已经处理好的文件会被跳过，有文件处理失败时最后抛出异常，
+        操作保留在原来的列表中，可以再次尝试。
+        """
+        op_type = op["type"]
+        if op_type == "group":
+            for child in (reversed(op["ops"]) if undo else op["ops"]):
+                self.applyOperation(child, undo)
+            return
+        if op_type == "delete_category":
+            if undo:
+                renameFile(op["trash_path"], op["path"])
+                if op["category"] not in self.categories:
+                    self.categories.append(op["category"])
+            else:
+                renameFile(op["path"], op["trash_path"])
+                if op["category"] in self.categories:
+                    self.categories.remove(op["category"])
+            self.updateDeleteCategoryButtonState()
+            self.updateAllAudioItemCategories()
+            return
+        failed = []
+        for item in op["items"]:
+            try:
+                if op_type in ("add", "delete"):
+                    # 撤销添加和重做删除都是移动到回收站
+                    if undo == (op_type == "add"):
+                        self.trashAudio(item)
+                    else:
+                        self.restoreAudio(item)
+                elif op_type == "category":
+                    if undo:
+                        self.relocateAudio(item["new_path"], item["old_path"], item["old"])
+                    else:
+                        self.relocateAudio(item["old_path"], item["new_path"], item["new"])
+                elif op_type == "sound_key":
+                    row = self.audioModel.rowOf(item["file_path"])
+                    if row >= 0:
+                        self.audioModel.setData(self.audioModel.index(row), item["old"] if undo else item["new"], SoundKeyRole)
+            except Exception as e:
+                file_name = os.path.basename(item.get('file_path') or item.get('new_path', ''))
+                print(f"{'撤销' if undo else '重做'}失败: {file_name} - {str(e)}")
+                failed.append(file_name)
+        if failed:
+            raise Error(f"{len(failed)} 个文件处理失败: {', '.join(failed[:5])}{' ...' if len(failed) > 5 else ''}")
+    
+    def undo(self):
+        """撤销最近一个操作，失败时操作仍保留在撤销列表中"""
+        op = self.journal.peekUndo()
+        if op is None:
+            return
+        try:
+            with self.journal.replaying():
+                self.applyOperation(op, undo=True)
+        except Exception as e:
+            MinecraftMessageBox.show_warning(self, "撤销失败", f"撤销失败: {str(e)}")
+            return
+        self.journal.commitUndo()
+        self.scheduleSummary()
+    
+    def redo(self):
+        """重做最近撤销的操作，失败时操作仍保留在重做列表中"""
+        op = self.journal.peekRedo()
+        if op is None:
+            return
+        try:
+            with self.journal.replaying():
+                self.applyOperation(op, undo=False)
+        except Exception as e:
+            MinecraftMessageBox.show_warning(self, "重做失败", f"重做失败: {str(e)}")
+            return
+        self.journal.commitRedo()
+        self.scheduleSummary()
     
     def onDeleteCategory(self):
         """删除分类按钮点击事件"""
@@ -1042,21 +1334,25 @@ class EditorPage(QWidget):
         if result == MinecraftMessageBoxResult.ok:
             selected_categories = dialog.get_selected_items()
             if selected_categories:
-                # 从列表中移除选中的分类
-                for category in selected_categories:
-                    if category in self.categories:
-                        delFolder(self.current_project_path.cacheSrcF(category))
-                        self.categories.remove(category)
+                # 分类中的音频先改为无分类，再把分类文件夹移动到回收站，整体作为一个操作撤销
+                with self.journal.group():
+                    for category in selected_categories:
+                        if category in self.categories:
+                            self.moveAudioFilesToCategory(
+                                [entry.file_path for entry in self.audioModel.entries() if entry.category == category], "")
+                            folder = self.current_project_path.cacheSrcF(category)
+                            op = {"type": "delete_category", "category": category,
+                                  "path": folder, "trash_path": self.journal.trashPath(folder)}
+                            renameFile(op["path"], op["trash_path"])
+                            self.categories.remove(category)
+                            self.journal.record(op)
                 
                 # 更新删除分类按钮状态
                 self.updateDeleteCategoryButtonState()
                 
-                # 更新所有音频项的分类下拉框
+                # 更新所有音频项的分类下拉框，音频的分类变化由onAudioCategoryChanged逐项保存
                 self.updateAllAudioItemCategories()
                 
-                # 保存音频信息到JSON文件
-                self.saveAudioInfoToJson()
-                
                 # 显示删除成功消息
                 if len(selected_categories) == 1:
                     message = f"已成功删除分类 \"{selected_categories[0]}\""
@@ -154,7 +154,7 @@ class SettingsPage(QWidget):
         ffmpegLayout.addWidget(pathContainer)
         
         # 添加说明文本
-        helpText = MinecraftLabel("注意：修改路径后需要重启应用才能生效。默认路径为app/ffmpeg目录。如果没有检测到FFmpeg，请自行下载并设置路径。")
+        helpText = MinecraftLabel("注意：修改路径后立即生效。默认路径为app/ffmpeg目录。如果没有检测到FFmpeg，请自行下载并设置路径。")
         helpText.setStyleSheet("color: #AAAAAA; font-size: 9pt;")
         helpText.setWordWrap(True)
         ffmpegLayout.addWidget(helpText)
@@ -221,12 +221,16 @@ class SettingsPage(QWidget):
             # 保存配置
             with open(config_path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=4)
+            
+            # 重新读取FFmpeg路径，使已缓存的FFmpeg信息失效
+            from utils.main import reload_ffmpeg_path
+            reload_ffmpeg_path()
                 
             from gui.ui.minecraft_dialog import MinecraftMessageBox
             MinecraftMessageBox.show_message(
                 self,
                 "设置已保存",
-                "FFmpeg路径已更新，重启应用后生效。"
+                "FFmpeg路径已更新并立即生效。"
             )
         except Exception as e:
             from gui.ui.minecraft_dialog import MinecraftMessageBox
@@ -250,7 +254,7 @@ class SettingsPage(QWidget):
 2. 解压下载的文件到您选择的目录
 3. 在本应用的设置页面中，点击"浏览"按钮选择FFmpeg所在的目录
 4. 确保选择的目录中包含ffmpeg.exe文件
-5. 点击"确定"保存设置，然后重启应用
+5. 点击"确定"保存设置，设置会立即生效
 
 您也可以将FFmpeg添加到系统环境变量中，这样应用将自动检测并使用它。"""
         )
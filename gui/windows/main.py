@@ -511,6 +511,12 @@ class App(QWidget):
         # 切换到导出页面
         self.stackedWidget.setCurrentIndex(2)
     
+    def closeEvent(self, event):
+        """关闭窗口时写入编辑器尚未保存的音频信息"""
+        if self._editor_page_initialized:
+            self.editorPage.flushAudioInfo()
+        super().closeEvent(event)
+    
     def onSettings(self):
         """设置按钮点击事件"""
         # 确保设置页面已初始化
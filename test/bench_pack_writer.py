@@ -0,0 +1,60 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pack_writer import packFolder
+
+
+def create_synthetic_pack(root, total_mb=1024, file_mb=4):
+    """生成测试用资源包目录，ogg文件使用随机数据（与Vorbis数据一样几乎无法再压缩）"""
+    sounds_dir = os.path.join(root, "assets", "minecraft", "sounds")
+    os.makedirs(sounds_dir)
+    sounds = {}
+    count = max(1, total_mb // file_mb)
+    for i in range(count):
+        category = f"cat{i % 8}"
+        os.makedirs(os.path.join(sounds_dir, category), exist_ok=True)
+        with open(os.path.join(sounds_dir, category, f"s{i}.ogg"), "wb") as f:
+            f.write(os.urandom(file_mb * 1024 * 1024))
+        sounds[f"mcsd.{category}.s{i}"] = {"category": "record", "sounds": [{"name": f"{category}/s{i}", "stream": True}]}
+    with open(os.path.join(root, "assets", "minecraft", "sounds.json"), "w", encoding="utf-8") as f:
+        json.dump(sounds, f, indent=4)
+    with open(os.path.join(root, "pack.mcmeta"), "w", encoding="utf-8") as f:
+        json.dump({"pack": {"pack_format": 1, "description": "benchmark"}}, f, indent=4)
+    return count
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    archive = func()
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(archive)
+    print(f"{name:<14} 用时: {elapsed:7.2f} 秒  大小: {size / 1024 / 1024:9.2f} MB")
+    return elapsed, size
+
+
+def bench_pack_writer(total_mb=1024):
+    """对比PackWriter与shutil.make_archive打包同一个资源包的用时和大小"""
+    work_dir = tempfile.mkdtemp()
+    try:
+        src = os.path.join(work_dir, "src")
+        print(f"正在生成 {total_mb} MB 测试资源包...")
+        count = create_synthetic_pack(src, total_mb)
+        print(f"共 {count} 个ogg文件\n")
+
+        base_time, base_size = bench("make_archive", lambda: shutil.make_archive(os.path.join(work_dir, "archive"), "zip", src))
+        new_time, new_size = bench("PackWriter", lambda: packFolder(src, os.path.join(work_dir, "pack.zip")))
+
+        print(f"\n速度提升: {base_time / new_time:.2f} 倍，大小差异: {(new_size - base_size) / base_size * 100:+.2f}%")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    bench_pack_writer(int(sys.argv[1]) if len(sys.argv) > 1 else 1024)
@@ -0,0 +1,63 @@
+"""测试共用的fixture: 临时项目文件夹、示例项目，以及文件和zip的读写"""
+import os
+import zipfile
+
+import pytest
+
+import utils
+import utils.main
+from core.minecraft import ProjectPath
+from core.project import Project
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """把项目文件夹和全局配置文件指向临时文件夹，返回项目文件夹路径"""
+    # utils包通过 from .main import * 导出project_path，两处都需要更新
+    monkeypatch.setattr(utils, "project_path", str(tmp_path))
+    monkeypatch.setattr(utils.main, "project_path", str(tmp_path))
+    monkeypatch.setattr(utils.main, "config_path", str(tmp_path / "config.json"))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def write_file():
+    """写入文件的函数: (根目录, 以/分隔的相对路径, 内容) -> 文件路径，自动创建上级文件夹"""
+    def write(root, rel_path, content):
+        file_path = os.path.join(str(root), *rel_path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+    return write
+
+
+@pytest.fixture
+def project(workspace, write_file):
+    """临时项目文件夹中带有两个音效的项目demo"""
+    Project("demo", description="d").create()
+    sounds_dir = ProjectPath("demo").sounds()
+    for name in ("a", "b"):
+        write_file(sounds_dir, name + ".ogg", name.encode() * 1024)
+    return utils.getProject("demo")
+
+
+@pytest.fixture
+def write_zip():
+    """写入zip的函数: (zip路径, [(条目名称, 内容), ...]) -> zip路径，条目使用固定的修改时间，ogg不压缩"""
+    def write(zip_path, entries):
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, data in entries:
+                compress_type = zipfile.ZIP_STORED if name.endswith(".ogg") else zipfile.ZIP_DEFLATED
+                zf.writestr(zipfile.ZipInfo(name, (1980, 1, 1, 0, 0, 0)), data, compress_type=compress_type)
+        return str(zip_path)
+    return write
+
+
+@pytest.fixture
+def read_zip():
+    """读取zip的函数: zip路径 -> 按中央目录顺序的 [(条目名称, 内容), ...]"""
+    def read(zip_path):
+        with zipfile.ZipFile(zip_path) as zf:
+            return [(info.filename, zf.read(info)) for info in zf.infolist()]
+    return read
@@ -0,0 +1,64 @@
+import os
+
+from core.project.manifest import BuildManifest
+
+
+def test_first_build_adds_everything(tmp_path, write_file):
+    src = str(tmp_path / "src")
+    write_file(src, "pack.mcmeta", b"{}")
+    write_file(src, "assets/minecraft/sounds/a.ogg", b"a")
+    manifest = BuildManifest(str(tmp_path / "cache" / "manifest.json"))
+    diff = manifest.diff(manifest.scan(src))
+    assert manifest.version is None
+    assert diff.added == ["assets/minecraft/sounds/a.ogg", "pack.mcmeta"]
+    assert not diff.removed and not diff.modified
+
+
+def test_diff_after_save(tmp_path, write_file):
+    src = str(tmp_path / "src")
+    manifest_path = str(tmp_path / "cache" / "manifest.json")
+    write_file(src, "a.ogg", b"a")
+    write_file(src, "b.ogg", b"b")
+    manifest = BuildManifest(manifest_path)
+    manifest.save(manifest.scan(src), "0.0.1")
+
+    manifest = BuildManifest(manifest_path)
+    assert manifest.version == "0.0.1"
+    assert not manifest.diff(manifest.scan(src))
+
+    # 同名替换、新增和删除
+    stat = os.stat(os.path.join(src, "a.ogg"))
+    write_file(src, "a.ogg", b"A")
+    os.utime(os.path.join(src, "a.ogg"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    write_file(src, "c.ogg", b"c")
+    os.remove(os.path.join(src, "b.ogg"))
+    diff = manifest.diff(manifest.scan(src))
+    assert (diff.added, diff.removed, diff.modified) == (["c.ogg"], ["b.ogg"], ["a.ogg"])
+    assert diff.summary() == "新增 1 个文件 (c.ogg)，修改 1 个文件 (a.ogg)，删除 1 个文件 (b.ogg)"
+
+
+def test_touch_only_is_not_a_change_and_unchanged_files_are_not_rehashed(tmp_path, write_file, monkeypatch):
+    src = str(tmp_path / "src")
+    manifest_path = str(tmp_path / "cache" / "manifest.json")
+    a = write_file(src, "a.ogg", b"a")
+    write_file(src, "b.ogg", b"b")
+    manifest = BuildManifest(manifest_path)
+    manifest.save(manifest.scan(src), "0.0.1")
+
+    import utils
+    hashed = []
+    getFileHash = utils.getFileHash
+    monkeypatch.setattr(utils, "getFileHash", lambda file_path: hashed.append(file_path) or getFileHash(file_path))
+    stat = os.stat(a)
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    manifest = BuildManifest(manifest_path)
+    assert not manifest.diff(manifest.scan(src))
+    assert hashed == [a]
+
+
+def test_corrupt_manifest_means_never_built(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("{broken", encoding="utf-8")
+    manifest = BuildManifest(str(manifest_path))
+    assert manifest.version is None and manifest.files == {}
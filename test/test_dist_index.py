@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from core.project.artifacts import DistIndex
+
+
+@pytest.fixture
+def dist(tmp_path):
+    dist_dir = tmp_path / "dist"
+    dist_dir.mkdir()
+    return str(dist_dir)
+
+
+def writeBuild(dist, index, version, size=10, delta_base=None):
+    """在dist中写入一个版本的资源包、命令文件和补丁包，并记录到索引"""
+    files = []
+    names = [f"demo_{version}.zip", f"demo_{version}.txt"]
+    if delta_base:
+        names.append(f"demo_{delta_base}_to_{version}.delta.zip")
+    for name in names:
+        file_path = os.path.join(dist, name)
+        with open(file_path, "wb") as f:
+            f.write(b"x" * size)
+        files.append(file_path)
+    index.record(version, files, delta_base, content_hash=f"hash-{version}")
+
+
+def newIndex(tmp_path, dist):
+    return DistIndex(str(tmp_path / "cache" / "dist_index.json"), dist, "demo")
+
+
+def test_keep_last_builds(tmp_path, dist):
+    index = newIndex(tmp_path, dist)
+    for version in ("0.0.1", "0.0.2", "0.0.3"):
+        writeBuild(dist, index, version)
+    assert index.gc(keep_builds=2) == ["0.0.1"]
+    assert sorted(os.listdir(dist)) == ["demo_0.0.2.txt", "demo_0.0.2.zip", "demo_0.0.3.txt", "demo_0.0.3.zip"]
+    assert [build["version"] for build in newIndex(tmp_path, dist).builds] == ["0.0.2", "0.0.3"]
+
+
+def test_size_cap_always_keeps_latest(tmp_path, dist):
+    index = newIndex(tmp_path, dist)
+    for version in ("0.0.1", "0.0.2"):
+        writeBuild(dist, index, version, size=100)
+    assert index.gc(max_size=1) == ["0.0.1"]
+    assert [build["version"] for build in index.builds] == ["0.0.2"]
+    assert index.gc(max_size=1) == []
+
+
+def test_orphaned_delta_is_removed_with_its_base(tmp_path, dist):
+    index = newIndex(tmp_path, dist)
+    writeBuild(dist, index, "0.0.1")
+    writeBuild(dist, index, "0.0.2", delta_base="0.0.1")
+    writeBuild(dist, index, "0.0.3", delta_base="0.0.2")
+    assert index.gc(keep_builds=2) == ["0.0.1"]
+    assert not os.path.exists(os.path.join(dist, "demo_0.0.1_to_0.0.2.delta.zip"))
+    assert os.path.exists(os.path.join(dist, "demo_0.0.2_to_0.0.3.delta.zip"))
+    build = index.builds[0]
+    assert build["delta_base"] is None and build["size"] == 20
+
+
+def test_latest_and_content_hash(tmp_path, dist):
+    index = newIndex(tmp_path, dist)
+    writeBuild(dist, index, "0.0.1")
+    writeBuild(dist, index, "0.0.2")
+    assert index.latest()["content_hash"] == "hash-0.0.2"
+    assert index.latest(exclude="0.0.2")["version"] == "0.0.1"
+    os.remove(os.path.join(dist, "demo_0.0.2.zip"))
+    assert index.latest()["version"] == "0.0.1"
+
+
+def test_import_existing_dist_once(tmp_path, dist):
+    for name in ("demo_0.0.1.zip", "demo_0.0.1.txt", "demo_0.0.2.zip", "demo_0.0.1_to_0.0.2.delta.zip",
+                 "other_0.0.1.zip", "export.log"):
+        with open(os.path.join(dist, name), "wb") as f:
+            f.write(b"x")
+    os.utime(os.path.join(dist, "demo_0.0.1.zip"), (1, 1))
+    os.utime(os.path.join(dist, "demo_0.0.1.txt"), (1, 1))
+    index = newIndex(tmp_path, dist)
+    assert [(build["version"], build["pack"], build["delta_base"]) for build in index.builds] == [
+        ("0.0.1", "demo_0.0.1.zip", None), ("0.0.2", "demo_0.0.2.zip", "0.0.1")]
+    assert os.path.exists(index.index_path)
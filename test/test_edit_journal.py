@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from gui.components.edit_journal import EditJournal
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "journal.jsonl"), str(tmp_path / "trash")
+
+
+def newJournal(app, paths):
+    journal = EditJournal()
+    journal.load(*paths)
+    return journal
+
+
+def readRecords(journal_path):
+    with open(journal_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_undo_redo_only_after_commit(app, paths):
+    journal = newJournal(app, paths)
+    journal.record({"type": "sound_key", "items": [], "n": 1})
+    assert journal.peekUndo()["n"] == 1
+    # 只读取不提交时撤销列表不变
+    assert journal.canUndo() and not journal.canRedo()
+
+    journal.commitUndo()
+    assert not journal.canUndo() and journal.peekRedo()["n"] == 1
+    journal.commitRedo()
+    assert journal.peekUndo()["n"] == 1 and not journal.canRedo()
+
+
+def test_replay_restores_stacks(app, paths):
+    journal = newJournal(app, paths)
+    for n in range(3):
+        journal.record({"type": "sound_key", "items": [], "n": n})
+    journal.commitUndo()
+
+    reloaded = newJournal(app, paths)
+    assert reloaded.peekUndo()["n"] == 1
+    assert reloaded.peekRedo()["n"] == 2
+
+
+def test_new_record_drops_redo(app, paths):
+    journal = newJournal(app, paths)
+    journal.record({"type": "sound_key", "items": [], "n": 0})
+    journal.commitUndo()
+    journal.record({"type": "sound_key", "items": [], "n": 1})
+    assert not journal.canRedo()
+    assert newJournal(app, paths).peekUndo()["n"] == 1
+
+
+def test_group_is_one_operation(app, paths):
+    journal = newJournal(app, paths)
+    with journal.group():
+        journal.record({"type": "sound_key", "items": [], "n": 0})
+        journal.record({"type": "sound_key", "items": [], "n": 1})
+    op = journal.peekUndo()
+    assert op["type"] == "group" and [child["n"] for child in op["ops"]] == [0, 1]
+    journal.commitUndo()
+    assert not journal.canUndo()
+
+
+def test_load_compacts_and_purges_trash(app, paths):
+    journal_path, trash_dir = paths
+    journal = newJournal(app, paths)
+    os.makedirs(trash_dir)
+    kept = journal.trashPath("a.wav")
+    open(kept, "w").close()
+    open(os.path.join(trash_dir, "orphan.wav"), "w").close()
+    journal.record({"type": "delete", "items": [{"file_path": "a.wav", "trash_path": kept}]})
+    journal.commitUndo()
+    journal.commitRedo()
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"action": "do", "op"')  # 写入中断的最后一行
+
+    reloaded = newJournal(app, paths)
+    assert reloaded.peekUndo()["type"] == "delete"
+    assert readRecords(journal_path) == [{"action": "do", "op": reloaded.peekUndo()}]
+    assert os.listdir(trash_dir) == [os.path.basename(kept)]
+
+
+def test_dropped_operations_purge_trash(app, paths, monkeypatch):
+    monkeypatch.setattr(EditJournal, "MAX_OPERATIONS", 2)
+    journal = newJournal(app, paths)
+    os.makedirs(paths[1])
+    trash_paths = []
+    for n in range(3):
+        trash_path = journal.trashPath(f"{n}.wav")
+        open(trash_path, "w").close()
+        trash_paths.append(trash_path)
+        journal.record({"type": "delete", "items": [{"file_path": f"{n}.wav", "trash_path": trash_path}]})
+    assert not os.path.exists(trash_paths[0])
+    assert all(os.path.exists(trash_path) for trash_path in trash_paths[1:])
+    assert len(readRecords(paths[0])) == 2
@@ -0,0 +1,48 @@
+import os
+import zipfile
+
+import pytest
+
+from core.export import ExportPipeline
+from core.minecraft import ProjectPath
+from core.project import Project, ProjectIndex
+from utils.pack_writer import packContentHash
+
+
+@pytest.fixture
+def projects(workspace, write_file):
+    """创建两个音频相同的项目，分别用经典导出和直接导出"""
+    for name in ("classic", "direct"):
+        Project(name, description="音乐包 demo").create()
+        # ogg文件直接使用，不经过ffmpeg转换，两个项目的音效内容完全相同
+        # music/c.ogg在分类文件夹中，没有记录在音频配置文件里
+        for file_name in ("b.ogg", "a.ogg", "music/c.ogg"):
+            write_file(ProjectPath(name).cacheSrc(), file_name, file_name.encode() * 1024)
+    return ProjectPath("classic"), ProjectPath("direct")
+
+
+def export(project_path, mode):
+    project_index = ProjectIndex(project_path)
+    pipeline = ExportPipeline(project_path, project_index.audioFiles(), 2, mode, project_index=project_index)
+    assert pipeline.run(), pipeline.error_message
+    packs = [name for name in os.listdir(project_path.dist()) if name.endswith(".zip")]
+    assert len(packs) == 1
+    return os.path.join(project_path.dist(), packs[0])
+
+
+def test_classic_and_direct_export_produce_the_same_pack(projects):
+    classic, direct = projects
+    classic_pack = export(classic, "classic")
+    direct_pack = export(direct, "direct")
+    assert packContentHash(classic_pack) == packContentHash(direct_pack)
+    with open(classic_pack, "rb") as a, open(direct_pack, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_unrecorded_category_audio_is_exported(projects):
+    classic, _ = projects
+    project_index = ProjectIndex(classic)
+    assert [os.path.relpath(file_path, classic.cacheSrc()).replace(os.sep, "/")
+            for file_path in project_index.audioFiles()] == ["a.ogg", "b.ogg", "music/c.ogg"]
+    with zipfile.ZipFile(export(classic, "classic")) as zf:
+        assert "assets/minecraft/sounds/music/c.ogg" in zf.namelist()
@@ -0,0 +1,71 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from utils.pack_delta import DELTA_MANIFEST, applyDelta, createDelta, deltaPackName
+
+
+@pytest.fixture
+def packs(tmp_path, write_zip):
+    base = write_zip(tmp_path / "demo_0.0.1.zip", [
+        ("pack.mcmeta", b"{}"), ("sounds/a.ogg", b"a" * 100), ("sounds/b.ogg", b"b" * 100), ("sounds/c.ogg", b"c")])
+    target = write_zip(tmp_path / "demo_0.0.2.zip", [
+        ("pack.mcmeta", b"{}"), ("sounds/a.ogg", b"A" * 100), ("sounds/c.ogg", b"c"), ("sounds/d.ogg", b"d")])
+    return base, target
+
+
+def test_delta_contains_only_changes(tmp_path, packs):
+    base, target = packs
+    delta = str(tmp_path / deltaPackName("demo", "0.0.1", "0.0.2"))
+    stats = createDelta(base, target, delta)
+    assert (stats["changed"], stats["removed"]) == (2, 1)
+    with zipfile.ZipFile(delta) as zf:
+        assert zf.namelist() == ["sounds/a.ogg", "sounds/d.ogg", DELTA_MANIFEST]
+        record = json.loads(zf.read(DELTA_MANIFEST))
+    assert record["removed"] == ["sounds/b.ogg"]
+    assert list(record["entries"]) == ["pack.mcmeta", "sounds/a.ogg", "sounds/c.ogg", "sounds/d.ogg"]
+
+
+def test_delta_is_reproducible(tmp_path, packs, monkeypatch):
+    base, target = packs
+    first, second = str(tmp_path / "first.delta.zip"), str(tmp_path / "second.delta.zip")
+    createDelta(base, target, first)
+    monkeypatch.setattr(zipfile.time, "time", lambda: 2000000000)
+    createDelta(base, target, second)
+    with zipfile.ZipFile(first) as zf:
+        info = zf.getinfo(DELTA_MANIFEST)
+    assert info.date_time == (1980, 1, 1, 0, 0, 0)
+    assert info.external_attr == 0o100644 << 16
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_apply_round_trip_is_byte_identical(tmp_path, packs, read_zip):
+    base, target = packs
+    delta = str(tmp_path / "d.delta.zip")
+    createDelta(base, target, delta)
+    output = str(tmp_path / "out" / "rebuilt.zip")
+    assert applyDelta(base, delta, output) == output
+    assert read_zip(output) == read_zip(target)
+    with open(output, "rb") as a, open(target, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_apply_on_wrong_base_fails_without_output(tmp_path, packs, write_zip):
+    base, target = packs
+    delta = str(tmp_path / "d.delta.zip")
+    createDelta(base, target, delta)
+    wrong = write_zip(tmp_path / "wrong.zip", [("pack.mcmeta", b"[]"), ("sounds/c.ogg", b"c")])
+    output = str(tmp_path / "rebuilt.zip")
+    with pytest.raises(Exception, match="不匹配"):
+        applyDelta(wrong, delta, output)
+    assert not os.path.exists(output)
+    assert not os.path.exists(output + ".part")
+
+
+def test_apply_rejects_non_delta(tmp_path, packs):
+    base, target = packs
+    with pytest.raises(Exception, match=DELTA_MANIFEST):
+        applyDelta(base, target, str(tmp_path / "rebuilt.zip"))
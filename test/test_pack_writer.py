@@ -0,0 +1,96 @@
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+from utils.pack_writer import PackWriter, contentHash, entrySortKey, packContentHash, packFolder
+
+
+@pytest.fixture
+def source(tmp_path, write_file):
+    """要打包的文件夹"""
+    files = {"pack.mcmeta": b"{}", "assets/minecraft/sounds.json": b"{}",
+             "assets/minecraft/sounds/b.ogg": b"b" * 1000, "assets/minecraft/sounds/a.ogg": b"a" * 1000}
+    for rel_path, data in files.items():
+        write_file(tmp_path / "src", rel_path, data)
+    return str(tmp_path / "src")
+
+
+def readBytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def test_pack_folder_is_reproducible(tmp_path, source):
+    first = packFolder(source, str(tmp_path / "first.zip"))
+    # 修改时间和权限变化不影响资源包
+    for root, _, files in os.walk(source):
+        for name in files:
+            file_path = os.path.join(root, name)
+            os.utime(file_path, (time.time() + 3600, time.time() + 3600))
+            os.chmod(file_path, 0o600)
+    second = packFolder(source, str(tmp_path / "second.zip"))
+    assert readBytes(first) == readBytes(second)
+    assert packContentHash(first) == packContentHash(second)
+
+
+def test_entries_are_sorted_and_normalized(tmp_path, source):
+    zip_path = packFolder(source, str(tmp_path / "pack.zip"))
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = zf.infolist()
+    # 音效在前，sounds.json、pack.mcmeta在后，与直接导出的写入顺序相同
+    assert [info.filename for info in infos] == [
+        "assets/minecraft/sounds/a.ogg", "assets/minecraft/sounds/b.ogg", "assets/minecraft/sounds.json", "pack.mcmeta"]
+    for info in infos:
+        assert info.date_time == PackWriter.FIXED_DATE_TIME
+        assert info.external_attr >> 16 == PackWriter.FILE_MODE
+        assert info.compress_type == (zipfile.ZIP_STORED if info.filename.endswith(".ogg") else zipfile.ZIP_DEFLATED)
+
+
+def test_json_keys_are_sorted(tmp_path):
+    target = str(tmp_path / "pack.zip")
+    with PackWriter(target) as writer:
+        writer.add_json("sounds.json", {"b": 1, "a": {"d": 2, "c": 3}})
+        content_hash = writer.contentHash()
+    with zipfile.ZipFile(target) as zf:
+        assert list(json.loads(zf.read("sounds.json"))) == ["a", "b"]
+        assert zf.read("sounds.json").index(b'"c"') < zf.read("sounds.json").index(b'"d"')
+    assert packContentHash(target) == content_hash
+
+
+def test_content_hash_depends_on_content_and_order(tmp_path):
+    def hashOf(name, entries):
+        target = str(tmp_path / name)
+        with PackWriter(target) as writer:
+            for arcname, data in entries:
+                writer.add_bytes(arcname, data)
+        return packContentHash(target)
+
+    base = hashOf("a.zip", [("a", b"1"), ("b", b"2")])
+    assert hashOf("same.zip", [("a", b"1"), ("b", b"2")]) == base
+    assert hashOf("changed.zip", [("a", b"1"), ("b", b"3")]) != base
+    with zipfile.ZipFile(str(tmp_path / "a.zip")) as zf:
+        assert contentHash(reversed(zf.infolist())) != base
+    assert contentHash([]) == contentHash([])
+
+
+def test_entries_must_be_written_in_order(tmp_path):
+    assert sorted(["sounds.json", "sounds/b.ogg", "sounds/a/c.ogg", "sounds/a.ogg"], key=entrySortKey) == [
+        "sounds/a/c.ogg", "sounds/a.ogg", "sounds/b.ogg", "sounds.json"]
+    target = str(tmp_path / "pack.zip")
+    with pytest.raises(Exception):
+        with PackWriter(target) as writer:
+            writer.add_bytes("sounds.json", b"{}")
+            writer.add_bytes("sounds/a.ogg", b"a")
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_write_leaves_no_files(tmp_path):
+    target = str(tmp_path / "pack.zip")
+    with pytest.raises(Exception):
+        with PackWriter(target) as writer:
+            writer.add_bytes("a", b"1")
+            writer.add_bytes("a", b"2")  # 重复的条目
+    assert os.listdir(tmp_path) == []
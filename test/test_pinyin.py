@@ -0,0 +1,45 @@
+import pytest
+
+from utils.main import pinyinFirstLetter, pinyinInitials, toPinyinFirst, toPinyinFirstLower, toPinyinFirstUpper
+
+# GB2312排序采用的读音与pypinyin单字的第一个读音不同的多音字
+HETERONYMS = {"辟": "b", "泊": "b", "长": "c", "匙": "c", "脯": "f", "蛤": "g", "槛": "j", "咯": "k", "傀": "k",
+              "茄": "q", "炔": "q", "伺": "s", "厦": "x", "畜": "x", "吁": "y", "曾": "z", "轧": "z", "辗": "z", "椎": "z"}
+
+
+def level1Chars():
+    for high in range(0xB0, 0xD8):
+        for low in range(0xA1, 0xFF):
+            try:
+                yield bytes([high, low]).decode("gb2312")
+            except UnicodeDecodeError:
+                continue
+
+
+def test_initials():
+    assert pinyinInitials("晴天") == "qt"
+    assert pinyinInitials("Hello 世界!") == "hellosj"
+    assert pinyinInitials("长城") == "cc"
+    assert pinyinInitials("，。") == ""
+    for char, letter in HETERONYMS.items():
+        assert pinyinFirstLetter(char) == letter
+
+
+def test_table_agrees_with_pypinyin():
+    pypinyin = pytest.importorskip("pypinyin")
+    chars = list(level1Chars())
+    assert len(chars) == 3755
+    for char in chars:
+        readings = pypinyin.pinyin(char, style=pypinyin.STYLE_NORMAL, heteronym=True)[0]
+        if char in HETERONYMS:
+            # 多音字使用的读音是pypinyin的读音之一
+            assert pinyinFirstLetter(char) in {reading[0] for reading in readings}, char
+        else:
+            assert pinyinFirstLetter(char) == readings[0][0], char
+
+
+def test_to_pinyin_first_keeps_whole_syllables():
+    pytest.importorskip("pypinyin")
+    assert toPinyinFirst("中国a!") == "zhongguoa!"
+    assert toPinyinFirstUpper("中国") == "ZHONGGUO"
+    assert toPinyinFirstLower("中国AB") == "zhongguoab"
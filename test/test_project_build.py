@@ -0,0 +1,52 @@
+import json
+import os
+import zipfile
+
+import utils
+from core.minecraft import ProjectPath
+
+
+def countToPack(monkeypatch):
+    calls = []
+    toPack = utils.toPack
+    monkeypatch.setattr(utils, "toPack", lambda *args: calls.append(args) or toPack(*args))
+    return calls
+
+
+def test_unchanged_build_is_skipped_without_packing(project, monkeypatch):
+    assert project.build() == 1
+    calls = countToPack(monkeypatch)
+    assert utils.getProject("demo").build() == 0
+    assert calls == []
+
+
+def test_same_content_build_keeps_manifest_on_existing_version(project, monkeypatch):
+    pj_path = ProjectPath("demo")
+    assert project.build() == 1
+    # 清单丢失后重新打包，内容与0.0.1相同
+    os.remove(pj_path.cacheManifest())
+    project = utils.getProject("demo")
+    assert project.build() == 0
+    assert str(project.getVersion()) == "0.0.2"
+    assert not os.path.exists(os.path.join(pj_path.dist(), "demo_0.0.2.zip"))
+
+    # 清单指向仍然存在的0.0.1，之后的构建不再重新打包
+    calls = countToPack(monkeypatch)
+    assert utils.getProject("demo").build() == 0
+    assert calls == []
+
+
+def test_changed_build_bumps_version(project, write_file):
+    assert project.build() == 1
+    write_file(ProjectPath("demo").sounds(), "c.ogg", b"c" * 1024)
+    project = utils.getProject("demo")
+    assert project.build() == 1
+    assert str(project.getVersion()) == "0.0.3"
+
+
+def test_description_change_rebuilds_pack_mcmeta(project):
+    assert project.build() == 1
+    project.setDescription("新的描述")
+    assert project.build() == 1
+    with zipfile.ZipFile(os.path.join(ProjectPath("demo").dist(), "demo_0.0.2.zip")) as zf:
+        assert json.loads(zf.read("pack.mcmeta"))["pack"]["description"] == "新的描述"
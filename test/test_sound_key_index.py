@@ -0,0 +1,47 @@
+from utils.sound_key_index import SoundKeyIndex, generateSoundKey
+
+
+def test_generate_sound_key():
+    assert generateSoundKey("晴天.wav") == "qt"
+    assert generateSoundKey("Hello World 2.mp3") == "hw2"
+    assert generateSoundKey("track0.ogg") == "track"
+    assert generateSoundKey("123.wav") == "sound"
+    assert generateSoundKey("晴天.wav") == generateSoundKey("晴天.flac")
+
+
+def test_collisions_get_numeric_suffixes():
+    index = SoundKeyIndex()
+    keys = index.assignMany([("a/track0.wav", None), ("a/track1.wav", None), ("a/track2.wav", None)])
+    assert keys == ["track", "trac1", "trac2"]
+    assert index.owner("trac1") == "a/track1.wav"
+
+
+def test_unique_key_keeps_own_key():
+    index = SoundKeyIndex()
+    index.assign("a.wav", "music")
+    index.assign("b.wav", "music")
+    assert index.keyOf("b.wav") == "musi1"
+    # 文件自己的soundkey不算冲突，已有的数字后缀保持不变
+    assert index.uniqueKey("musi1", "b.wav") == "musi1"
+    assert index.uniqueKey("music", "b.wav") == "musi1"
+    assert index.uniqueKey("music", "c.wav") == "musi2"
+
+
+def test_release_and_rename():
+    index = SoundKeyIndex()
+    index.assign("a.wav", "key")
+    index.assign("b.wav", "key")
+    index.release("a.wav")
+    assert index.isAvailable("key")
+    assert index.assign("c.wav", "key") == "key"
+
+    index.rename("b.wav", "cat/b.wav")
+    assert index.keyOf("cat/b.wav") == "key1"
+    assert index.owner("key1") == "cat/b.wav"
+    assert index.keyOf("b.wav") is None
+
+
+def test_same_order_gives_same_keys():
+    items = [(f"{i}.wav", "dup") for i in range(20)]
+    assert SoundKeyIndex().assignMany(items) == SoundKeyIndex().assignMany(items)
+    assert len(set(SoundKeyIndex().assignMany(items))) == 20
@@ -0,0 +1,95 @@
+import itertools
+import os
+
+import pytest
+
+import utils.transcode_cache
+from utils.transcode_cache import TranscodeCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """每次调用time.time()时间加1，最近使用顺序与调用顺序一致"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(utils.transcode_cache.time, "time", lambda: next(ticks))
+
+
+def writeSource(tmp_path, name, content):
+    file_path = tmp_path / name
+    file_path.write_bytes(content)
+    return str(file_path)
+
+
+def storeEntry(cache, tmp_path, name, size):
+    """把一个大小为size的转换结果加入缓存，返回缓存键"""
+    source = writeSource(tmp_path, name + ".wav", name.encode())
+    output = writeSource(tmp_path, name + ".ogg", b"x" * size)
+    key = cache.key(source)
+    cache.store(key, output)
+    return key
+
+
+def test_key_depends_on_content_and_parameters(tmp_path):
+    cache = TranscodeCache(str(tmp_path / "cache"))
+    a = writeSource(tmp_path, "a.wav", b"same")
+    b = writeSource(tmp_path, "b.wav", b"same")
+    c = writeSource(tmp_path, "c.wav", b"other")
+    assert cache.key(a) == cache.key(b)
+    assert cache.key(a) != cache.key(c)
+    assert cache.key(a) != cache.key(a, quality="128k")
+
+
+def test_fetch_hit_and_miss(tmp_path, clock):
+    cache = TranscodeCache(str(tmp_path / "cache"))
+    key = storeEntry(cache, tmp_path, "a", 10)
+    output = str(tmp_path / "out" / "a.ogg")
+    assert cache.fetch(key, output)
+    assert open(output, "rb").read() == b"x" * 10
+    assert not cache.fetch("0" * 40, output)
+
+    # 缓存文件被外部删除时视为未命中
+    os.remove(cache.entry_path(key))
+    assert cache.lookup(key) is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path, clock):
+    cache = TranscodeCache(str(tmp_path / "cache"), max_size=25)
+    a = storeEntry(cache, tmp_path, "a", 10)
+    b = storeEntry(cache, tmp_path, "b", 10)
+    c = storeEntry(cache, tmp_path, "c", 10)
+    assert cache.lookup(a) is not None  # a最近被使用，b最久未使用
+
+    cache.evict()
+    assert cache.total_size() == 20
+    assert cache.lookup(b) is None
+    assert not os.path.exists(cache.entry_path(b))
+    assert cache.lookup(a) is not None
+    assert cache.lookup(c) is not None
+
+
+def test_index_survives_reload(tmp_path, clock):
+    cache_dir = str(tmp_path / "cache")
+    cache = TranscodeCache(cache_dir, max_size=100)
+    key = storeEntry(cache, tmp_path, "a", 10)
+    cache.save()
+
+    reloaded = TranscodeCache(cache_dir, max_size=100)
+    assert reloaded.lookup(key) == cache.entry_path(key)
+    assert reloaded.total_size() == 10
+
+
+def test_parallel_conversions_of_same_content_do_not_collide(tmp_path, clock):
+    cache = TranscodeCache(str(tmp_path / "cache"))
+    key = cache.key(writeSource(tmp_path, "a.wav", b"same"))
+    first, second = cache.temp_path(key), cache.temp_path(key)
+    assert first != second
+
+    open(first, "wb").write(b"first")
+    open(second, "wb").write(b"second")
+    entry_path = cache.adopt(key, first)
+    assert cache.adopt(key, second) == entry_path
+
+    # 已经放入缓存的文件保持不变，临时文件都被移走或删除
+    assert open(entry_path, "rb").read() == b"first"
+    assert os.listdir(os.path.dirname(entry_path)) == [os.path.basename(entry_path)]
+    assert cache.total_size() == 5
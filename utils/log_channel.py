@@ -0,0 +1,61 @@
+import os
+import time
+import threading
+
+
+class LogChannel:
+    """导出日志通道
+
+    工作线程写入日志和进度，界面线程按固定间隔一次性取出（drain）。
+    多条日志合并为一次界面更新，进度只保留最新的一次，
+    完整的日志同时写入日志文件。不依赖Qt，可以在任意线程中使用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []  # 尚未被界面取出的日志
+        self._progress = None  # 最新的进度 (当前值, 最大值)
+        self._log_file = None  # 完整日志文件
+
+    def open(self, log_path: str):
+        """打开完整日志文件，已存在时覆盖"""
+        self.close()
+        log_dir = os.path.dirname(log_path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir, mode=0o755)  # 设置读写权限
+        with self._lock:
+            self._log_file = open(log_path, 'w', encoding='utf-8')
+
+    def close(self):
+        """关闭完整日志文件"""
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def log(self, message: str):
+        """写入一条日志"""
+        now = time.localtime()
+        with self._lock:
+            self._pending.append(f"[{time.strftime('%H:%M:%S', now)}] {message}")
+            if self._log_file is not None:
+                self._log_file.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S', now)}] {message}\n")
+
+    def progress(self, current: int, maximum: int):
+        """更新进度"""
+        with self._lock:
+            self._progress = (current, maximum)
+
+    def drain(self):
+        """
+        取出自上次调用以来的日志和最新进度
+
+        返回:
+            tuple: (日志列表, 进度)，没有新的进度时进度为None
+        """
+        with self._lock:
+            messages, self._pending = self._pending, []
+            progress, self._progress = self._progress, None
+            if self._log_file is not None:
+                self._log_file.flush()
+        return messages, progress
@@ -3,11 +3,14 @@ import os
 from os import path
 from uu import Error
 import json
+import hashlib
 import urllib.request
 import socket
 import sys
-from PyQt5.QtGui import QIcon
-from pypinyin import pinyin, STYLE_NORMAL
+import threading
+import bisect
+from functools import lru_cache
+from utils.pack_writer import packFolder, packContentHash
 import time
 import random
 # 移除顶层导入，避免循环引用
@@ -50,6 +53,114 @@ def get_ffmpeg_path():
         print(f"读取ffmpeg配置失败: {e}")
     return default_ffmpeg_path
 
+def get_config(key, default=None):
+    """读取应用配置文件中的配置项
+
+    Args:
+        key (str): 配置项名称
+        default (any, optional): 配置项不存在或读取失败时返回的默认值
+
+    Returns:
+        any: 配置项的值
+    """
+    try:
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+                if key in config:
+                    return config[key]
+    except Exception as e:
+        print(f"读取配置失败: {e}")
+    return default
+
+def get_export_workers():
+    """获取导出时并行转换音频的工作线程数量
+
+    配置文件中的export_workers小于等于0或不存在时，使用CPU核心数。
+
+    Returns:
+        int: 工作线程数量
+    """
+    try:
+        workers = int(get_config('export_workers', 0))
+    except (TypeError, ValueError):
+        workers = 0
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+def get_transcode_cache_size():
+    """获取音频转换缓存的大小上限
+
+    配置文件中的transcode_cache_max_mb以MB为单位，默认4096MB。
+
+    Returns:
+        int: 缓存大小上限（字节）
+    """
+    try:
+        max_mb = int(get_config('transcode_cache_max_mb', 4096))
+    except (TypeError, ValueError):
+        max_mb = 4096
+    return max(0, max_mb) * 1024 * 1024
+
+def get_export_mode():
+    """获取导出模式
+
+    配置文件中的export_mode为"direct"时，转换好的音频直接写入最终的资源包，
+    不再经过cache/dist和src/assets/minecraft/sounds目录；其他值使用原来的导出方式。
+
+    Returns:
+        str: "direct" 或 "classic"
+    """
+    return "direct" if get_config('export_mode', 'classic') == "direct" else "classic"
+
+def get_delta_pack():
+    """是否在每次打包后生成补丁包
+
+    配置文件中的delta_pack为true时，打包完成后在dist中额外生成与上一个版本之间的补丁包
+    （<名称>_<上一版本>_to_<当前版本>.delta.zip），只包含新增或变化的文件和删除列表。
+
+    Returns:
+        bool: 是否生成补丁包
+    """
+    return get_config('delta_pack', False) is True
+
+def get_dist_retention():
+    """获取dist目录中旧版本的保留策略
+
+    配置文件中的dist_keep_builds为最多保留的版本数量，dist_max_size_mb为所有版本文件的总大小上限（MB），
+    小于等于0或不存在时不限制。最新的版本总是保留。
+
+    Returns:
+        tuple: (保留的版本数量, 总大小上限（字节）)
+    """
+    try:
+        keep_builds = int(get_config('dist_keep_builds', 0))
+    except (TypeError, ValueError):
+        keep_builds = 0
+    try:
+        max_mb = int(get_config('dist_max_size_mb', 0))
+    except (TypeError, ValueError):
+        max_mb = 0
+    return max(0, keep_builds), max(0, max_mb) * 1024 * 1024
+
+def get_import_workers():
+    """获取导入音频时并行复制文件的工作线程数量
+
+    配置文件中的import_workers小于等于0或不存在时，使用4和CPU核心数中较小的值。
+    复制文件主要受磁盘速度限制，线程过多反而会降低速度。
+
+    Returns:
+        int: 工作线程数量
+    """
+    try:
+        workers = int(get_config('import_workers', 0))
+    except (TypeError, ValueError):
+        workers = 0
+    if workers <= 0:
+        workers = min(4, os.cpu_count() or 1)
+    return workers
+
 ffmpeg_path = get_ffmpeg_path() # ffmpeg.exe文件路径
 history_path = os.path.join(app_path, 'history.json') # 历史项目记录文件路径
 
@@ -64,15 +175,19 @@ soundSuffixName = ".ogg" # 音效文件后缀名
 projectConifgName = "sounds" + exeSuffixName # 项目配置文件名
 
 
+# QIcon在使用时才导入，命令行导出（python -m core.export）不需要Qt
 def GetLogoIcon(icon: bool = True):
+    from PyQt5.QtGui import QIcon
     return QIcon(logo_path) if icon is True else logo_path
 
 def GetIconSvg(iconName: str, icon: bool = True):
+    from PyQt5.QtGui import QIcon
     iconf = os.path.join(icons_path, f'{iconName}.svg')
     return QIcon(iconf) if icon is True else iconf
 
 
 def GetIcon(iconName: str, icon: bool = True):
+    from PyQt5.QtGui import QIcon
     iconf = os.path.join(icons_path, f'{iconName}.png')
     return QIcon(iconf) if icon is True else iconf
 
@@ -133,28 +248,86 @@ def getGithubProxy():
         return []
 
 
+def _ffmpeg_candidates():
+    """按优先级列出可能的FFmpeg路径：配置文件指定的路径、系统环境、默认路径"""
+    import shutil
+
+    candidates = [ffmpeg_path, shutil.which('ffmpeg'), os.path.join(app_path, 'ffmpeg', 'ffmpeg.exe')]
+    result = []
+    for candidate in candidates:
+        if candidate and candidate not in result and os.path.exists(candidate):
+            result.append(candidate)
+    return result
+
+def _probe_ffmpeg_version(ffmpeg_bin):
+    """运行ffmpeg -version获取版本信息，无法运行时返回None"""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            [ffmpeg_bin, "-hide_banner", "-version"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # Windows上不弹出控制台窗口
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.decode("utf-8", errors="replace").splitlines()
+    return lines[0].strip() if lines else ""
+
+_ffmpeg_info = None # 已解析的FFmpeg信息缓存，None表示尚未解析，{}表示未找到可用的FFmpeg
+_ffmpeg_lock = threading.Lock()
+
+def get_ffmpeg_info():
+    """获取可用的FFmpeg路径和版本
+    
+    每个进程只解析和验证一次，结果会被缓存，
+    FFmpeg路径变更后需要调用reset_ffmpeg_info()使缓存失效。
+    
+    Returns:
+        dict: {"path": FFmpeg路径, "version": 版本信息}，未找到可用的FFmpeg时返回空字典
+    """
+    global _ffmpeg_info
+    with _ffmpeg_lock:
+        if _ffmpeg_info is None:
+            _ffmpeg_info = {}
+            for candidate in _ffmpeg_candidates():
+                version = _probe_ffmpeg_version(candidate)
+                if version is not None:
+                    _ffmpeg_info = {"path": candidate, "version": version}
+                    break
+        return _ffmpeg_info
+
+def reset_ffmpeg_info():
+    """使已缓存的FFmpeg信息失效，下次使用时重新解析"""
+    global _ffmpeg_info
+    with _ffmpeg_lock:
+        _ffmpeg_info = None
+
+def reload_ffmpeg_path():
+    """重新从配置文件读取FFmpeg路径，并使已缓存的FFmpeg信息失效
+    
+    Returns:
+        str: 新的ffmpeg.exe文件路径
+    """
+    global ffmpeg_path
+    ffmpeg_path = get_ffmpeg_path()
+    reset_ffmpeg_info()
+    return ffmpeg_path
+
 def check_ffmpeg():
     """检查系统中是否存在FFmpeg
     
     Returns:
         tuple: (是否存在FFmpeg, FFmpeg路径或None)
     """
-    import shutil
-    
-    # 首先检查配置文件中指定的路径
-    if os.path.exists(ffmpeg_path):
-        return True, ffmpeg_path
-    
-    # 检查系统环境中是否有ffmpeg
-    system_ffmpeg = shutil.which('ffmpeg')
-    if system_ffmpeg is not None:
-        return True, system_ffmpeg
-    
-    # 检查默认路径
-    default_ffmpeg_path = os.path.join(app_path, 'ffmpeg', 'ffmpeg.exe')
-    if os.path.exists(default_ffmpeg_path):
-        return True, default_ffmpeg_path
-    
+    info = get_ffmpeg_info()
+    if info:
+        return True, info["path"]
     return False, None
 
 def get_ffmpeg_download_urls(progress_callback=None):
@@ -417,6 +590,7 @@ def setup_ffmpeg_directory(target_dir, progress_callback=None):
             # 更新全局变量
             global ffmpeg_path
             ffmpeg_path = ffmpeg_exe_path
+            reset_ffmpeg_info()
             
             if progress_callback:
                 progress_callback(100, "FFmpeg安装完成")
@@ -474,9 +648,203 @@ def download_ffmpeg(target_dir=None, progress_callback=None):
     
     return False
 
-def toOgg(file_path: str, output_path: str, quality="192k", parameters=None, overwrite=False, sample_rate=None):
+def _toOggFfmpeg(ffmpeg_bin: str, file_path: str, output_path: str, quality="192k", parameters=None, sample_rate=None):
+    """直接调用一次ffmpeg把源文件编码为ogg，音频数据不经过Python内存
+
+    先写入同目录下的临时文件，编码成功后再替换为输出文件，
+    这样中途失败或被取消时不会留下不完整的ogg文件。
+    """
+    import subprocess
+
+    temp_path = output_path + ".part"
+    cmd = [
+        ffmpeg_bin, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+        "-i", file_path,
+        "-vn",  # 忽略视频流和封面
+        "-c:a", "libvorbis",  # 确保使用vorbis编码器
+        "-b:a", quality,
+    ]
+    if sample_rate:
+        cmd += ["-ar", str(sample_rate)]
+    if parameters:
+        cmd += list(parameters)
+    cmd += ["-f", "ogg", temp_path]
+
+    try:
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # Windows上不弹出控制台窗口
+        )
+        if result.returncode != 0:
+            # 只保留最后几行错误输出，避免日志过长
+            stderr = "\n".join(result.stderr.decode("utf-8", errors="replace").strip().splitlines()[-3:])
+            raise Error(f"音频编码进程返回错误码 {result.returncode}: {stderr}")
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+def _toOggPydub(ffmpeg_bin: str, file_path: str, output_path: str, ext: str, quality="192k", parameters=None, sample_rate=None):
+    """使用pydub解码到内存后再导出为ogg（旧的转换方式）"""
+    try:
+        from pydub import AudioSegment
+    except ImportError:
+        raise Error('请安装pydub库: pip install pydub')
+    
+    # 显式指定pydub使用的ffmpeg
+    AudioSegment.converter = ffmpeg_bin
+    # pydub通过PATH查找ffprobe，ffmpeg所在目录不在PATH中时只添加一次
+    ffmpeg_dir = os.path.dirname(ffmpeg_bin)
+    if ffmpeg_dir not in os.environ.get("PATH", "").split(os.pathsep):
+        os.environ["PATH"] = ffmpeg_dir + os.pathsep + os.environ.get("PATH", "")
+
+    # 根据文件扩展名加载音频
+    format_mapping = {
+        '.mp3': 'mp3',
+        '.wav': 'wav',
+        '.flac': 'flac',
+        '.m4a': 'm4a',
+        '.aac': 'aac',
+        '.wma': 'wma',
+        '.opus': 'opus',
+        '.webm': 'webm',
+        '.mp4': 'mp4',
+        '.avi': 'avi',
+        '.mov': 'mov'
+    }
+    
+    # 根据文件扩展名加载音频
+    if ext == '.mp3':
+        audio = AudioSegment.from_mp3(file_path)
+    elif ext == '.wav':
+        audio = AudioSegment.from_wav(file_path)
+    elif ext in format_mapping:
+        audio = AudioSegment.from_file(file_path, format=format_mapping[ext])
+    else:
+        # 尝试自动检测格式
+        audio = AudioSegment.from_file(file_path)
+    
+    # 如果需要设置采样率
+    if sample_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    
+    # 导出为ogg格式，使用指定的质量参数
+    export_args = {
+        "format": "ogg",
+        "bitrate": quality,
+        "codec": "libvorbis",  # 确保使用vorbis编码器
+    }
+    
+    # 如果提供了额外参数，添加到导出参数中
+    if parameters:
+        export_args["parameters"] = parameters
+    
+    # 导出文件
+    audio.export(output_path, **export_args)
+
+def _find_ffprobe(ffmpeg_bin):
+    """查找与ffmpeg同目录或系统环境中的ffprobe，找不到时返回None"""
+    import shutil
+
+    name = "ffprobe.exe" if ffmpeg_bin.lower().endswith(".exe") else "ffprobe"
+    candidate = os.path.join(os.path.dirname(ffmpeg_bin), name)
+    if os.path.exists(candidate):
+        return candidate
+    return shutil.which("ffprobe")
+
+def _parse_ffmpeg_input_info(text):
+    """从ffmpeg -i的输出中解析容器格式、时长和第一个音频流的信息"""
+    import re
+
+    info = {"format": "", "codec": "", "sample_rate": 0, "channels": 0, "duration": 0.0}
+    match = re.search(r"Input #0, ([^ ]+), from", text)
+    if match:
+        info["format"] = match.group(1).rstrip(",")
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", text)
+    if match:
+        hours, minutes, seconds = match.groups()
+        info["duration"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    match = re.search(r"Stream #\S+.*?: Audio: ([^\s,(]+)[^,]*, (\d+) Hz, ([^,]+)", text)
+    if match:
+        info["codec"] = match.group(1)
+        info["sample_rate"] = int(match.group(2))
+        layout = match.group(3).strip()
+        channels = {"mono": 1, "stereo": 2}.get(layout)
+        if channels is None:
+            digits = re.match(r"(\d+)", layout)
+            channels = int(digits.group(1)) if digits else 0
+            if layout.startswith("5.1"):
+                channels = 6
+            elif layout.startswith("7.1"):
+                channels = 8
+        info["channels"] = channels
+    return info
+
+def probe_audio(file_path: str):
+    """获取音频文件的容器格式、编码、采样率、声道数和时长
+
+    优先使用ffprobe，没有ffprobe时解析ffmpeg -i的输出。
+
+    Returns:
+        dict: {"format": 容器格式, "codec": 音频编码, "sample_rate": 采样率,
+               "channels": 声道数, "duration": 时长（秒）}
+
+    Raises:
+        Error: 找不到FFmpeg或文件中没有音频流
+    """
+    import subprocess
+
+    ffmpeg_info = get_ffmpeg_info()
+    if not ffmpeg_info:
+        raise Error('获取音频信息失败: 系统环境和指定文件夹中都没有找到FFmpeg')
+
+    creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Windows上不弹出控制台窗口
+    ffprobe_bin = _find_ffprobe(ffmpeg_info["path"])
+    if ffprobe_bin:
+        result = subprocess.run(
+            [ffprobe_bin, "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=format_name,duration:stream=codec_name,sample_rate,channels",
+             "-of", "json", file_path],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            creationflags=creationflags,
+        )
+        if result.returncode == 0:
+            data = json.loads(result.stdout.decode("utf-8", errors="replace") or "{}")
+            streams = data.get("streams") or [{}]
+            fmt = data.get("format", {})
+            info = {
+                "format": fmt.get("format_name", ""),
+                "codec": streams[0].get("codec_name", ""),
+                "sample_rate": int(streams[0].get("sample_rate") or 0),
+                "channels": int(streams[0].get("channels") or 0),
+                "duration": float(fmt.get("duration") or 0),
+            }
+            if not info["codec"]:
+                raise Error(f'获取音频信息失败: 没有音频流 {file_path}')
+            return info
+
+    # ffmpeg只指定输入时会返回错误码，输入信息输出在标准错误中
+    result = subprocess.run(
+        [ffmpeg_info["path"], "-hide_banner", "-nostdin", "-i", file_path],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        creationflags=creationflags,
+    )
+    info = _parse_ffmpeg_input_info(result.stderr.decode("utf-8", errors="replace"))
+    if not info["codec"]:
+        raise Error(f'获取音频信息失败: 没有音频流 {file_path}')
+    return info
+
+def toOgg(file_path: str, output_path: str, quality="192k", parameters=None, overwrite=False, sample_rate=None, use_pydub=False):
     """将任意音频文件转换为ogg格式并保存到指定路径
     
+    默认直接调用一次ffmpeg完成从源文件到ogg的转换，不会把音频解码到Python内存中。
+    
     Args:
         file_path (str): 原始音频文件路径
         output_path (str): 输出文件路径，如果是目录则保持原文件名并更改扩展名为.ogg
@@ -485,6 +853,7 @@ def toOgg(file_path: str, output_path: str, quality="192k", parameters=None, ove
         overwrite (bool, optional): 如果输出文件已存在，是否覆盖。默认为False。
         normalize (bool, optional): 是否对音频进行音量标准化处理。默认为False。
         sample_rate (int, optional): 设置输出音频的采样率，例如44100。默认为None（保持原采样率）。
+        use_pydub (bool, optional): 是否使用pydub解码到内存后再导出（旧的转换方式）。默认为False。
         
     Returns:
         str: 转换后的ogg文件路径
@@ -492,11 +861,7 @@ def toOgg(file_path: str, output_path: str, quality="192k", parameters=None, ove
     Raises:
         Error: 文件格式不支持或转换失败
     """
-    try:
-        from pydub import AudioSegment
-        import shutil
-    except ImportError:
-        raise Error('请安装pydub库: pip install pydub')
+    import shutil
     
     # 检查文件是否存在
     if not os.path.exists(file_path):
@@ -542,73 +907,19 @@ def toOgg(file_path: str, output_path: str, quality="192k", parameters=None, ove
     if ext not in supported_formats and not ext == '.ogg':
         raise Error(f'不支持的文件格式: {ext}，支持的格式: {", ".join(supported_formats)}')
     
-    # 检查系统环境中是否有ffmpeg
-    ffmpeg_in_path = shutil.which('ffmpeg') is not None
-    
-    # 如果系统环境中没有ffmpeg，检查指定文件夹
-    ffmpeg_exists = os.path.exists(ffmpeg_path)
-    
-    if not ffmpeg_in_path and not ffmpeg_exists:
+    # 获取已解析的FFmpeg，整个进程只解析一次
+    ffmpeg_info = get_ffmpeg_info()
+    if not ffmpeg_info:
         raise Error('转换失败: 系统环境和指定文件夹中都没有找到FFmpeg')
     
     # 记录使用的ffmpeg路径，用于错误处理
-    ffmpeg_path_used = None
-    
-    # 如果系统环境中没有ffmpeg但指定文件夹中有，设置环境变量
-    if not ffmpeg_in_path and ffmpeg_exists:
-        # 获取ffmpeg文件夹路径
-        ffmpeg_dir = os.path.dirname(ffmpeg_path)
-        # 将ffmpeg路径添加到环境变量
-        os.environ["PATH"] = ffmpeg_dir + os.pathsep + os.environ["PATH"]
-        ffmpeg_path_used = ffmpeg_path
-        print(f"使用指定文件夹中的FFmpeg: {ffmpeg_dir}")
-    else:
-        ffmpeg_path_used = shutil.which('ffmpeg')
+    ffmpeg_path_used = ffmpeg_info["path"]
     
     try:
-        # 根据文件扩展名加载音频
-        format_mapping = {
-            '.mp3': 'mp3',
-            '.wav': 'wav',
-            '.flac': 'flac',
-            '.m4a': 'm4a',
-            '.aac': 'aac',
-            '.wma': 'wma',
-            '.opus': 'opus',
-            '.webm': 'webm',
-            '.mp4': 'mp4',
-            '.avi': 'avi',
-            '.mov': 'mov'
-        }
-        
-        # 根据文件扩展名加载音频
-        if ext == '.mp3':
-            audio = AudioSegment.from_mp3(file_path)
-        elif ext == '.wav':
-            audio = AudioSegment.from_wav(file_path)
-        elif ext in format_mapping:
-            audio = AudioSegment.from_file(file_path, format=format_mapping[ext])
+        if use_pydub:
+            _toOggPydub(ffmpeg_path_used, file_path, output_path, ext, quality, parameters, sample_rate)
         else:
-            # 尝试自动检测格式
-            audio = AudioSegment.from_file(file_path)
-        
-        # 如果需要设置采样率
-        if sample_rate:
-            audio = audio.set_frame_rate(sample_rate)
-        
-        # 导出为ogg格式，使用指定的质量参数
-        export_args = {
-            "format": "ogg",
-            "bitrate": quality,
-            "codec": "libvorbis",  # 确保使用vorbis编码器
-        }
-        
-        # 如果提供了额外参数，添加到导出参数中
-        if parameters:
-            export_args["parameters"] = parameters
-        
-        # 导出文件
-        audio.export(output_path, **export_args)
+            _toOggFfmpeg(ffmpeg_path_used, file_path, output_path, quality, parameters, sample_rate)
         
         # 验证文件是否成功创建
         if not os.path.exists(output_path):
@@ -683,6 +994,18 @@ def updateJsonFile(src, content={}):
     else:
         raise Error('文件不存在')
 
+def writeJsonFileAtomic(src, content={}):
+    # 原子写入json文件：先写入临时文件，再替换目标文件，写入中断时不会留下不完整的文件
+    temp_path = src + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(content, ensure_ascii=False, indent=4))
+        os.replace(temp_path, src)
+    except Exception:
+        if path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 def getJsonFileContent(src):
     # 获取json文件内容
     if path.exists(src):
@@ -739,6 +1062,84 @@ def copyFile(src, dst):
     # 使用copy2保留文件的元数据信息
     shutil.copy2(src, dst)
 
+def linkOrCopyFile(src, dst):
+    # 优先使用硬链接把文件放到目标路径，文件系统不支持时退回到复制
+    # 先删除已有的目标文件，避免写入与其他路径共享的硬链接
+    if path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def syncFile(src, dst):
+    # 同步单个文件，目标文件与源文件相同时跳过
+    # 相同指同一个硬链接，或者大小一致且修改时间相差不超过2秒（兼容FAT文件系统的时间精度）
+    # 返回是否更新了目标文件
+    if path.exists(dst):
+        try:
+            if path.samefile(src, dst):
+                return False
+        except OSError:
+            pass
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+        if src_stat.st_size == dst_stat.st_size and abs(src_stat.st_mtime - dst_stat.st_mtime) <= 2:
+            return False
+    dst_dir = path.dirname(dst)
+    if dst_dir and not path.exists(dst_dir):
+        os.makedirs(dst_dir, mode=0o755)  # 设置读写权限
+    linkOrCopyFile(src, dst)
+    return True
+
+def removeOrphans(src, keep):
+    # 删除文件夹中不在keep里的文件，以及删除后变空的子文件夹
+    # keep为相对于src的文件路径集合，返回被删除文件的相对路径列表
+    keep = {path.normpath(p) for p in keep}
+    removed = []
+    for root, _, files in os.walk(src, topdown=False):
+        for file in files:
+            full_path = path.join(root, file)
+            rel_path = path.relpath(full_path, src)
+            if rel_path not in keep:
+                os.remove(full_path)
+                removed.append(rel_path)
+        if root != src and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+def copyFileChunked(src, dst, on_chunk=None, chunk_size=1024 * 1024):
+    # 分块复制文件，每复制一块调用on_chunk(字节数)，on_chunk返回False时中止复制
+    # 先写入临时文件（.part），复制完成后再替换目标文件，中止或失败时不会留下不完整的文件
+    # 返回是否复制完成
+    temp_path = dst + ".part"
+    completed = True
+    try:
+        with open(src, 'rb') as fsrc, open(temp_path, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(chunk_size), b''):
+                fdst.write(chunk)
+                if on_chunk is not None and on_chunk(len(chunk)) is False:
+                    completed = False
+                    break
+        if not completed:
+            os.remove(temp_path)
+            return False
+        shutil.copystat(src, temp_path)
+        os.replace(temp_path, dst)
+        return True
+    except Exception:
+        if path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def getFileHash(src, algorithm='sha1', chunk_size=1024 * 1024):
+    # 分块读取文件并计算内容哈希
+    file_hash = hashlib.new(algorithm)
+    with open(src, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
 
 def deleteFolder(src):
     # 删除文件夹
@@ -763,6 +1164,21 @@ def moveFile(src, dst):
     # 移动文件到指定文件夹
     shutil.move(src, dst)
 
+def renameFile(src, dst):
+    # 把文件移动到指定路径（包含文件名），同一磁盘内为原子重命名，不复制文件内容
+    # 目标文件已存在时会被替换；跨磁盘时退回到复制后删除
+    dst_dir = path.dirname(dst)
+    if dst_dir and not path.exists(dst_dir):
+        os.makedirs(dst_dir, mode=0o755)  # 设置读写权限
+    try:
+        os.replace(src, dst)
+    except OSError:
+        if not path.exists(src):
+            raise
+        if path.exists(dst):
+            os.remove(dst)
+        shutil.move(src, dst)
+
 def toPack(src, dst, name='pack'):
 
     # 压缩文件夹，进行打包
@@ -778,70 +1194,21 @@ def toPack(src, dst, name='pack'):
         try:
             if not os.path.exists(dst):
                 os.makedirs(dst, mode=0o755)  # 设置读写权限
-            # 测试目标目录是否可写
-            test_file = os.path.join(dst, "test_write_permission.tmp")
-            with open(test_file, 'w') as f:
-                f.write("test")
-            os.remove(test_file)
+            # 检查目标目录是否可写，不再每次创建测试文件
+            if not os.access(dst, os.W_OK | os.X_OK):
+                raise PermissionError(f"目录不可写: {dst}")
         except (PermissionError, OSError) as e:
             print(f"目标目录权限错误: {str(e)}")
             raise Error(f"目标目录 {dst} 无法访问或写入，请检查权限或关闭占用该目录的程序")
             
-        # 检查目标文件是否存在
+        # 先写入同一目录下的临时文件，完成后原子替换目标文件，旧的资源包被占用时不需要先删除
         target_file = os.path.join(dst, name + '.zip')
-        
-        # 检查目标文件是否被占用
-        if path.exists(target_file):
-            try:
-                # 尝试打开文件，如果能打开，说明文件没有被占用
-                with open(target_file, 'a+b') as f:
-                    pass
-                # 文件存在但未被占用，删除它
-                os.remove(target_file)
-                print(f"已删除现有文件: {target_file}")
-            except PermissionError:
-                # 文件被占用，尝试解除占用
-                try:
-                    import psutil
-                    found_process = False
-                    for proc in psutil.process_iter(['pid', 'name', 'open_files']):
-                        try:
-                            for file in proc.info.get('open_files') or []:
-                                if file.path == target_file:
-                                    print(f"文件被进程 {proc.info['name']} (PID: {proc.info['pid']}) 占用，尝试结束进程...")
-                                    proc.terminate()
-                                    proc.wait(timeout=3)
-                                    found_process = True
-                                    break
-                        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                            pass
-                    
-                    if not found_process:
-                        print(f"未找到占用文件的进程，尝试强制删除文件")
-                    
-                    # 再次尝试删除文件
-                    if path.exists(target_file):
-                        try:
-                            os.remove(target_file)
-                            print(f"已成功删除被占用的文件: {target_file}")
-                        except PermissionError:
-                            # 如果仍然无法删除，尝试使用Windows特定方法
-                            import ctypes
-                            if ctypes.windll.kernel32.MoveFileExW(target_file, None, 4): # MOVEFILE_DELAY_UNTIL_REBOOT
-                                print(f"文件将在系统重启后删除: {target_file}")
-                            else:
-                                raise Error(f"无法删除文件: {target_file}")
-                except ImportError:
-                    print("未安装psutil库，无法检测文件占用进程")
-                    raise Error(f"文件被占用且无法解除: {target_file}，请安装psutil库或手动关闭占用程序")
-                except Exception as e:
-                    print(f"尝试解除文件占用失败: {str(e)}")
-                    raise Error(f"文件被占用且无法解除: {target_file}")
-        
+
         try:
-            # 打包并重命名
-            shutil.make_archive(os.path.join(dst, name), 'zip', src)
-            print(f"成功创建压缩包: {os.path.join(dst, name)}.zip")
+            # 打包，ogg文件不再压缩，文件内容由多个线程预读
+            packFolder(src, target_file)
+            print(f"成功创建压缩包: {target_file}")
+            print(f"资源包内容哈希: {packContentHash(target_file)}")
         except PermissionError as e:
             print(f"创建压缩包时权限错误: {str(e)}")
             raise Error(f"无法创建压缩包，目录 {dst} 可能被占用或没有写入权限")
@@ -971,21 +1338,73 @@ def getProjectHistory():
         return []
 
 
+# GB2312一级汉字（0xB0A1-0xD7F9）按拼音排序，每个拼音首字母第一个汉字的区位码
+# 一级汉字覆盖了常用汉字，首字母查表即可，不需要加载pypinyin的词典
+# 多音字使用GB2312排序时采用的读音，与pypinyin单字的第一个读音不同的有19个:
+# 辟(b) 泊(b) 长(c) 匙(c) 脯(f) 蛤(g) 槛(j) 咯(k) 傀(k) 茄(q) 炔(q) 伺(s) 厦(x) 畜(x) 吁(y) 曾(z) 轧(z) 辗(z) 椎(z)
+# 其余一级汉字的首字母与pypinyin相同
+_GB2312_FIRST_LETTERS = (
+    (0xB0A1, 'a'), (0xB0C5, 'b'), (0xB2C1, 'c'), (0xB4EE, 'd'), (0xB6EA, 'e'),
+    (0xB7A2, 'f'), (0xB8C1, 'g'), (0xB9FE, 'h'), (0xBBF7, 'j'), (0xBFA6, 'k'),
+    (0xC0AC, 'l'), (0xC2E8, 'm'), (0xC4C3, 'n'), (0xC5B6, 'o'), (0xC5BE, 'p'),
+    (0xC6DA, 'q'), (0xC8BB, 'r'), (0xC8F6, 's'), (0xCBFA, 't'), (0xCDDA, 'w'),
+    (0xCEF4, 'x'), (0xD1B9, 'y'), (0xD4D1, 'z'),
+)
+_GB2312_LEVEL1_END = 0xD7F9
+_GB2312_CODES = [code for code, _ in _GB2312_FIRST_LETTERS]
+
+@lru_cache(maxsize=1024)
+def _pinyin(text: str):
+    # pypinyin导入时会加载完整词典，只在需要时导入
+    from pypinyin import pinyin, STYLE_NORMAL
+    return tuple(tuple(readings) for readings in pinyin(text, style=STYLE_NORMAL, heteronym=True))
+
 def toPinyin(text: str):
-    # 转换为拼音
-    return pinyin(text, style=STYLE_NORMAL, heteronym=True)
+    # 转换为拼音，结果按文本缓存
+    return [list(readings) for readings in _pinyin(text)]
+
+@lru_cache(maxsize=8192)
+def pinyinFirstLetter(char: str) -> str:
+    """获取单个字符的拼音首字母（小写）
+    
+    英文字母和数字返回其小写形式；GB2312一级汉字查表获取（多音字见_GB2312_FIRST_LETTERS的说明），
+    其余汉字使用pypinyin获取；标点符号等无法获取时返回空字符串。
+    只按单字读音，不考虑词语中的读音，例如“银行”得到yx。
+    """
+    if char.isascii():
+        return char.lower() if char.isalnum() else ''
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        encoded = b''
+    if len(encoded) == 2:
+        code = encoded[0] << 8 | encoded[1]
+        if _GB2312_CODES[0] <= code <= _GB2312_LEVEL1_END:
+            return _GB2312_FIRST_LETTERS[bisect.bisect_right(_GB2312_CODES, code) - 1][1]
+    readings = _pinyin(char)
+    if readings and readings[0] and readings[0][0] and readings[0][0] != char:
+        return readings[0][0][0].lower()
+    return ''
+
+def pinyinInitials(text: str) -> str:
+    """获取文本中每个字符的拼音首字母（小写）并拼接，见pinyinFirstLetter
+    
+    例如: 晴天 -> qt，Hello 世界! -> hellosj（标点符号和空格被忽略）
+    """
+    return ''.join(pinyinFirstLetter(char) for char in text)
 
 def toPinyinFirst(text: str):
-    # 转换为拼音首字母
-    return ''.join([i[0] for i in toPinyin(text)])
+    # 转换为拼音，每个字取第一个读音后拼接（非中文字符原样保留），例如: 中国a! -> zhongguoa!
+    # 只需要首字母时使用pinyinInitials
+    return ''.join([i[0] for i in _pinyin(text)])
 
 def toPinyinFirstUpper(text: str):
-    # 转换为拼音首字母大写
-    return ''.join([i[0].upper() for i in toPinyin(text)])
+    # 同toPinyinFirst，结果为大写
+    return ''.join([i[0].upper() for i in _pinyin(text)])
 
 def toPinyinFirstLower(text: str):
-    # 转换为拼音首字母小写
-    return ''.join([i[0].lower() for i in toPinyin(text)])
+    # 同toPinyinFirst，结果为小写
+    return ''.join([i[0].lower() for i in _pinyin(text)])
 
 def TextSplit(text: str) -> str:
     """传入中文，把每个字进行分割，随机取三个字
@@ -1038,19 +1457,8 @@ def cnTextToPinyinFirst(text: str) -> str:
     if not chars:
         return ""
         
-    # 获取每个字符的拼音列表
-    pinyin_list = toPinyin(chars)
-    
-    # 提取每个拼音的首字母并拼接
-    result = []
-    for py in pinyin_list:
-        if py and py[0]:  # 确保拼音列表不为空
-            # 取拼音首字母并转小写
-            first_letter = py[0][0].lower()
-            result.append(first_letter)
-            
-    # 直接返回拼音首字母拼接结果
-    return ''.join(result)
+    # 提取每个字的拼音首字母并拼接
+    return pinyinInitials(chars)
 
 def enTextToFirst(text: str) -> str:
     """传入英文，把每个字进行分割，随机取五个字，然后转成字母
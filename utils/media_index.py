@@ -0,0 +1,160 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.main import probe_audio
+
+
+class MediaIndex:
+    """音频文件信息索引
+
+    保存每个音频文件的容器格式、编码、采样率、声道数和时长，
+    以文件路径、大小和修改时间判断记录是否有效，文件未变化时不再重新获取。
+
+    索引文件结构:
+        {
+            "文件路径": {"size": 文件大小, "mtime": 修改时间, "info": {...}}
+        }
+    """
+
+    BITRATE = 192000  # 导出时的编码码率，用于估算转换后的大小
+
+    def __init__(self, index_path: str):
+        """
+        初始化音频信息索引
+
+        参数:
+            index_path (str): 索引文件路径
+        """
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self._load_index()
+
+    def _load_index(self):
+        """从文件加载索引，索引损坏时视为空索引"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self._entries = entries if isinstance(entries, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def save(self):
+        """保存索引，并清理已经不存在的文件的记录"""
+        with self._lock:
+            entries = {p: e for p, e in self._entries.items() if os.path.exists(p)}
+            if not self._dirty and len(entries) == len(self._entries):
+                return
+            self._entries = entries
+            os.makedirs(os.path.dirname(self.index_path), mode=0o755, exist_ok=True)
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+
+    def get(self, file_path: str):
+        """
+        获取已记录的音频信息
+
+        Returns:
+            dict: 音频信息，没有记录或文件已变化时返回None
+        """
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(file_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["info"]
+        return None
+
+    def probe(self, file_path: str):
+        """
+        获取音频信息，没有有效记录时调用ffmpeg获取并记录
+
+        Returns:
+            dict: 音频信息
+
+        Raises:
+            Error: 无法获取音频信息
+        """
+        info = self.get(file_path)
+        if info is not None:
+            return info
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        info = probe_audio(file_path)
+        with self._lock:
+            self._entries[file_path] = {"size": stat.st_size, "mtime": stat.st_mtime, "info": info}
+            self._dirty = True
+        return info
+
+    def scan(self, file_paths, max_workers=None, on_result=None, is_canceled=None):
+        """
+        并行获取一组音频文件的信息，已有有效记录的文件不会重新获取
+
+        参数:
+            file_paths (list): 音频文件路径列表
+            max_workers (int): 并行获取的线程数量
+            on_result (callable): 每获取到一个文件的信息时调用，参数为文件路径和音频信息（失败时为None）
+            is_canceled (callable): 返回True时停止获取尚未开始的文件
+
+        Returns:
+            dict: 文件路径 -> 音频信息，获取失败的文件不包含在内
+        """
+        results = {}
+        pending = []
+        for file_path in file_paths:
+            info = self.get(file_path)
+            if info is None:
+                pending.append(file_path)
+                continue
+            results[file_path] = info
+            if on_result:
+                on_result(file_path, info)
+
+        def probe(file_path):
+            if is_canceled and is_canceled():
+                return None
+            return self.probe(file_path)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+                futures = {executor.submit(probe, file_path): file_path for file_path in pending}
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    try:
+                        info = future.result()
+                    except Exception:
+                        info = None
+                    if info is not None:
+                        results[file_path] = info
+                    if on_result:
+                        on_result(file_path, info)
+        return results
+
+    @staticmethod
+    def is_compliant(info):
+        """音频是否可以直接放入资源包（ogg容器中的vorbis编码），不需要重新编码"""
+        return bool(info) and "ogg" in info.get("format", "").split(",") and info.get("codec") == "vorbis"
+
+    @classmethod
+    def estimate_size(cls, file_path: str, info):
+        """估算音频放入资源包后的大小（字节）
+
+        可以直接使用的文件就是它本身的大小，需要转换的文件按导出码率和时长估算。
+        """
+        if cls.is_compliant(info):
+            try:
+                return os.path.getsize(file_path)
+            except OSError:
+                return 0
+        if not info:
+            return 0
+        return int(info.get("duration", 0) * cls.BITRATE / 8)
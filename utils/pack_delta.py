@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import zipfile
+from uu import Error
+
+from utils.pack_writer import PackWriter
+
+DELTA_MANIFEST = "delta.json"  # 补丁包中记录删除列表和目标资源包条目的文件
+DELTA_SUFFIX = ".delta.zip"  # 补丁包文件后缀
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def deltaPackName(name, base_version, target_version):
+    """
+    补丁包文件名（不含路径），例如: mcsd_1.0.0_to_1.0.1.delta.zip
+
+    参数:
+        name (str): 项目名称
+        base_version (str): 基础资源包版本
+        target_version (str): 目标资源包版本
+    """
+    return f"{name}_{base_version}_to_{target_version}{DELTA_SUFFIX}"
+
+
+def _copyEntry(src_zip, info, dst_zip):
+    """把一个条目按原来的压缩方式和修改时间复制到另一个zip中"""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.create_system = info.create_system
+    zinfo.external_attr = info.external_attr
+    zinfo.file_size = info.file_size
+    with src_zip.open(info) as src, dst_zip.open(zinfo, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+def _manifestInfo():
+    """delta.json条目，与PackWriter写入的条目一样使用固定的修改时间和权限，补丁包可重现"""
+    zinfo = zipfile.ZipInfo(DELTA_MANIFEST, PackWriter.FIXED_DATE_TIME)
+    zinfo.create_system = 3
+    zinfo.external_attr = PackWriter.FILE_MODE << 16
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def createDelta(base_zip, target_zip, delta_path):
+    """
+    根据两个版本资源包中央目录记录的CRC生成补丁包
+
+    补丁包只包含目标资源包中新增或内容变化（CRC或大小不同）的条目，
+    以及delta.json：删除的条目列表和目标资源包的全部条目（名称 -> CRC），用于还原时校验。
+    不需要解压或重新计算基础资源包中的文件。
+
+    参数:
+        base_zip (str): 上一个版本的完整资源包
+        target_zip (str): 当前版本的完整资源包
+        delta_path (str): 补丁包路径
+
+    返回:
+        dict: {"changed": 新增或变化的条目数, "removed": 删除的条目数, "size": 补丁包大小}
+    """
+    temp_path = delta_path + ".part"
+    try:
+        with zipfile.ZipFile(base_zip, 'r') as base, zipfile.ZipFile(target_zip, 'r') as target:
+            base_entries = {info.filename: info for info in base.infolist()}
+            target_infos = target.infolist()
+            changed = [info for info in target_infos
+                       if info.filename not in base_entries
+                       or base_entries[info.filename].CRC != info.CRC
+                       or base_entries[info.filename].file_size != info.file_size]
+            target_names = {info.filename for info in target_infos}
+            removed = sorted(name for name in base_entries if name not in target_names)
+            if DELTA_MANIFEST in target_names:
+                raise Error(f'资源包中存在与补丁记录同名的文件: {DELTA_MANIFEST}')
+
+            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as delta:
+                for info in changed:
+                    _copyEntry(target, info, delta)
+                delta.writestr(_manifestInfo(), json.dumps({
+                    "base": os.path.basename(base_zip),
+                    "target": os.path.basename(target_zip),
+                    "removed": removed,
+                    "entries": {info.filename: info.CRC for info in target_infos},
+                }, ensure_ascii=False, indent=2))
+        os.replace(temp_path, delta_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {"changed": len(changed), "removed": len(removed), "size": os.path.getsize(delta_path)}
+
+
+def applyDelta(base_zip, delta_zip, output_zip):
+    """
+    用基础资源包和补丁包还原出目标版本的完整资源包
+
+    条目按目标资源包中的顺序写入，补丁包中有的条目从补丁包复制，其余从基础资源包复制，
+    每个条目的CRC都与补丁记录比较，基础资源包不是补丁对应的版本时报错且不留下输出文件。
+
+    参数:
+        base_zip (str): 基础版本的完整资源包
+        delta_zip (str): 补丁包
+        output_zip (str): 还原出的资源包路径
+
+    返回:
+        str: output_zip
+    """
+    temp_path = output_zip + ".part"
+    output_dir = os.path.dirname(output_zip)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, mode=0o755)
+    try:
+        with zipfile.ZipFile(base_zip, 'r') as base, zipfile.ZipFile(delta_zip, 'r') as delta:
+            try:
+                manifest = json.loads(delta.read(DELTA_MANIFEST).decode('utf-8'))
+            except KeyError:
+                raise Error(f'{delta_zip} 不是补丁包: 缺少 {DELTA_MANIFEST}')
+            base_entries = {info.filename: info for info in base.infolist()}
+            delta_entries = {info.filename: info for info in delta.infolist() if info.filename != DELTA_MANIFEST}
+
+            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as output:
+                for name, crc in manifest["entries"].items():
+                    if name in delta_entries:
+                        source, info = delta, delta_entries[name]
+                    elif name in base_entries:
+                        source, info = base, base_entries[name]
+                    else:
+                        raise Error(f'基础资源包与补丁不匹配: 缺少 {name}')
+                    if info.CRC != crc:
+                        raise Error(f'基础资源包与补丁不匹配: {name} 的CRC不同')
+                    _copyEntry(source, info, output)
+        os.replace(temp_path, output_zip)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return output_zip
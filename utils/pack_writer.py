@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from uu import Error
+
+LOCK_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4)  # 目标文件被占用时重试替换前等待的时间（秒），总计不到1秒
+LOCK_CACHE_SECONDS = 30  # 确认目标文件被占用后，多长时间内不再重试
+_locked_targets = {}  # 目标文件路径 -> 最近一次确认被占用的时间
+
+
+def replaceFile(temp_path: str, target_path: str):
+    """
+    用临时文件原子替换目标文件
+
+    替换失败（目标文件被其他程序打开）时才短暂重试几次，总等待时间有上限；
+    确认被占用的目标文件会被记住，短时间内再次替换失败时直接报错，不再等待。
+    不会遍历进程或结束占用文件的程序。
+
+    参数:
+        temp_path (str): 已写好的临时文件，与目标文件在同一目录
+        target_path (str): 目标文件
+    """
+    locked_at = _locked_targets.get(target_path)
+    delays = LOCK_RETRY_DELAYS
+    if locked_at is not None and time.monotonic() - locked_at < LOCK_CACHE_SECONDS:
+        delays = ()
+    for delay in (0,) + tuple(delays):
+        if delay:
+            time.sleep(delay)
+        try:
+            os.replace(temp_path, target_path)
+            _locked_targets.pop(target_path, None)
+            return
+        except PermissionError as e:
+            error = e
+    _locked_targets[target_path] = time.monotonic()
+    raise Error(f'{target_path} 被其他程序占用，无法替换，请关闭占用该文件的程序后重试: {str(error)}')
+
+
+class PackWriter:
+    """资源包写入器
+
+    把文件直接写入最终的zip资源包，不再经过中间目录。
+    写入过程中使用同一目录下名称唯一的临时文件（.part），全部写入成功后再原子替换目标文件，
+    中途失败或取消时不会留下不完整的资源包，旧的资源包被占用也不会影响写入。
+
+    ogg等已经压缩过的文件以存储方式（ZIP_STORED）写入，只有json、png等文件使用deflate压缩。
+
+    写入的资源包是可重现的：所有条目使用固定的修改时间和权限，json按键排序（见packJson），
+    条目必须按entrySortKey的顺序写入，顺序不对时报错。相同内容的两次打包，无论经典导出还是直接导出，
+    都得到完全相同的文件，内容哈希（contentHash）也相同。
+
+    用法:
+        with PackWriter(target_path) as writer:
+            writer.add_file("assets/minecraft/sounds/a.ogg", "C:/a.ogg")
+            writer.add_json("assets/minecraft/sounds.json", sounds)
+    """
+
+    STORED_SUFFIXES = ('.ogg',)  # 不再压缩的文件后缀
+    PREFETCH_MAX_SIZE = 16 * 1024 * 1024  # 预读到内存的单个文件大小上限
+    FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # 所有条目的修改时间，zip格式能表示的最早时间
+    FILE_MODE = 0o100644  # 所有条目的权限：普通文件，所有者可写，其他人只读
+    COPY_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, target_path: str, compression=zipfile.ZIP_DEFLATED):
+        """
+        初始化资源包写入器
+
+        参数:
+            target_path (str): 资源包路径（.zip）
+            compression (int): 除ogg以外的文件使用的压缩方式
+        """
+        self.target_path = target_path
+        self.compression = compression
+        target_dir = os.path.dirname(target_path)
+        if target_dir and not os.path.exists(target_dir):
+            os.makedirs(target_dir, mode=0o755)  # 设置读写权限
+        fd, self.temp_path = tempfile.mkstemp(prefix=os.path.basename(target_path) + ".", suffix=".part",
+                                              dir=target_dir or None)
+        os.close(fd)
+        try:
+            os.chmod(self.temp_path, 0o644)  # mkstemp创建的文件只有所有者可读
+            self._zip = zipfile.ZipFile(self.temp_path, 'w', compression=compression)
+        except BaseException:
+            os.remove(self.temp_path)
+            raise
+        self._names = set()  # 已写入的条目名称
+        self._last_key = None  # 最后写入的条目的排序键
+
+    def _check_name(self, arcname: str):
+        # 统一使用/作为分隔符，拒绝重复的条目和不按顺序写入的条目
+        arcname = arcname.replace(os.sep, '/')
+        if arcname in self._names:
+            raise Error(f'资源包中已存在同名文件: {arcname}')
+        key = entrySortKey(arcname)
+        if self._last_key is not None and key < self._last_key:
+            raise Error(f'资源包条目必须按路径顺序写入: {arcname}')
+        self._names.add(arcname)
+        self._last_key = key
+        return arcname
+
+    def compress_type(self, arcname: str):
+        """根据文件后缀决定条目的压缩方式"""
+        if arcname.lower().endswith(self.STORED_SUFFIXES):
+            return zipfile.ZIP_STORED
+        return self.compression
+
+    def _info(self, arcname: str, file_size: int = 0):
+        # 使用固定的修改时间和权限，并按后缀设置压缩方式，不记录文件系统中的信息
+        zinfo = zipfile.ZipInfo(arcname, self.FIXED_DATE_TIME)
+        zinfo.create_system = 3  # 按Unix权限解释external_attr，与打包所在的系统无关
+        zinfo.external_attr = self.FILE_MODE << 16
+        zinfo.compress_type = self.compress_type(arcname)
+        zinfo.file_size = file_size
+        return zinfo
+
+    def _file_info(self, arcname: str, file_path: str):
+        return self._info(arcname, os.path.getsize(file_path))
+
+    def _write_file(self, zinfo, file_path: str):
+        # 从磁盘分块读取写入，不把大文件读入内存
+        with open(file_path, 'rb') as src, \
+                self._zip.open(zinfo, 'w', force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT) as dst:
+            shutil.copyfileobj(src, dst, self.COPY_BUFFER_SIZE)
+
+    def add_file(self, arcname: str, file_path: str):
+        """把文件写入资源包"""
+        arcname = self._check_name(arcname)
+        self._write_file(self._file_info(arcname, file_path), file_path)
+
+    def add_files(self, files, max_workers=None):
+        """
+        按顺序把多个文件写入资源包
+
+        文件内容在线程池中预读，zip只由当前线程按顺序写入，
+        条目顺序与传入顺序一致。超过PREFETCH_MAX_SIZE的文件不预读，写入时直接从磁盘读取。
+
+        参数:
+            files (iterable): (条目名称, 文件路径) 列表
+            max_workers (int): 预读线程数量，默认使用CPU核心数
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+
+        def prefetch(arcname, file_path):
+            zinfo = self._file_info(arcname, file_path)
+            if zinfo.file_size > self.PREFETCH_MAX_SIZE:
+                return zinfo, None
+            with open(file_path, 'rb') as f:
+                return zinfo, f.read()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()  # 最多同时预读 max_workers * 2 个文件，限制内存占用
+            files = iter(files)
+            while True:
+                while len(pending) < max_workers * 2:
+                    item = next(files, None)
+                    if item is None:
+                        break
+                    arcname, file_path = item
+                    arcname = self._check_name(arcname)
+                    pending.append((file_path, executor.submit(prefetch, arcname, file_path)))
+                if not pending:
+                    break
+                file_path, future = pending.popleft()
+                zinfo, data = future.result()
+                if data is None:
+                    self._write_file(zinfo, file_path)
+                else:
+                    self._zip.writestr(zinfo, data)
+
+    def add_bytes(self, arcname: str, data: bytes):
+        """把内存中的数据写入资源包"""
+        arcname = self._check_name(arcname)
+        self._zip.writestr(self._info(arcname, len(data)), data)
+
+    def add_json(self, arcname: str, content):
+        """把json内容写入资源包，键按顺序排列"""
+        self.add_bytes(arcname, packJson(content))
+
+    def names(self):
+        """获取已写入的条目名称"""
+        return set(self._names)
+
+    def contentHash(self):
+        """已写入条目的内容哈希，见contentHash()"""
+        return contentHash(self._zip.infolist())
+
+    def close(self):
+        """完成写入，用临时文件替换目标资源包"""
+        self._zip.close()
+        try:
+            replaceFile(self.temp_path, self.target_path)
+        except BaseException:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            raise
+
+    def abort(self):
+        """放弃写入并删除临时文件"""
+        try:
+            self._zip.close()
+        finally:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def entrySortKey(arcname: str):
+    """
+    资源包条目的排序键
+
+    按路径的各级名称比较，同一文件夹中的文件和子文件夹按名称排列，子文件夹中的条目排在一起，
+    例如 assets/minecraft/sounds/a.ogg 排在 assets/minecraft/sounds.json 之前，
+    直接导出时可以先写入全部音效，再写入sounds.json、pack.mcmeta和pack.png。
+    """
+    return arcname.replace(os.sep, '/').split('/')
+
+
+def packJson(content):
+    """资源包中json文件的内容，两种导出方式写入的json完全相同"""
+    return json.dumps(content, indent=4, sort_keys=True).encode("utf-8")
+
+
+def contentHash(infos):
+    """
+    资源包的内容哈希
+
+    根据中央目录中每个条目的名称、CRC和大小计算，不需要读取条目内容。
+    条目内容和顺序都相同的资源包得到相同的哈希，可以用来判断两次打包的结果是否相同。
+
+    参数:
+        infos (list): zipfile.ZipInfo列表
+
+    返回:
+        str: sha1哈希
+    """
+    digest = hashlib.sha1()
+    for info in infos:
+        digest.update(f"{info.filename}\0{info.CRC:08x}\0{info.file_size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def packContentHash(zip_path: str):
+    """读取资源包中央目录，计算内容哈希"""
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        return contentHash(zf.infolist())
+
+
+def packFolder(src: str, target_path: str, max_workers=None):
+    """
+    把文件夹打包为资源包
+
+    参数:
+        src (str): 要打包的文件夹
+        target_path (str): 资源包路径（.zip）
+        max_workers (int): 预读线程数量
+
+    返回:
+        str: 资源包路径
+    """
+    files = []
+    for root, dirs, names in os.walk(src):
+        for name in names:
+            full_path = os.path.join(root, name)
+            files.append((os.path.relpath(full_path, src).replace(os.sep, '/'), full_path))
+    # 所有条目按同一个顺序写入，与直接导出的资源包一致
+    files.sort(key=lambda item: entrySortKey(item[0]))
+
+    with PackWriter(target_path) as writer:
+        writer.add_files(files, max_workers)
+    return target_path
@@ -0,0 +1,154 @@
+import os
+import re
+
+MAX_LENGTH = 5  # 自动生成的soundkey最长5个字符
+DEFAULT_KEY = "sound"  # 无法从文件名生成时使用的soundkey
+
+
+def generateSoundKey(file_name):
+    """
+    根据文件名生成soundkey，同一个文件名总是得到同一个soundkey
+
+    中文取每个字的拼音首字母（按单字读音，见utils.main.pinyinFirstLetter）；英文有多个单词时取每个单词的首字母，只有一个单词时取单词本身；
+    数字原样保留。结果只包含小写英文字母和数字，数字不能在开头，最长5个字符。
+
+    例如:
+        晴天 -> qt
+        Hello World 2 -> hw2
+        track0 -> track
+
+    参数:
+        file_name (str): 文件名，可以包含后缀
+
+    返回:
+        str: soundkey
+    """
+    from utils.main import pinyinInitials
+
+    name = os.path.splitext(os.path.basename(file_name))[0]
+    tokens = re.findall(r'[一-龥]+|[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+', name)
+    words = sum(1 for token in tokens if not token.isdigit())
+
+    parts = []
+    for token in tokens:
+        if re.match(r'[一-龥]', token):
+            parts.append(pinyinInitials(token))
+        elif token.isdigit():
+            parts.append(token)
+        elif words > 1:
+            parts.append(token[0])
+        else:
+            parts.append(token)
+
+    sound_key = ''.join(c for c in ''.join(parts).lower() if c.isascii() and c.isalnum())
+    sound_key = sound_key.lstrip('0123456789')[:MAX_LENGTH]
+    return sound_key or DEFAULT_KEY
+
+
+class SoundKeyIndex:
+    """项目的soundkey索引
+
+    记录每个soundkey属于哪个音频文件，冲突检查为O(1)。
+    soundkey已被其他文件使用时，在末尾加上数字（截短以保持长度），
+    从1开始取第一个未被使用的，同样的输入顺序总是得到同样的结果。
+    """
+
+    def __init__(self):
+        self._owners = {}  # soundkey -> 文件路径
+        self._keys = {}  # 文件路径 -> soundkey
+        self._next = {}  # soundkey -> 下次尝试的数字后缀，大量同名音频时不必每次从1开始尝试
+
+    def __contains__(self, sound_key):
+        return sound_key in self._owners
+
+    def __len__(self):
+        return len(self._owners)
+
+    def owner(self, sound_key):
+        """使用该soundkey的文件路径，未被使用时返回None"""
+        return self._owners.get(sound_key)
+
+    def keyOf(self, file_path):
+        """文件当前的soundkey，未分配时返回None"""
+        return self._keys.get(file_path)
+
+    def isAvailable(self, sound_key, file_path=None):
+        """soundkey是否未被使用，或正是该文件自己的soundkey"""
+        owner = self._owners.get(sound_key)
+        return owner is None or owner == file_path
+
+    def uniqueKey(self, sound_key, file_path=None):
+        """
+        得到不与其他文件冲突的soundkey
+
+        参数:
+            sound_key (str): 希望使用的soundkey
+            file_path (str): 文件路径，soundkey属于该文件自己时不算冲突
+
+        返回:
+            str: sound_key本身，或加上数字后缀的soundkey
+        """
+        if self.isAvailable(sound_key, file_path):
+            return sound_key
+        limit = max(MAX_LENGTH, len(sound_key))
+        # 文件自己已经有同一soundkey加数字后缀的soundkey时保持不变
+        own = self._keys.get(file_path)
+        match = re.fullmatch(r'.*?(\d+)', own or "")
+        if match and sound_key[:limit - len(match.group(1))] + match.group(1) == own:
+            return own
+        number = self._next.get(sound_key, 1)
+        while True:
+            suffix = str(number)
+            candidate = sound_key[:limit - len(suffix)] + suffix
+            if self.isAvailable(candidate, file_path):
+                self._next[sound_key] = number
+                return candidate
+            number += 1
+
+    def assign(self, file_path, sound_key=None):
+        """
+        为文件分配soundkey，替换该文件之前的soundkey
+
+        参数:
+            file_path (str): 文件路径
+            sound_key (str): 希望使用的soundkey，为空时根据文件名生成
+
+        返回:
+            str: 实际分配的soundkey
+        """
+        sound_key = self.uniqueKey(sound_key or generateSoundKey(file_path), file_path)
+        self.release(file_path)
+        self._owners[sound_key] = file_path
+        self._keys[file_path] = sound_key
+        return sound_key
+
+    def assignMany(self, items):
+        """
+        一次为一批文件分配soundkey
+
+        参数:
+            items (list): (文件路径, 希望使用的soundkey或None) 列表，按列表顺序分配
+
+        返回:
+            list: 与items对应的soundkey列表
+        """
+        return [self.assign(file_path, sound_key) for file_path, sound_key in items]
+
+    def rename(self, old_path, new_path):
+        """文件移动后保留原来的soundkey"""
+        sound_key = self._keys.pop(old_path, None)
+        if sound_key is not None:
+            self._owners[sound_key] = new_path
+            self._keys[new_path] = sound_key
+
+    def release(self, file_path):
+        """释放文件的soundkey，释放后数字后缀重新从1开始尝试"""
+        sound_key = self._keys.pop(file_path, None)
+        if sound_key is not None and self._owners.get(sound_key) == file_path:
+            del self._owners[sound_key]
+            self._next.clear()
+
+    def clear(self):
+        self._owners.clear()
+        self._keys.clear()
+        self._next.clear()
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+from utils.main import getFileHash, linkOrCopyFile
+
+
+class TranscodeCache:
+    """音频转换缓存
+
+    以源文件内容哈希和转换参数作为键，保存已经转换好的ogg文件。
+    命中缓存时通过硬链接（或复制）得到输出文件，不再重新编码。
+    缓存总大小超过上限时，按最近使用时间淘汰最久未使用的条目。
+
+    缓存目录结构:
+        transcode
+        ├── index.json (缓存索引)
+        ├── ab
+        │   ├── abcdef....ogg (缓存的转换结果)
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir: str, max_size: int = 4096 * 1024 * 1024):
+        """
+        初始化转换缓存
+
+        参数:
+            cache_dir (str): 缓存目录
+            max_size (int): 缓存总大小上限（字节）
+        """
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, self.INDEX_NAME)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = {}  # 缓存键 -> {"size": 文件大小, "last_access": 最后使用时间}
+        self._sources = {}  # 源文件路径 -> [文件大小, 修改时间, 内容哈希]
+        self._load_index()
+
+    def _load_index(self):
+        """从文件加载缓存索引，索引损坏时视为空缓存"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._entries = index.get("entries", {})
+            self._sources = index.get("sources", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            self._entries = {}
+            self._sources = {}
+
+    def save(self):
+        """淘汰超出上限的条目并保存缓存索引"""
+        self.evict()
+        with self._lock:
+            # 清理已经不存在的源文件哈希记录
+            self._sources = {p: s for p, s in self._sources.items() if os.path.exists(p)}
+            os.makedirs(self.cache_dir, mode=0o755, exist_ok=True)
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self._entries, "sources": self._sources}, f)
+            os.replace(temp_path, self.index_path)
+
+    def entry_path(self, key: str):
+        """获取缓存键对应的缓存文件路径"""
+        return os.path.join(self.cache_dir, key[:2], key + ".ogg")
+
+    def source_hash(self, file_path: str):
+        """
+        获取源文件内容哈希
+
+        文件大小和修改时间未变化时直接使用记录的哈希，避免重复读取整个文件。
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            record = self._sources.get(file_path)
+        if record and record[0] == stat.st_size and record[1] == stat.st_mtime_ns:
+            return record[2]
+
+        content_hash = getFileHash(file_path)
+        with self._lock:
+            self._sources[file_path] = [stat.st_size, stat.st_mtime_ns, content_hash]
+        return content_hash
+
+    def key(self, file_path: str, quality="192k", sample_rate=None, parameters=None):
+        """
+        根据源文件内容和转换参数生成缓存键
+
+        参数:
+            file_path (str): 源文件路径
+            quality (str): 输出音频质量
+            sample_rate (int): 输出采样率
+            parameters (list): 额外的ffmpeg参数
+
+        返回:
+            str: 缓存键
+        """
+        params = json.dumps([quality, sample_rate, list(parameters or [])])
+        key_hash = hashlib.sha1()
+        key_hash.update(self.source_hash(file_path).encode('utf-8'))
+        key_hash.update(params.encode('utf-8'))
+        return key_hash.hexdigest()
+
+    def lookup(self, key: str):
+        """
+        查找缓存文件
+
+        返回:
+            str: 命中时返回缓存文件路径，否则返回None
+        """
+        entry_path = self.entry_path(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not os.path.exists(entry_path):
+                # 缓存文件已被外部删除
+                del self._entries[key]
+                return None
+            entry["last_access"] = time.time()
+        return entry_path
+
+    def fetch(self, key: str, output_path: str):
+        """
+        命中缓存时把缓存文件链接或复制到输出路径
+
+        返回:
+            bool: 是否命中缓存
+        """
+        entry_path = self.lookup(key)
+        if entry_path is None:
+            return False
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, mode=0o755, exist_ok=True)
+        linkOrCopyFile(entry_path, output_path)
+        return True
+
+    def temp_path(self, key: str):
+        """
+        在缓存目录中创建一个名称唯一的临时ogg文件，用作一次转换的输出路径
+
+        相同内容的源文件缓存键相同，并行转换时各自写入自己的临时文件，完成后再由adopt放入缓存。
+        """
+        entry_dir = os.path.dirname(self.entry_path(key))
+        os.makedirs(entry_dir, mode=0o755, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=key + ".", suffix=".ogg", dir=entry_dir)
+        os.close(fd)
+        return temp_path
+
+    def adopt(self, key: str, temp_path: str):
+        """
+        把temp_path中的转换结果原子移动到缓存路径并登记
+
+        其他任务已经放入了相同键的条目时保留已有的缓存文件（可能正在被读取），删除temp_path。
+
+        返回:
+            str: 缓存文件路径
+        """
+        entry_path = self.entry_path(key)
+        with self._lock:
+            if key in self._entries and os.path.exists(entry_path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, entry_path)
+                self._entries[key] = {
+                    "size": os.path.getsize(entry_path),
+                    "last_access": time.time(),
+                }
+        return entry_path
+
+    def store(self, key: str, file_path: str):
+        """把转换好的文件加入缓存"""
+        temp_path = self.temp_path(key)
+        try:
+            linkOrCopyFile(file_path, temp_path)
+            self.adopt(key, temp_path)
+        except BaseException:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def total_size(self):
+        """获取缓存条目总大小"""
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    def evict(self):
+        """按最近使用时间淘汰条目，直到缓存总大小不超过上限"""
+        with self._lock:
+            total = sum(entry["size"] for entry in self._entries.values())
+            if total <= self.max_size:
+                return
+            for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_access"]):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(self.entry_path(key))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    # 文件被占用时保留该条目，下次再尝试淘汰
+                    continue
+                total -= entry["size"]
+                del self._entries[key]